@@ -1,9 +1,24 @@
 # apps/homie_app/homie_app/api.py
 import frappe
+import base64
+import csv
+import io
 import json
+import os
 import re
 from frappe import _, cint
 from frappe.model.naming import now_datetime
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import add_to_deltas, apply_rollup_deltas
+from homie_app.homie_app.doctype.kpi_summary.kpi_summary import apply_kpi_delta
+from homie_app.conditional import list_not_modified, record_not_modified
+from homie_app.encoding import encode_list, negotiate_format
+from homie_app.instrumentation import instrumented
+from homie_app.validation import validate_payload, validate_payloads
+from homie_app.homie_app.doctype.person_details.person_details import resolve_person
+from homie_app.homie_app.doctype.product_details.product_details import get_product_prices
 
 
 def require_login():
@@ -34,6 +49,285 @@ def validate_email(email):
     """Check email format"""
     if not re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', email):
         frappe.throw("Invalid email format.")
+
+
+# ----------------------------- LINK RESOLUTION -----------------------------
+
+# display fields the endpoints copy from each linked doctype
+LINK_DISPLAY_FIELDS = {
+    "Person Details": ["first_name", "last_name", "email"],
+    "Animal Shelters": ["shelter_name"],
+    "Organization Details": ["organization_name"],
+    "Product Details": ["product_name", "product_price"],
+}
+
+
+class LinkResolver:
+    """
+    Request-scoped lookup of linked Person, Shelter, Organization and Product
+    records. Collect names with add(), then resolve() loads every pending
+    name with one query per doctype. Results, misses included, are memoized
+    for the rest of the request.
+    """
+
+    def __init__(self):
+        self.resolved = {doctype: {} for doctype in LINK_DISPLAY_FIELDS}
+        self.pending = {doctype: set() for doctype in LINK_DISPLAY_FIELDS}
+
+    def add(self, doctype, *names):
+        for name in names:
+            if name and name not in self.resolved[doctype]:
+                self.pending[doctype].add(name)
+        return self
+
+    def resolve(self):
+        for doctype, names in self.pending.items():
+            if not names:
+                continue
+
+            if doctype == "Product Details":
+                # shared, invalidated product price cache
+                found = {k: frappe._dict(v) for k, v in get_product_prices(names).items()}
+            else:
+                rows = frappe.get_all(
+                    doctype,
+                    filters={"name": ["in", list(names)]},
+                    fields=["name"] + LINK_DISPLAY_FIELDS[doctype]
+                )
+                found = {r.name: r for r in rows}
+
+            for name in names:
+                self.resolved[doctype][name] = found.get(name)
+            names.clear()
+        return self
+
+    def get(self, doctype, name):
+        """Display fields of the linked record, or None if it does not exist"""
+        if not name:
+            return None
+        if name not in self.resolved[doctype]:
+            self.add(doctype, name).resolve()
+        return self.resolved[doctype][name]
+
+    def exists(self, doctype, name):
+        return self.get(doctype, name) is not None
+
+
+def get_link_resolver():
+    if getattr(frappe.local, "homie_link_resolver", None) is None:
+        frappe.local.homie_link_resolver = LinkResolver()
+    return frappe.local.homie_link_resolver
+
+
+def validate_person(person):
+    if person and not get_link_resolver().exists("Person Details", person):
+        frappe.throw(_("Person '{}' does not exist").format(person))
+
+def validate_shelter(shelter):
+    if shelter and not get_link_resolver().exists("Animal Shelters", shelter):
+        frappe.throw(_("Shelter '{}' does not exist").format(shelter))
+
+def validate_organization(org):
+    if org and not get_link_resolver().exists("Organization Details", org):
+        frappe.throw(_("Organization '{}' does not exist").format(org))
+
+def fetch_person_fields(person):
+    p = get_link_resolver().get("Person Details", person)
+    return {
+        "person_first_name": p.first_name or "",
+        "person_last_name": p.last_name or "",
+        "person_email": p.email or ""
+    }
+
+def fetch_shelter_name(shelter):
+    s = get_link_resolver().get("Animal Shelters", shelter)
+    return (s and s.shelter_name) or shelter
+
+def fetch_organization_name(org):
+    o = get_link_resolver().get("Organization Details", org)
+    return (o and o.organization_name) or org
+
+
+# ----------------------------- PAGINATION -----------------------------
+
+DEFAULT_PAGE_LENGTH = 100
+MAX_PAGE_LENGTH = 1000
+
+
+def parse_limit(limit):
+    """Page size from the request, capped at MAX_PAGE_LENGTH"""
+    if limit in (None, ""):
+        return DEFAULT_PAGE_LENGTH
+    limit = cint(limit)
+    if limit <= 0:
+        frappe.throw("'limit' must be a positive number.")
+    return min(limit, MAX_PAGE_LENGTH)
+
+
+def encode_cursor(value, name):
+    """Opaque cursor pointing at the last (sort value, name) pair of a page"""
+    raw = json.dumps([str(value) if value is not None else None, name])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, name = json.loads(base64.urlsafe_b64decode(str(cursor).encode()))
+    except Exception:
+        frappe.throw("Invalid cursor.")
+    return value, name
+
+
+def paginate(doctype, fields, limit=None, cursor=None, filters=None, sort_field="modified"):
+    """
+    Keyset pagination ordered by (sort_field, name) descending.
+
+    Instead of OFFSET, the next page seeks past the last row of the previous
+    one, so every page costs the same regardless of how deep it is.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    limit = parse_limit(limit)
+
+    query_fields = list(fields)
+    extra_fields = [f for f in (sort_field, "name") if f not in query_fields]
+    query_fields += extra_fields
+
+    if isinstance(filters, dict):
+        filters = [[k, "=", v] for k, v in filters.items()]
+    filters = list(filters or [])
+    or_filters = None
+
+    if cursor:
+        value, name = decode_cursor(cursor)
+        filters.append([sort_field, "<=", value])
+        or_filters = [[sort_field, "<", value], ["name", "<", name]]
+
+    rows = frappe.get_all(
+        doctype,
+        fields=query_fields,
+        filters=filters,
+        or_filters=or_filters,
+        order_by=f"`{sort_field}` desc, `name` desc",
+        limit_page_length=limit + 1
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][sort_field], rows[-1]["name"])
+
+    for row in rows:
+        for f in extra_fields:
+            row.pop(f, None)
+
+    return rows, next_cursor
+
+
+def get_record_fields(doctype):
+    """Every column of a doctype, for list endpoints that return whole records in one query"""
+    return frappe.get_meta(doctype).get_valid_columns()
+
+
+def parse_fields(fields, allowed):
+    """
+    Requested field names as a list. Accepts a list, a JSON list or a comma
+    separated string; anything outside `allowed` is rejected. Returns None
+    when nothing was requested so callers can fall back to their default.
+    """
+    if not fields:
+        return None
+
+    if isinstance(fields, str):
+        if fields.strip().startswith("["):
+            try:
+                fields = json.loads(fields)
+            except ValueError:
+                frappe.throw(_("Field list is not valid JSON: {0}").format(fields))
+        else:
+            fields = fields.split(",")
+
+    if not isinstance(fields, (list, tuple)) or not all(isinstance(f, str) for f in fields):
+        frappe.throw(_("Field list must contain field names only."))
+
+    fields = [f.strip() for f in fields if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        frappe.throw(_("Unknown or restricted field(s): {0}").format(", ".join(unknown)))
+
+    return list(dict.fromkeys(fields))
+
+
+def get_readable_fields(doctype):
+    """(column fieldnames, {table fieldname: child doctype}) a client may select"""
+    meta = frappe.get_meta(doctype)
+    columns = [
+        f for f in meta.get_valid_columns()
+        if not (meta.get_field(f) and meta.get_field(f).fieldtype == "Password")
+    ]
+    tables = {df.fieldname: df.options for df in meta.get_table_fields()}
+    return columns, tables
+
+
+def get_projection(doctype, name, fields=None, exclude=None, expand=None):
+    """
+    A single record shaped by the sparse fieldset parameters of the get_* endpoints.
+
+    Without any of them this is `doc.as_dict()`, as before. Otherwise only the
+    selected columns are read, child tables are loaded only when selected, and
+    each Link field in `expand` is replaced by the columns of the linked record.
+    `fields`/`exclude`/`expand` are validated against the doctype meta.
+    """
+    if not (fields or exclude or expand):
+        return frappe.get_doc(doctype, name).as_dict()
+
+    columns, tables = get_readable_fields(doctype)
+    allowed = columns + list(tables)
+    exclude = parse_fields(exclude, allowed) or []
+    selected = [f for f in parse_fields(fields, allowed) or allowed if f not in exclude]
+    expand = parse_fields(expand, selected) or []
+
+    record = frappe.db.get_value(
+        doctype,
+        name,
+        list(dict.fromkeys(["name", *(f for f in selected if f in columns)])),
+        as_dict=True
+    )
+    if not record:
+        frappe.throw(_("{0} {1} not found").format(_(doctype), name), frappe.DoesNotExistError)
+
+    meta = frappe.get_meta(doctype)
+    for fieldname in expand:
+        df = meta.get_field(fieldname)
+        if not df or df.fieldtype != "Link":
+            frappe.throw(_("Only link fields can be expanded: {0}").format(fieldname))
+        if record.get(fieldname):
+            record[fieldname] = frappe.db.get_value(df.options, record[fieldname], "*", as_dict=True)
+
+    for fieldname in (f for f in selected if f in tables):
+        record[fieldname] = frappe.get_all(
+            tables[fieldname],
+            filters={"parent": name, "parenttype": doctype, "parentfield": fieldname},
+            fields=["*"],
+            order_by="idx asc"
+        )
+
+    return record
+
+
+def stream_sql(query, values=None):
+    """
+    Yield rows one by one from a server-side (unbuffered) cursor.
+
+    Meant to be consumed by a streamed Response: by then the request has
+    already closed its connection, so a fresh one is opened and closed here.
+    """
+    try:
+        if not frappe.db._conn:
+            frappe.db.connect()
+        with frappe.db.unbuffered_cursor():
+            yield from frappe.db.sql(query, values, as_dict=True, as_iterator=True)
+    finally:
+        frappe.db.close()
 # ----------------------------- ORGANIZATION DETAILS API'S -----------------------------
 
 #4d9cee910c562c1
@@ -42,18 +336,13 @@ def validate_email(email):
 # CREATE ORGANIZATION
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def create_organization():
     require_login()
     data = _req()
 
-    required = ["organization_name", "organization_email", "organization_contact_no", "iban_no"]
-    for f in required:
-        if not data.get(f):
-            frappe.throw(f"'{f}' is required.")
-
-    # Email validation
-    if not re.fullmatch(r"[^@]+@[^@]+\.[^@]+", data.get("organization_email")):
-        frappe.throw("Invalid email format.")
+    validate_payload("Organization Details", data)
+    validate_payload("Bank Details", data)
 
     # Normalize phone
     data["organization_contact_no"] = parse_phone(data.get("organization_contact_no"))
@@ -114,61 +403,122 @@ def create_organization():
 # -----------------------------
 # GET ALL ORGANIZATIONS
 # -----------------------------
+ORGANIZATION_LIST_FIELDS = [
+    "name", "owner", "creation", "modified", "modified_by", "docstatus", "idx",
+    "organization_name", "organization_email", "organization_contact_no",
+    "status", "country", "organization_city", "organization_street",
+    "organization_street_number", "zip_code", "logo", "bank_details"
+]
+
+BANK_DETAILS_LIST_FIELDS = [
+    "name", "owner", "creation", "modified", "modified_by", "docstatus", "idx",
+    "iban_no", "bank_name", "account_title", "link_field"
+]
+
+
+def fetch_organizations_with_bank_details(limit=None, cursor=None):
+    """
+    Organizations and their linked Bank Details in a single LEFT JOIN,
+    keyset-paginated on (modified, name). Returns (result, next_cursor).
+    """
+    limit = parse_limit(limit)
+    columns = [f"org.`{f}` AS `{f}`" for f in ORGANIZATION_LIST_FIELDS]
+    columns += [f"bank.`{f}` AS `bank__{f}`" for f in BANK_DETAILS_LIST_FIELDS]
+
+    conditions = ""
+    values = {"limit": limit + 1}
+    if cursor:
+        values["modified"], values["name"] = decode_cursor(cursor)
+        conditions = """
+            WHERE org.modified <= %(modified)s
+            AND (org.modified < %(modified)s OR org.name < %(name)s)
+        """
+
+    rows = frappe.db.sql(f"""
+        SELECT {", ".join(columns)}
+        FROM `tabOrganization Details` org
+        LEFT JOIN `tabBank Details` bank ON bank.name = org.bank_details
+        {conditions}
+        ORDER BY org.modified DESC, org.name DESC
+        LIMIT %(limit)s
+    """, values, as_dict=True)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["modified"], rows[-1]["name"])
+
+    result = []
+    for row in rows:
+        org = {"doctype": "Organization Details"}
+        org.update({f: row[f] for f in ORGANIZATION_LIST_FIELDS})
+        org["logo_url"] = frappe.utils.get_url(org["logo"]) if org["logo"] else None
+
+        bank = None
+        if row["bank__name"]:
+            bank = {"doctype": "Bank Details"}
+            bank.update({f: row[f"bank__{f}"] for f in BANK_DETAILS_LIST_FIELDS})
+
+        result.append({"organization": org, "bank_details": bank})
+
+    return result, next_cursor
+
+
 @frappe.whitelist()
-def get_all_organizations():
+@instrumented
+def get_all_organizations(limit=None, cursor=None, format=None):
     require_login()
-    orgs = frappe.get_all(
-        "Organization Details",
-        fields=[
-            "name", "organization_name", "organization_email", "organization_contact_no",
-            "status", "country", "organization_city", "organization_street",
-            "organization_street_number", "zip_code", "logo", "bank_details"
-        ],
-        order_by="modified desc"
-    )
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified(["Organization Details", "Bank Details"], limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    result = []
-    for org in orgs:
-        org_doc = frappe.get_doc("Organization Details", org["name"])
-        bank_doc = frappe.get_doc("Bank Details", org_doc.bank_details) if org_doc.bank_details else None
-
-        result.append({
-            "organization": {
-                **org_doc.as_dict(),
-                "logo_url": frappe.utils.get_url(org_doc.logo) if org_doc.logo else None
-            },
-            "bank_details": bank_doc.as_dict() if bank_doc else None
-        })
+    result, next_cursor = fetch_organizations_with_bank_details(limit, cursor)
 
-    return {"status": "success",
-            "count": len(result),
-            "data": result
-            }
+    return encode_list({
+        "status": "success",
+        "count": len(result),
+        "next_cursor": next_cursor,
+        "data": result
+    }, response_format, "data")
 
 
 # -----------------------------
 # GET SPECIFIC ORGANIZATION
 # -----------------------------
 @frappe.whitelist()
-def get_organization(name=None, email=None, organization_name=None):
+@instrumented
+def get_organization(name=None, email=None, organization_name=None, fields=None, exclude=None, expand=None):
     require_login()
 
     if not any([name, email, organization_name]):
         frappe.throw("Provide 'name', 'email', or 'organization_name' to fetch the organization.")
 
     if name:
-        org_doc = frappe.get_doc("Organization Details", name)
+        org_name = name
     elif email:
-        org_list = frappe.get_all("Organization Details", filters={"organization_email": email}, fields=["name"], limit=1)
-        if not org_list:
+        org_name = frappe.db.get_value("Organization Details", {"organization_email": email}, "name")
+        if not org_name:
             frappe.throw(f"Organization not found for email '{email}'")
-        org_doc = frappe.get_doc("Organization Details", org_list[0]["name"])
     else:  # organization_name
-        org_list = frappe.get_all("Organization Details", filters={"organization_name": organization_name}, fields=["name"], limit=1)
-        if not org_list:
+        org_name = frappe.db.get_value("Organization Details", {"organization_name": organization_name}, "name")
+        if not org_name:
             frappe.throw(f"Organization not found for name '{organization_name}'")
-        org_doc = frappe.get_doc("Organization Details", org_list[0]["name"])
 
+    not_modified = record_not_modified(
+        "Organization Details", org_name, fields, exclude, expand, linked=("Bank Details", "bank_details")
+    )
+    if not_modified:
+        return not_modified
+
+    if fields or exclude or expand:
+        # bank details are nested only when asked for with expand=["bank_details"]
+        organization = get_projection("Organization Details", org_name, fields, exclude, expand)
+        if organization.get("logo"):
+            organization["logo_url"] = frappe.utils.get_url(organization["logo"])
+        return {"status": "success", "organization": organization}
+
+    org_doc = frappe.get_doc("Organization Details", org_name)
     bank_doc = frappe.get_doc("Bank Details", org_doc.bank_details) if org_doc.bank_details else None
 
     return {
@@ -186,6 +536,7 @@ def get_organization(name=None, email=None, organization_name=None):
 # UPDATE ORGANIZATION
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def update_organization():
     require_login()
     data = _req()
@@ -211,6 +562,8 @@ def update_organization():
             frappe.throw(f"Organization not found for name '{org_name}'")
         org_doc = frappe.get_doc("Organization Details", org_list[0]["name"])
 
+    validate_payload("Organization Details", data, doc=org_doc)
+
     updatable_fields = [
         "organization_name", "organization_email", "organization_contact_no",
         "status", "country", "organization_city", "organization_street",
@@ -226,6 +579,7 @@ def update_organization():
 
     if org_doc.bank_details:
         bank_doc = frappe.get_doc("Bank Details", org_doc.bank_details)
+        validate_payload("Bank Details", data, doc=bank_doc)
         if data.get("iban_no"):
             bank_doc.iban_no = data.get("iban_no")
         if data.get("bank_name"):
@@ -249,6 +603,7 @@ def update_organization():
 # DELETE ORGANIZATION
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def delete_organization(name=None, email=None, organization_name=None):
     require_login()
 
@@ -297,45 +652,19 @@ def delete_organization(name=None, email=None, organization_name=None):
 def _req():
     return frappe.request.get_json() or {}
 
-def parse_int(value):
-    if value in (None, ""):
-        return None
-    try:
-        return int(value)
-    except:
-        frappe.throw(f"Invalid number: {value}")
-
-def validate_person(person_name):
-    if person_name and not frappe.db.exists("Person Details", person_name):
-        frappe.throw(f"Person '{person_name}' does not exist in Person Details")
-
-def validate_shelter(shelter_name):
-    if shelter_name and not frappe.db.exists("Animal Shelters", shelter_name):
-        frappe.throw(f"Shelter '{shelter_name}' does not exist")
-
-def fetch_person_details(person_name):
-    if not person_name:
-        return {"first_name": "", "last_name": ""}
-    doc = frappe.get_doc("Person Details", person_name)
-    return {"first_name": doc.first_name, "last_name": doc.last_name}
-
 
 # -----------------------------
 # CREATE ANIMAL
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def create_animal():
     require_login()
     data = _req()
 
-    source = data.get("source")
-    animal_type = data.get("animal_type")
-
-    if source not in ("Person", "Animal Shelter"):
-        frappe.throw("Source must be 'Person' or 'Animal Shelter'")
-
-    if animal_type not in ("Dog", "Cat"):
-        frappe.throw("Animal Type must be 'Dog' or 'Cat'")
+    values = validate_payload("Animal Information", data, links=get_link_resolver())
+    source = values["source"]
+    animal_type = values["animal_type"]
 
     docdata = {
         "doctype": "Animal Information",
@@ -345,12 +674,8 @@ def create_animal():
 
     # -------------------- SOURCE TOGGLE --------------------
     if source == "Person":
-        person = data.get("person_details")
-        if not person:
-            frappe.throw("Person Details is required")
-
-        validate_person(person)
-        p = frappe.get_doc("Person Details", person)
+        person = values["person_details"]
+        p = get_link_resolver().get("Person Details", person)
 
         docdata.update({
             "person_details": person,
@@ -361,12 +686,8 @@ def create_animal():
         })
 
     else:
-        shelter = data.get("shelter_detail")
-        if not shelter:
-            frappe.throw("Shelter Detail is required")
-
-        validate_shelter(shelter)
-        s = frappe.get_doc("Animal Shelters", shelter)
+        shelter = values["shelter_detail"]
+        s = get_link_resolver().get("Animal Shelters", shelter)
 
         docdata.update({
             "shelter_detail": shelter,
@@ -379,18 +700,18 @@ def create_animal():
     # -------------------- ANIMAL TYPE --------------------
     if animal_type == "Dog":
         docdata.update({
-            "adult_dogs": parse_int(data.get("adult_dogs")),
-            "puppies": parse_int(data.get("puppies")),
-            "senior_sick_dogs": parse_int(data.get("senior_sick_dogs")),
+            "adult_dogs": values.get("adult_dogs"),
+            "puppies": values.get("puppies"),
+            "senior_sick_dogs": values.get("senior_sick_dogs"),
             "adult_cats": None,
             "kittens": None,
             "senior_sick_cats": None
         })
     else:
         docdata.update({
-            "adult_cats": parse_int(data.get("adult_cats")),
-            "kittens": parse_int(data.get("kittens")),
-            "senior_sick_cats": parse_int(data.get("senior_sick_cats")),
+            "adult_cats": values.get("adult_cats"),
+            "kittens": values.get("kittens"),
+            "senior_sick_cats": values.get("senior_sick_cats"),
             "adult_dogs": None,
             "puppies": None,
             "senior_sick_dogs": None
@@ -413,35 +734,43 @@ def create_animal():
 # READ ALL ANIMALS
 # -----------------------------
 @frappe.whitelist()
-def get_all_animals():
+@instrumented
+def get_all_animals(limit=None, cursor=None, format=None):
     require_login()
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Animal Information", limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    animals = frappe.get_all(
+    animals, next_cursor = paginate(
         "Animal Information",
         fields=[
             "name", "animal_type", "source",
             "person_details", "first_name", "last_name",
             "shelter_detail", "shelter_name", "modified"
         ],
-        order_by="modified desc"
+        limit=limit,
+        cursor=cursor
     )
 
     for a in animals:
         a["display_name"] = a["first_name"] + " " + a["last_name"] if a["source"] == "Person" else a["shelter_name"]
 
-    return {
+    return encode_list({
         "status": "success",
         "count": len(animals),
+        "next_cursor": next_cursor,
         "message": "Animal records fetched successfully.",
         "data": animals
-    }
+    }, response_format, "data")
 
 
 # -----------------------------
 # READ SINGLE ANIMAL
 # -----------------------------
 @frappe.whitelist()
-def get_animal(name=None, person_details=None, shelter_detail=None):
+@instrumented
+def get_animal(name=None, person_details=None, shelter_detail=None, fields=None, exclude=None, expand=None):
     require_login()
     if not any([name, person_details, shelter_detail]):
         frappe.throw("Provide at least one identifier: name, person_details, or shelter_detail")
@@ -449,24 +778,31 @@ def get_animal(name=None, person_details=None, shelter_detail=None):
     if name:
         if not frappe.db.exists("Animal Information", name):
             frappe.throw(f"Animal record '{name}' not found")
-        doc = frappe.get_doc("Animal Information", name)
+        animal_name = name
     elif person_details:
-        docs = frappe.get_all("Animal Information", filters={"person_details": person_details}, limit_page_length=1)
-        if not docs:
+        animal_name = frappe.db.get_value("Animal Information", {"person_details": person_details}, "name")
+        if not animal_name:
             frappe.throw(f"No animal record found for the given person_details")
-        doc = frappe.get_doc("Animal Information", docs[0].name)
     else:
-        docs = frappe.get_all("Animal Information", filters={"shelter_detail": shelter_detail}, limit_page_length=1)
-        if not docs:
+        animal_name = frappe.db.get_value("Animal Information", {"shelter_detail": shelter_detail}, "name")
+        if not animal_name:
             frappe.throw(f"No animal record found for the given shelter_detail")
-        doc = frappe.get_doc("Animal Information", docs[0].name)
 
-    display_name = doc.first_name + " " + doc.last_name if doc.source == "Person" else doc.shelter_name
+    not_modified = record_not_modified("Animal Information", animal_name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
+
+    animal = get_projection("Animal Information", animal_name, fields, exclude, expand)
+
+    if animal.get("source") == "Person":
+        display_name = f"{animal.get('first_name') or ''} {animal.get('last_name') or ''}".strip()
+    else:
+        display_name = animal.get("shelter_name")
 
     return {
         "status": "success",
-        "message": f"Animal information fetched successfully for '{display_name}'.",
-        "animal": doc.as_dict()
+        "message": f"Animal information fetched successfully for '{display_name or animal_name}'.",
+        "animal": animal
     }
 
 
@@ -474,6 +810,7 @@ def get_animal(name=None, person_details=None, shelter_detail=None):
 # UPDATE ANIMAL
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def update_animal():
     require_login()
     data = _req()
@@ -483,59 +820,56 @@ def update_animal():
         frappe.throw("Animal record name is required")
 
     doc = frappe.get_doc("Animal Information", name)
+    values = validate_payload("Animal Information", data, doc=doc, links=get_link_resolver())
 
-    source = data.get("source", doc.source)
-    animal_type = data.get("animal_type", doc.animal_type)
+    source = values.get("source", doc.source)
+    animal_type = values.get("animal_type", doc.animal_type)
 
-    if source not in ("Person", "Animal Shelter"):
-        frappe.throw("Invalid source value")
-
-    if animal_type not in ("Dog", "Cat"):
-        frappe.throw("Invalid animal type")
-
-    doc.db_set("source", source)
-    doc.db_set("animal_type", animal_type)
+    doc.set("source", source)
+    doc.set("animal_type", animal_type)
 
     # -------------------- SOURCE TOGGLE --------------------
     if source == "Person":
-        person = data.get("person_details", doc.person_details)
+        person = values.get("person_details", doc.person_details)
         validate_person(person)
-        p = frappe.get_doc("Person Details", person)
+        p = get_link_resolver().get("Person Details", person)
 
-        doc.db_set("person_details", person)
-        doc.db_set("first_name", p.first_name)
-        doc.db_set("last_name", p.last_name)
-        doc.db_set("shelter_detail", None)
-        doc.db_set("shelter_name", "")
+        doc.set("person_details", person)
+        doc.set("first_name", p.first_name)
+        doc.set("last_name", p.last_name)
+        doc.set("shelter_detail", None)
+        doc.set("shelter_name", "")
 
     else:
-        shelter = data.get("shelter_detail", doc.shelter_detail)
+        shelter = values.get("shelter_detail", doc.shelter_detail)
         validate_shelter(shelter)
-        s = frappe.get_doc("Animal Shelters", shelter)
+        s = get_link_resolver().get("Animal Shelters", shelter)
 
-        doc.db_set("shelter_detail", shelter)
-        doc.db_set("shelter_name", s.shelter_name)
-        doc.db_set("person_details", None)
-        doc.db_set("first_name", "")
-        doc.db_set("last_name", "")
+        doc.set("shelter_detail", shelter)
+        doc.set("shelter_name", s.shelter_name)
+        doc.set("person_details", None)
+        doc.set("first_name", "")
+        doc.set("last_name", "")
 
     # -------------------- ANIMAL TYPE --------------------
     if animal_type == "Dog":
-        doc.db_set("adult_dogs", parse_int(data.get("adult_dogs")))
-        doc.db_set("puppies", parse_int(data.get("puppies")))
-        doc.db_set("senior_sick_dogs", parse_int(data.get("senior_sick_dogs")))
+        doc.set("adult_dogs", values.get("adult_dogs"))
+        doc.set("puppies", values.get("puppies"))
+        doc.set("senior_sick_dogs", values.get("senior_sick_dogs"))
         # doc.db_set("adult_cats", None)
         # doc.db_set("kittens", None)
         # doc.db_set("senior_sick_cats", None)
 
     else:
-        doc.db_set("adult_cats", parse_int(data.get("adult_cats")))
-        doc.db_set("kittens", parse_int(data.get("kittens")))
-        doc.db_set("senior_sick_cats", parse_int(data.get("senior_sick_cats")))
+        doc.set("adult_cats", values.get("adult_cats"))
+        doc.set("kittens", values.get("kittens"))
+        doc.set("senior_sick_cats", values.get("senior_sick_cats"))
         # doc.db_set("adult_dogs", None)
         # doc.db_set("puppies", None)
         # doc.db_set("senior_sick_dogs", None)
 
+    # save (not db_set) so the animal census follows the counts
+    doc.save(ignore_permissions=True)
     frappe.db.commit()
 
     return {
@@ -550,6 +884,7 @@ def update_animal():
 # DELETE ANIMAL
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def delete_animal(name=None):
     require_login()
     if not name:
@@ -565,22 +900,65 @@ def delete_animal(name=None):
     }
 
 
+# -----------------------------
+# ANIMAL CENSUS
+# -----------------------------
+@frappe.whitelist()
+@instrumented
+def get_animal_census(recipient_type=None, recipient=None, limit=None, format=None):
+    """Overall animal totals plus the most populated persons and shelters, served from the census"""
+    require_login()
+    from homie_app.homie_app.doctype.animal_census.animal_census import get_census
+
+    limit = min(cint(limit) or DEFAULT_PAGE_LENGTH, MAX_PAGE_LENGTH)
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Animal Census", recipient_type, recipient, limit, response_format)
+    if not_modified:
+        return not_modified
+
+    overall, data = get_census(recipient_type, recipient, limit)
+
+    return encode_list({
+        "status": "success",
+        "count": len(data),
+        "message": "🐾 Animal census retrieved successfully.",
+        "overall": overall,
+        "data": data
+    }, response_format, "data")
+
+
+@frappe.whitelist()
+@instrumented
+def get_animal_census_trend(recipient_type=None, recipient=None, from_date=None, to_date=None):
+    """Daily census snapshots of one person or shelter, or of all animals when no recipient is given"""
+    require_login()
+    from homie_app.homie_app.doctype.animal_census.animal_census import get_trend
+
+    not_modified = list_not_modified("Animal Census Snapshot", recipient_type, recipient, from_date, to_date)
+    if not_modified:
+        return not_modified
+
+    data = get_trend(recipient_type, recipient, from_date, to_date)
+
+    return {
+        "status": "success",
+        "count": len(data),
+        "data": data
+    }
+
+
 # ----------------------------- PERSON DETAILS API'S -----------------------------
 
 # -----------------------------
 # CREATE PERSONS
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def create_person():
     require_login()
     data = _req()
 
-    required = ["first_name", "last_name", "email", "contact_no"]
-    for f in required:
-        if not data.get(f):
-            frappe.throw(f"'{f}' is required")
-
-    validate_email(data["email"])
+    validate_payload("Person Details", data)
 
     if frappe.db.exists("Person Details", {"email": data["email"]}):
         frappe.throw(f"Person with email '{data['email']}' already exists")
@@ -609,7 +987,8 @@ def create_person():
 # READ PERSON
 # -----------------------------
 @frappe.whitelist()
-def get_person(name=None, email=None, first_name=None):
+@instrumented
+def get_person(name=None, email=None, first_name=None, fields=None, exclude=None, expand=None):
     require_login()
 
     # -----------------------------
@@ -623,51 +1002,23 @@ def get_person(name=None, email=None, first_name=None):
     # -----------------------------
     # FIND PERSON NAME
     # -----------------------------
-    person_name = None
-
-    if name:
-        if not frappe.db.exists("Person Details", name):
-            frappe.throw(f"No person found with name '{name}'.")
-        person_name = name
-
-    elif email:
+    if email and not name:
         validate_email(email)
-        person_name = frappe.db.get_value(
-            "Person Details",
-            {"email": email},
-            "name"
-        )
-        if not person_name:
-            frappe.throw(f"No person found with email '{email}'.")
-
-    else:  # first_name
-        matches = frappe.get_all(
-            "Person Details",
-            filters={"first_name": first_name},
-            fields=["name", "full_name"],
-            limit_page_length=2
-        )
-
-        if not matches:
-            frappe.throw(f"No person found with first name '{first_name}'.")
-
-        if len(matches) > 1:
-            frappe.throw(
-                f"Multiple persons found with first name '{first_name}'. "
-                "Please search using email or name instead."
-            )
-
-        person_name = matches[0]["name"]
+    person_name = resolve_person(name, email, first_name)
 
     # -----------------------------
     # FETCH DOCUMENT
     # -----------------------------
-    doc = frappe.get_doc("Person Details", person_name)
+    not_modified = record_not_modified("Person Details", person_name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
+
+    person = get_projection("Person Details", person_name, fields, exclude, expand)
 
     return {
         "status": "success",
-        "message": f"Person '{doc.full_name}' fetched successfully.",
-        "data": doc.as_dict()
+        "message": f"Person '{person.get('full_name') or person_name}' fetched successfully.",
+        "data": person
     }
 
 
@@ -676,16 +1027,47 @@ def get_person(name=None, email=None, first_name=None):
 # -----------------------------
 # READ ALL PERSON
 # -----------------------------
+PERSON_LIST_FIELDS = [
+    "name", "first_name", "last_name", "full_name", "email", "contact_no",
+    "street", "street_number", "person_country", "person_city", "zip_code",
+    "creation", "modified"
+]
+
+
 @frappe.whitelist()
-def get_all_persons():
+@instrumented
+def get_all_persons(limit=None, cursor=None, fields=None, format=None):
     require_login()
-    records = frappe.get_all(
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Person Details", limit, cursor, fields, response_format)
+    if not_modified:
+        return not_modified
+
+    result, next_cursor = paginate(
         "Person Details",
-        fields=["email", "first_name", "last_name", "contact_no", "street", "street_number", "person_country", "person_city", "zip_code", "modified"],
-        order_by="modified desc"
+        fields=parse_fields(fields, PERSON_LIST_FIELDS) or PERSON_LIST_FIELDS,
+        limit=limit,
+        cursor=cursor
     )
 
-    result = [frappe.get_doc("Person Details", r["email"]).as_dict() for r in records]
+    return encode_list({"status": "success", "count": len(result), "next_cursor": next_cursor, "data": result}, response_format, "data")
+
+
+# -----------------------------
+# SEARCH PERSONS
+# -----------------------------
+SEARCH_PAGE_LENGTH = 20
+
+
+@frappe.whitelist()
+@instrumented
+def search_persons(q=None, limit=None):
+    """Typeahead over name, email, phone and city; every word in `q` must prefix-match"""
+    require_login()
+    from homie_app.homie_app.doctype.person_search_index.person_search_index import search_person_index
+
+    limit = min(cint(limit) or SEARCH_PAGE_LENGTH, MAX_PAGE_LENGTH)
+    result = search_person_index(q, limit)
 
     return {"status": "success", "count": len(result), "data": result}
 
@@ -694,6 +1076,7 @@ def get_all_persons():
 # UPDATE PERSON
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def update_person():
     require_login()
     data = _req()
@@ -713,46 +1096,15 @@ def update_person():
     # -----------------------------
     # RESOLVE PERSON NAME
     # -----------------------------
-    person_name = None
-
-    if name:
-        if not frappe.db.exists("Person Details", name):
-            frappe.throw(f"No person found with name '{name}'.")
-        person_name = name
-
-    elif email:
+    if email and not name:
         validate_email(email)
-        person_name = frappe.db.get_value(
-            "Person Details",
-            {"email": email},
-            "name"
-        )
-        if not person_name:
-            frappe.throw(f"No person found with email '{email}'.")
-
-    else:  # first_name
-        matches = frappe.get_all(
-            "Person Details",
-            filters={"first_name": first_name},
-            fields=["name"],
-            limit_page_length=2
-        )
-
-        if not matches:
-            frappe.throw(f"No person found with first name '{first_name}'.")
-
-        if len(matches) > 1:
-            frappe.throw(
-                f"Multiple persons found with first name '{first_name}'. "
-                "Please use email or name instead."
-            )
-
-        person_name = matches[0]["name"]
+    person_name = resolve_person(name, email, first_name)
 
     # -----------------------------
     # UPDATE DOCUMENT
     # -----------------------------
     doc = frappe.get_doc("Person Details", person_name)
+    values = validate_payload("Person Details", data, doc=doc)
 
     updatable_fields = [
         "first_name", "last_name", "contact_no",
@@ -763,7 +1115,7 @@ def update_person():
     updated = False
     for field in updatable_fields:
         if field in data:
-            doc.set(field, data.get(field))
+            doc.set(field, values[field])
             updated = True
 
     if not updated:
@@ -784,6 +1136,7 @@ def update_person():
 # DELETE PERSON
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def delete_person(name=None, email=None, first_name=None):
     require_login()
 
@@ -798,41 +1151,9 @@ def delete_person(name=None, email=None, first_name=None):
     # -----------------------------
     # RESOLVE PERSON NAME
     # -----------------------------
-    person_name = None
-
-    if name:
-        if not frappe.db.exists("Person Details", name):
-            frappe.throw(f"No person found with name '{name}'.")
-        person_name = name
-
-    elif email:
+    if email and not name:
         validate_email(email)
-        person_name = frappe.db.get_value(
-            "Person Details",
-            {"email": email},
-            "name"
-        )
-        if not person_name:
-            frappe.throw(f"No person found with email '{email}'.")
-
-    else:  # first_name
-        matches = frappe.get_all(
-            "Person Details",
-            filters={"first_name": first_name},
-            fields=["name", "full_name"],
-            limit_page_length=2
-        )
-
-        if not matches:
-            frappe.throw(f"No person found with first name '{first_name}'.")
-
-        if len(matches) > 1:
-            frappe.throw(
-                f"Multiple persons found with first name '{first_name}'. "
-                "Please use email or name instead."
-            )
-
-        person_name = matches[0]["name"]
+    person_name = resolve_person(name, email, first_name)
 
     # -----------------------------
     # DELETE DOCUMENT
@@ -856,7 +1177,7 @@ def delete_person(name=None, email=None, first_name=None):
 
 def validate_contact_person(name):
     """Ensure linked Contact Person exists"""
-    if name and not frappe.db.exists("Person Details", name):
+    if name and not get_link_resolver().exists("Person Details", name):
         frappe.throw(f"Contact person '{name}' does not exist.")
 
 
@@ -866,27 +1187,18 @@ def validate_contact_person(name):
 # CREATE
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def create_shelter():
     require_login()
     data = _req()
 
-    # Required: shelter_name
-    if not data.get("shelter_name"):
-        frappe.throw("'shelter_name' is required.")
-
-    # Validate forklift
-    if data.get("forklift") not in (0, 1, "0", "1", None):
-        frappe.throw("'forklift' must be 0 or 1.")
-
-    # Validate truck_access
-    if data.get("truck_access") not in ("Yes", "No"):
-        frappe.throw("'truck_access' must be 'Yes' or 'No'.")
+    values = validate_payload("Animal Shelters", data)
 
     docdata = {
         "doctype": "Animal Shelters",
-        "shelter_name": data.get("shelter_name"),
-        "forklift": int(data.get("forklift", 0)),
-        "truck_access": data.get("truck_access", "No"),
+        "shelter_name": values["shelter_name"],
+        "forklift": values.get("forklift", 0),
+        "truck_access": values["truck_access"],
         "country": data.get("country"),
         "city": data.get("city"),
         "street": data.get("street"),
@@ -906,7 +1218,8 @@ def create_shelter():
 
 
 @frappe.whitelist()
-def get_shelter(shelter_name=None, name=None):
+@instrumented
+def get_shelter(shelter_name=None, name=None, fields=None, exclude=None, expand=None):
     require_login()
 
     if not any([shelter_name, name]):
@@ -922,11 +1235,15 @@ def get_shelter(shelter_name=None, name=None):
     if not docs:
         frappe.throw("Shelter not found with the provided identifier.")
 
-    doc = frappe.get_doc("Animal Shelters", docs[0].name)
+    not_modified = record_not_modified("Animal Shelters", docs[0].name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
+
+    shelter = get_projection("Animal Shelters", docs[0].name, fields, exclude, expand)
     return {
         "status": "success",
-        "message": f"Shelter '{doc.shelter_name}' details retrieved successfully!",
-        "shelter": doc.as_dict()
+        "message": f"Shelter '{shelter.get('shelter_name') or shelter.name}' details retrieved successfully!",
+        "shelter": shelter
     }
 
 
@@ -937,22 +1254,27 @@ def get_shelter(shelter_name=None, name=None):
 # -----------------------------
 
 @frappe.whitelist()
-def get_all_shelters():
+@instrumented
+def get_all_shelters(limit=None, cursor=None, format=None):
     require_login()
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Animal Shelters", limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    records = frappe.get_all(
+    result, next_cursor = paginate(
         "Animal Shelters",
-        fields=["name", "shelter_name", "country", "city", "truck_access", "modified"],
-        order_by="modified desc"
+        fields=get_record_fields("Animal Shelters"),
+        limit=limit,
+        cursor=cursor
     )
 
-    result = [frappe.get_doc("Animal Shelters", r["name"]).as_dict() for r in records]
-
-    return {
+    return encode_list({
         "status": "success",
         "message": f"{len(result)} shelters retrieved successfully!",
+        "next_cursor": next_cursor,
         "shelters": result
-    }
+    }, response_format, "shelters")
 
 # -----------------------------
 # UPADTE
@@ -960,6 +1282,7 @@ def get_all_shelters():
 
 
 @frappe.whitelist()
+@instrumented
 def update_shelter():
     require_login()
     data = _req()
@@ -978,21 +1301,16 @@ def update_shelter():
         frappe.throw("Shelter not found.")
 
     doc = frappe.get_doc("Animal Shelters", docs[0].name)
-
-    # Validate forklift
-    if "forklift" in data and data["forklift"] not in (0, 1, "0", "1"):
-        frappe.throw("'forklift' must be 0 or 1.")
-
-    # Validate truck_access
-    if "truck_access" in data and data["truck_access"] not in ("Yes", "No"):
-        frappe.throw("'truck_access' must be 'Yes' or 'No'.")
+    values = validate_payload("Animal Shelters", data, doc=doc)
 
     update_fields = ["shelter_name", "forklift", "truck_access", "country", "city", "street", "street_number"]
 
     for f in update_fields:
         if f in data and data[f] is not None:
-            value = int(data[f]) if f == "forklift" else data[f]
-            doc.db_set(f, value, update_modified=True)
+            doc.set(f, values[f])
+
+    # save (not db_set) so a renamed shelter propagates to the records copying its name
+    doc.save(ignore_permissions=True)
 
     return {
         "status": "success",
@@ -1009,6 +1327,7 @@ def update_shelter():
 
 
 @frappe.whitelist()
+@instrumented
 def delete_shelter(shelter_name=None, name=None):
     require_login()
 
@@ -1048,55 +1367,30 @@ from frappe.utils import flt
 def _req():
     return frappe.request.get_json() or {}
 
-def parse_float(value):
-    if value in (None, ""):
-        return None
-    try:
-        return flt(value)
-    except Exception:
-        frappe.throw(f"Invalid currency value: {value}")
-
-def validate_person(person_name):
-    if person_name and not frappe.db.exists("Person Details", person_name):
-        frappe.throw(f"Person '{person_name}' does not exist.")
-
-def validate_shelter(shelter_name):
-    if shelter_name and not frappe.db.exists("Animal Shelters", shelter_name):
-        frappe.throw(f"Shelter '{shelter_name}' does not exist.")
-
 # -----------------------------
 # CREATE FOOD DEMAND
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def create_food_demand():
     require_login()
     data = _req()
 
     # -----------------------------
-    # Validate dropdown
+    # Validate dropdown, conditional required fields and links
     # -----------------------------
-    order_by = data.get("order_by")
-    if order_by not in ("Person", "Animal Shelters"):
-        frappe.throw("'order_by' must be either 'Person' or 'Animal Shelters'.")
-
-    # -----------------------------
-    # Conditional required fields
-    # -----------------------------
-    if order_by == "Person" and not data.get("person_details"):
-        frappe.throw("Person Details is required when order_by is 'Person'.")
-    if order_by == "Animal Shelters" and not data.get("contacted_animal_shelter"):
-        frappe.throw("Animal Shelter is required when order_by is 'Animal Shelters'.")
+    values = validate_payload("Food Demands", data, links=get_link_resolver())
+    order_by = values["order_by"]
 
     # -----------------------------
     # Auto-fill linked data
     # -----------------------------
-    person_details = data.get("person_details")
-    contacted_animal_shelter = data.get("contacted_animal_shelter")
+    person_details = values.get("person_details")
+    contacted_animal_shelter = values.get("contacted_animal_shelter")
 
     # Person info
     if person_details:
-        validate_person(person_details)
-        person = frappe.get_doc("Person Details", person_details)
+        person = get_link_resolver().get("Person Details", person_details)
         first_name = person.first_name or ""
         last_name = person.last_name or ""
     else:
@@ -1105,11 +1399,7 @@ def create_food_demand():
 
     # Shelter info
     if contacted_animal_shelter:
-        validate_shelter(contacted_animal_shelter)
-        shelter_name = (
-            frappe.db.get_value("Animal Shelters", contacted_animal_shelter, "shelter_name")
-            or contacted_animal_shelter
-        )
+        shelter_name = fetch_shelter_name(contacted_animal_shelter)
     else:
         shelter_name = ""
 
@@ -1127,10 +1417,10 @@ def create_food_demand():
         "contacted_animal_shelter": contacted_animal_shelter,
         "shelter_name": shelter_name,
 
-        "castration_costs": parse_float(data.get("castration_costs")),
-        "castration_costs_in": parse_float(data.get("castration_costs_in")),
+        "castration_costs": values.get("castration_costs"),
+        "castration_costs_in": values.get("castration_costs_in"),
         "exemption_notice": data.get("exemption_notice"),
-        "notice_issue_date": data.get("notice_issue_date"),
+        "notice_issue_date": values.get("notice_issue_date"),
         "food_requirements_dogs": data.get("food_requirements_dogs"),
         "food_requirements_cats": data.get("food_requirements_cats"),
         "animal_shelter_statues": data.get("animal_shelter_statues"),
@@ -1149,7 +1439,8 @@ def create_food_demand():
 # READ SINGLE
 # -----------------------------
 @frappe.whitelist()
-def get_food_demand(name=None):
+@instrumented
+def get_food_demand(name=None, fields=None, exclude=None, expand=None):
     require_login()
     if not name:
         frappe.throw("'name' (DEM-.######) is required.")
@@ -1157,40 +1448,48 @@ def get_food_demand(name=None):
     if not frappe.db.exists("Food Demands", name):
         frappe.throw("Food demand record not found.")
 
-    doc = frappe.get_doc("Food Demands", name)
+    not_modified = record_not_modified("Food Demands", name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
 
     return {
         "status": "success",
         "message": f"📦 Food demand '{name}' fetched successfully.",
-        "data": doc.as_dict()
+        "data": get_projection("Food Demands", name, fields, exclude, expand)
     }
 
 # -----------------------------
 # READ ALL
 # -----------------------------
 @frappe.whitelist()
-def get_all_food_demands():
+@instrumented
+def get_all_food_demands(limit=None, cursor=None, format=None):
     require_login()
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Food Demands", limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    records = frappe.get_all(
+    data, next_cursor = paginate(
         "Food Demands",
-        fields=["name"],
-        order_by="modified desc"
+        fields=get_record_fields("Food Demands"),
+        limit=limit,
+        cursor=cursor
     )
 
-    data = [frappe.get_doc("Food Demands", r.name).as_dict() for r in records]
-
-    return {
+    return encode_list({
         "status": "success",
         "count": len(data),
+        "next_cursor": next_cursor,
         "message": f"📋 {len(data)} food demand records retrieved successfully.",
         "data": data
-    }
+    }, response_format, "data")
 
 # -----------------------------
 # UPDATE FOOD DEMAND
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def update_food_demand():
     require_login()
     data = _req()
@@ -1205,29 +1504,19 @@ def update_food_demand():
     doc = frappe.get_doc("Food Demands", name)
 
     # -----------------------------
-    # Validate dropdown
-    # -----------------------------
-    order_by = data.get("order_by") or doc.order_by
-    if order_by not in ("Person", "Animal Shelters"):
-        frappe.throw("'order_by' must be either 'Person' or 'Animal Shelters'.")
-
-    # -----------------------------
-    # Conditional required fields
+    # Validate dropdown, conditional required fields and links
     # -----------------------------
-    if order_by == "Person" and not (data.get("person_details") or doc.person_details):
-        frappe.throw("Person Details is required when order_by is 'Person'.")
-    if order_by == "Animal Shelters" and not (data.get("contacted_animal_shelter") or doc.contacted_animal_shelter):
-        frappe.throw("Animal Shelter is required when order_by is 'Animal Shelters'.")
+    values = validate_payload("Food Demands", data, doc=doc, links=get_link_resolver())
 
     # -----------------------------
     # Auto-fill & validate links
     # -----------------------------
-    person_details = data.get("person_details") or doc.person_details
-    contacted_animal_shelter = data.get("contacted_animal_shelter") or doc.contacted_animal_shelter
+    person_details = values.get("person_details") or doc.person_details
+    contacted_animal_shelter = values.get("contacted_animal_shelter") or doc.contacted_animal_shelter
 
     if person_details:
         validate_person(person_details)
-        person = frappe.get_doc("Person Details", person_details)
+        person = get_link_resolver().get("Person Details", person_details)
         doc.first_name = person.first_name or ""
         doc.last_name = person.last_name or ""
     else:
@@ -1236,10 +1525,7 @@ def update_food_demand():
 
     if contacted_animal_shelter:
         validate_shelter(contacted_animal_shelter)
-        doc.shelter_name = (
-            frappe.db.get_value("Animal Shelters", contacted_animal_shelter, "shelter_name")
-            or contacted_animal_shelter
-        )
+        doc.shelter_name = fetch_shelter_name(contacted_animal_shelter)
     else:
         doc.shelter_name = ""
 
@@ -1261,8 +1547,11 @@ def update_food_demand():
 
     for field in update_fields:
         if field in data:
-            value = parse_float(data[field]) if field in ("castration_costs", "castration_costs_in") else data[field]
-            doc.db_set(field, value, update_modified=True)
+            doc.set(field, values[field])
+
+    # save (not db_set) so the requirement quantities are re-parsed and the fulfillment ledger follows
+    doc.save(ignore_permissions=True)
+    frappe.db.commit()
 
     return {
         "status": "success",
@@ -1274,6 +1563,7 @@ def update_food_demand():
 # DELETE FOOD DEMAND
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def delete_food_demand(name=None):
     require_login()
     if not name:
@@ -1290,6 +1580,34 @@ def delete_food_demand(name=None):
         "message": f"🗑️ Food demand '{name}' deleted successfully."
     }
 
+# -----------------------------
+# OUTSTANDING FOOD DEMAND
+# -----------------------------
+SHORTFALL_PAGE_LENGTH = 20
+
+
+@frappe.whitelist()
+@instrumented
+def get_food_shortfall(recipient_type=None, limit=None, format=None):
+    """Persons and shelters whose demanded food exceeds what was delivered, largest shortfall first"""
+    require_login()
+    from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import get_shortfall
+
+    limit = min(cint(limit) or SHORTFALL_PAGE_LENGTH, MAX_PAGE_LENGTH)
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Food Fulfillment Ledger", recipient_type, limit, response_format)
+    if not_modified:
+        return not_modified
+
+    data = get_shortfall(recipient_type, limit)
+
+    return encode_list({
+        "status": "success",
+        "count": len(data),
+        "message": "📦 Outstanding food demand retrieved successfully.",
+        "data": data
+    }, response_format, "data")
+
 
 # ----------------------------- Delivery Information API -----------------------------
 
@@ -1304,18 +1622,6 @@ def _req():
     """Get request JSON data safely"""
     return frappe.request.get_json() or {}
 
-def validate_person(person_name):
-    if person_name and not frappe.db.exists("Person Details", person_name):
-        frappe.throw(f"Person '{person_name}' does not exist.")
-
-def validate_shelter(shelter_name):
-    if shelter_name and not frappe.db.exists("Animal Shelters", shelter_name):
-        frappe.throw(f"Shelter '{shelter_name}' does not exist.")
-
-def validate_organization(org_name):
-    if org_name and not frappe.db.exists("Organization Details", org_name):
-        frappe.throw(f"Organization '{org_name}' does not exist.")
-
 def update_display_title(deleivery_type, person, organization):
     if deleivery_type == "Own Purchase" and person:
         return f"Purchased by {person}"
@@ -1328,44 +1634,28 @@ def update_display_title(deleivery_type, person, organization):
 # CREATE DELIVERY INFO
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def create_delivery_info():
     require_login()
     data = _req()
 
     # -----------------------------
-    # Validate dropdowns
-    # -----------------------------
-    deleivery_type = data.get("deleivery_type")
-    deleiver_to = data.get("deleiver_to")
-
-    if deleivery_type not in ("Own Purchase", "Donated From Organization"):
-        frappe.throw("Delivery type must be either 'Own Purchase' or 'Donated From Organization'.")
-    if deleiver_to and deleiver_to not in ("Person", "Animal Shelter"):
-        frappe.throw("Deliver To must be either 'Person' or 'Animal Shelter'.")
-
-    # -----------------------------
-    # Conditional required fields
+    # Validate dropdowns, conditional required fields and links
     # -----------------------------
-    if deleivery_type == "Own Purchase" and not data.get("person_details"):
-        frappe.throw("Person Details is required for 'Own Purchase'.")
-    if deleivery_type == "Donated From Organization" and not data.get("organization_detail"):
-        frappe.throw("Organization Detail is required for 'Donated From Organization'.")
-    if deleiver_to == "Person" and not data.get("person_details"):
-        frappe.throw("Person Details is required for Deliver To Person.")
-    if deleiver_to == "Animal Shelter" and not data.get("shleter_details"):
-        frappe.throw("Shelter Details is required for Deliver To Animal Shelter.")
+    values = validate_payload("Deleivery Informations", data, links=get_link_resolver())
+    deleivery_type = values["deleivery_type"]
+    deleiver_to = values.get("deleiver_to")
 
     # -----------------------------
     # Auto-fill linked fields
     # -----------------------------
-    person_details = data.get("person_details")
-    shleter_details = data.get("shleter_details")
-    organization_detail = data.get("organization_detail")
+    person_details = values.get("person_details")
+    shleter_details = values.get("shleter_details")
+    organization_detail = values.get("organization_detail")
 
     # Person info
     if person_details:
-        validate_person(person_details)
-        person_doc = frappe.get_doc("Person Details", person_details)
+        person_doc = get_link_resolver().get("Person Details", person_details)
         first_name = person_doc.first_name or ""
         last_name = person_doc.last_name or ""
     else:
@@ -1373,15 +1663,13 @@ def create_delivery_info():
 
     # Shelter info
     if shleter_details:
-        validate_shelter(shleter_details)
-        shleter_name = frappe.db.get_value("Animal Shelters", shleter_details, "shelter_name") or shleter_details
+        shleter_name = fetch_shelter_name(shleter_details)
     else:
         shleter_name = ""
 
     # Organization info
     if organization_detail:
-        validate_organization(organization_detail)
-        organization_name = frappe.db.get_value("Organization Details", organization_detail, "organization_name") or organization_detail
+        organization_name = fetch_organization_name(organization_detail)
     else:
         organization_name = ""
 
@@ -1399,9 +1687,9 @@ def create_delivery_info():
         "shleter_name": shleter_name,
         "organization_detail": organization_detail,
         "organization_name": organization_name,
-        "no_of_pallets": cint(data.get("no_of_pallets")) if data.get("no_of_pallets") else 0,
-        "no_of_kilogram": flt(data.get("no_of_kilogram")) if data.get("no_of_kilogram") else 0.0,
-        "deleivery_date": data.get("deleivery_date"),
+        "no_of_pallets": values.get("no_of_pallets", 0),
+        "no_of_kilogram": values.get("no_of_kilogram", 0.0),
+        "deleivery_date": values.get("deleivery_date"),
         "arrival_proof": data.get("arrival_proof"),
         "deleivery_note": data.get("deleivery_note"),
         "display_title": update_display_title(deleivery_type, person_details or shleter_details, organization_detail)
@@ -1421,39 +1709,52 @@ def create_delivery_info():
 # READ SINGLE RECORD
 # -----------------------------
 @frappe.whitelist()
-def get_delivery_info(name=None):
+@instrumented
+def get_delivery_info(name=None, fields=None, exclude=None, expand=None):
     require_login()
     if not name:
         frappe.throw("'name' (DEL-.######) is required.")
     if not frappe.db.exists("Deleivery Informations", name):
         frappe.throw("Delivery record not found.")
 
-    doc = frappe.get_doc("Deleivery Informations", name)
+    not_modified = record_not_modified("Deleivery Informations", name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
+
     return {
         "status": "success",
-        "message": f"📦 Delivery record '{doc.name}' fetched successfully.",
-        "record": doc.as_dict()
+        "message": f"📦 Delivery record '{name}' fetched successfully.",
+        "record": get_projection("Deleivery Informations", name, fields, exclude, expand)
     }
 
 # -----------------------------
 # READ ALL RECORDS
 # -----------------------------
 @frappe.whitelist()
-def get_all_delivery_info():
+@instrumented
+def get_all_delivery_info(limit=None, cursor=None, format=None):
     require_login()
-    records = frappe.get_all("Deleivery Informations", fields=["name"], order_by="modified desc")
-    result = [frappe.get_doc("Deleivery Informations", r.name).as_dict() for r in records]
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Deleivery Informations", limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    return {
+    result, next_cursor = paginate(
+        "Deleivery Informations", fields=get_record_fields("Deleivery Informations"), limit=limit, cursor=cursor
+    )
+
+    return encode_list({
         "status": "success",
         "message": f"📋 {len(result)} delivery records retrieved successfully.",
+        "next_cursor": next_cursor,
         "records": result
-    }
+    }, response_format, "records")
 
 # -----------------------------
 # UPDATE DELIVERY INFO
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def update_delivery_info():
     require_login()
     data = _req()
@@ -1466,39 +1767,21 @@ def update_delivery_info():
 
     doc = frappe.get_doc("Deleivery Informations", name)
 
-    deleivery_type = data.get("deleivery_type") or doc.deleivery_type
-    deleiver_to = data.get("deleiver_to") or doc.deleiver_to
-
     # -----------------------------
-    # Validate dropdowns
+    # Validate dropdowns, conditional required fields and links
     # -----------------------------
-    if deleivery_type not in ("Own Purchase", "Donated From Organization"):
-        frappe.throw("Delivery type must be either 'Own Purchase' or 'Donated From Organization'.")
-    if deleiver_to and deleiver_to not in ("Person", "Animal Shelter"):
-        frappe.throw("Deliver To must be either 'Person' or 'Animal Shelter'.")
-
-    # -----------------------------
-    # Conditional required fields
-    # -----------------------------
-    if deleivery_type == "Own Purchase" and not (data.get("person_details") or doc.person_details):
-        frappe.throw("Person Details is required for 'Own Purchase'.")
-    if deleivery_type == "Donated From Organization" and not (data.get("organization_detail") or doc.organization_detail):
-        frappe.throw("Organization Detail is required for 'Donated From Organization'.")
-    if deleiver_to == "Person" and not (data.get("person_details") or doc.person_details):
-        frappe.throw("Person Details is required for Deliver To Person.")
-    if deleiver_to == "Animal Shelter" and not (data.get("shleter_details") or doc.shleter_details):
-        frappe.throw("Shelter Details is required for Deliver To Animal Shelter.")
+    values = validate_payload("Deleivery Informations", data, doc=doc, links=get_link_resolver())
 
     # -----------------------------
     # Validate links and auto-fill
     # -----------------------------
-    person_details = data.get("person_details") or doc.person_details
-    shleter_details = data.get("shleter_details") or doc.shleter_details
-    organization_detail = data.get("organization_detail") or doc.organization_detail
+    person_details = values.get("person_details") or doc.person_details
+    shleter_details = values.get("shleter_details") or doc.shleter_details
+    organization_detail = values.get("organization_detail") or doc.organization_detail
 
     if person_details:
         validate_person(person_details)
-        person_doc = frappe.get_doc("Person Details", person_details)
+        person_doc = get_link_resolver().get("Person Details", person_details)
         doc.first_name = person_doc.first_name or ""
         doc.last_name = person_doc.last_name or ""
     else:
@@ -1507,13 +1790,13 @@ def update_delivery_info():
 
     if shleter_details:
         validate_shelter(shleter_details)
-        doc.shleter_name = frappe.db.get_value("Animal Shelters", shleter_details, "shelter_name") or shleter_details
+        doc.shleter_name = fetch_shelter_name(shleter_details)
     else:
         doc.shleter_name = ""
 
     if organization_detail:
         validate_organization(organization_detail)
-        doc.organization_name = frappe.db.get_value("Organization Details", organization_detail, "organization_name") or organization_detail
+        doc.organization_name = fetch_organization_name(organization_detail)
     else:
         doc.organization_name = ""
 
@@ -1527,11 +1810,14 @@ def update_delivery_info():
     ]
     for f in fields_to_update:
         if f in data:
-            value = cint(data[f]) if f == "no_of_pallets" else flt(data[f]) if f == "no_of_kilogram" else data[f]
-            doc.db_set(f, value, update_modified=True)
+            doc.set(f, values[f])
 
     # Update display title
-    doc.db_set("display_title", update_display_title(doc.deleivery_type, doc.person_details or doc.shleter_details, doc.organization_detail), update_modified=True)
+    doc.display_title = update_display_title(doc.deleivery_type, doc.person_details or doc.shleter_details, doc.organization_detail)
+
+    # save (not db_set) so the fulfillment ledger follows the delivered quantity
+    doc.save(ignore_permissions=True)
+    frappe.db.commit()
 
     return {
         "status": "success",
@@ -1543,6 +1829,7 @@ def update_delivery_info():
 # DELETE DELIVERY INFO
 # -----------------------------
 @frappe.whitelist()
+@instrumented
 def delete_delivery_info(name=None):
     require_login()
     if not name:
@@ -1560,6 +1847,84 @@ def delete_delivery_info(name=None):
     }
 
 
+# -----------------------------
+# EXPORT DELIVERIES (background job)
+# -----------------------------
+@frappe.whitelist()
+@instrumented
+def start_delivery_export(organization=None, from_date=None, to_date=None):
+    """Queue a CSV + arrival proof ZIP export of an organization's deliveries"""
+    require_login()
+    frappe.has_permission("Delivery Export Job", "create", throw=True)
+    from homie_app.homie_app.doctype.delivery_export_job.delivery_export_job import start_export
+
+    if not organization:
+        frappe.throw("'organization' is required.")
+    validate_organization(organization)
+
+    job = start_export(organization, from_date, to_date)
+    frappe.db.commit()
+
+    return {
+        "status": "success",
+        "message": f"📦 Delivery export '{job.name}' queued.",
+        "job": job.name
+    }
+
+
+@frappe.whitelist()
+@instrumented
+def get_delivery_export(name=None):
+    """Progress of an export job and, once completed, its download link"""
+    require_login()
+    check_delivery_export_permission(name)
+
+    job = frappe.db.get_value(
+        "Delivery Export Job",
+        name,
+        ["name", "status", "progress", "total_rows", "exported_rows", "files_added", "missing_files"],
+        as_dict=True
+    )
+    job["download_url"] = None
+    if job.status == "Completed":
+        job["download_url"] = frappe.utils.get_url(
+            f"/api/method/homie_app.api.download_delivery_export?name={job.name}"
+        )
+
+    return {"status": "success", "data": job}
+
+
+@frappe.whitelist()
+@instrumented
+def download_delivery_export(name=None):
+    """
+    Stream a completed export's ZIP. The archive is not a File, so Frappe
+    never reads it into memory and max_file_size does not apply.
+    """
+    require_login()
+    check_delivery_export_permission(name)
+
+    job = frappe.get_doc("Delivery Export Job", name)
+    path = job.get_zip_path()
+    if job.status != "Completed" or not os.path.isfile(path):
+        frappe.throw("Delivery export is not ready.")
+
+    response = Response(
+        wrap_file(frappe.local.request.environ, open(path, "rb")),
+        mimetype="application/zip",
+        direct_passthrough=True,
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="{job.get_zip_filename()}"'
+    response.headers["Content-Length"] = str(os.path.getsize(path))
+    return response
+
+
+def check_delivery_export_permission(name):
+    if not name or not frappe.db.exists("Delivery Export Job", name):
+        frappe.throw("Delivery export job not found.")
+    frappe.has_permission("Delivery Export Job", "read", doc=name, throw=True)
+
+
 
 # -----------------------------Product API's  -----------------------------
 # -----------------------------
@@ -1570,14 +1935,6 @@ def delete_delivery_info(name=None):
 def _req():
     return frappe.request.get_json() or {}
 
-def parse_price(value):
-    if value in (None, ""):
-        frappe.throw("'product_price' is required.")
-    try:
-        return float(value)
-    except:
-        frappe.throw("Invalid price value.")
-
 
 # -----------------------------
 # CREATE PRODUCT
@@ -1585,23 +1942,12 @@ def parse_price(value):
 
 
 @frappe.whitelist()
+@instrumented
 def create_product():
     require_login()
     data = _req()
 
-    required_fields = ["product_name", "product_status", "product_price"]
-    for f in required_fields:
-        if not data.get(f):
-            frappe.throw(f"'{f}' is required.")
-
-    if data.get("product_status") not in ("Instock", "Out of stock"):
-        frappe.throw("Product status must be 'Instock' or 'Out of stock'.")
-
-    if data.get("product_category") and data.get("product_category") not in ("Cat", "Dog"):
-        frappe.throw("Product category must be 'Cat' or 'Dog'.")
-
-    if data.get("type") and data.get("type") not in ("Food", "Money"):
-        frappe.throw("Type must be 'Food' or 'Money'.")
+    values = validate_payload("Product Details", data)
 
     doc = frappe.get_doc({
         "doctype": "Product Details",
@@ -1611,7 +1957,7 @@ def create_product():
         "product_status": data.get("product_status"),
         "product_image_mobile": data.get("product_image_mobile"),
         "product_image_desktop": data.get("product_image_desktop"),
-        "product_price": parse_price(data.get("product_price")),
+        "product_price": values["product_price"],
         "product_category": data.get("product_category"),
         "type": data.get("type"),
     })
@@ -1633,7 +1979,8 @@ def create_product():
 
 
 @frappe.whitelist()
-def get_product(name=None, product_name=None):
+@instrumented
+def get_product(name=None, product_name=None, fields=None, exclude=None, expand=None):
     require_login()
 
     if not name and not product_name:
@@ -1649,12 +1996,14 @@ def get_product(name=None, product_name=None):
     if not products:
         frappe.throw("Product not found.")
 
-    doc = frappe.get_doc("Product Details", products[0].name)
+    not_modified = record_not_modified("Product Details", products[0].name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
 
     return {
         "status": "success",
         "message": "📦 Product fetched successfully.",
-        "product": doc.as_dict()
+        "product": get_projection("Product Details", products[0].name, fields, exclude, expand)
     }
 
 
@@ -1665,22 +2014,27 @@ def get_product(name=None, product_name=None):
 # -----------------------------
 
 @frappe.whitelist()
-def get_all_products():
+@instrumented
+def get_all_products(limit=None, cursor=None, format=None):
     require_login()
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Product Details", limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    records = frappe.get_all(
+    result, next_cursor = paginate(
         "Product Details",
-        fields=["name"],
-        order_by="modified desc"
+        fields=get_record_fields("Product Details"),
+        limit=limit,
+        cursor=cursor
     )
 
-    result = [frappe.get_doc("Product Details", r.name).as_dict() for r in records]
-
-    return {
+    return encode_list({
         "status": "success",
         "message": f"📋 {len(result)} products retrieved successfully.",
+        "next_cursor": next_cursor,
         "products": result
-    }
+    }, response_format, "products")
 
 
 
@@ -1691,6 +2045,7 @@ def get_all_products():
 
 
 @frappe.whitelist()
+@instrumented
 def update_product():
     require_login()
     data = _req()
@@ -1709,15 +2064,7 @@ def update_product():
         frappe.throw("Product not found.")
 
     doc = frappe.get_doc("Product Details", products[0].name)
-
-    if data.get("product_status") and data.get("product_status") not in ("Instock", "Out of stock"):
-        frappe.throw("Product status must be 'Instock' or 'Out of stock'.")
-
-    if data.get("product_category") and data.get("product_category") not in ("Cat", "Dog"):
-        frappe.throw("Product category must be 'Cat' or 'Dog'.")
-
-    if data.get("type") and data.get("type") not in ("Food", "Money"):
-        frappe.throw("Type must be 'Food' or 'Money'.")
+    values = validate_payload("Product Details", data, doc=doc)
 
     update_fields = [
         "product_name",
@@ -1733,8 +2080,10 @@ def update_product():
 
     for f in update_fields:
         if data.get(f) is not None:
-            value = parse_price(data.get(f)) if f == "product_price" else data.get(f)
-            doc.db_set(f, value, update_modified=True)
+            doc.set(f, values[f])
+
+    # save (not db_set) so on_update hooks see the change
+    doc.save(ignore_permissions=True)
 
     return {
         "status": "success",
@@ -1752,6 +2101,7 @@ def update_product():
 
 
 @frappe.whitelist()
+@instrumented
 def delete_product(name=None, product_name=None):
     require_login()
 
@@ -1784,7 +2134,7 @@ def delete_product(name=None, product_name=None):
 
 import frappe
 from frappe import _
-from frappe.utils import now_datetime, flt
+from frappe.utils import add_days, getdate, now_datetime, flt
 
 # ---------------------------------------------------
 # HELPERS
@@ -1797,90 +2147,48 @@ def require_login():
 def _req():
     return frappe.request.get_json() or {}
 
-def validate_person(person):
-    if person and not frappe.db.exists("Person Details", person):
-        frappe.throw(_("Person '{}' does not exist").format(person))
-
-def validate_shelter(shelter):
-    if shelter and not frappe.db.exists("Animal Shelters", shelter):
-        frappe.throw(_("Shelter '{}' does not exist").format(shelter))
-
-def validate_organization(org):
-    if org and not frappe.db.exists("Organization Details", org):
-        frappe.throw(_("Organization '{}' does not exist").format(org))
-
-def fetch_person_fields(person):
-    doc = frappe.get_doc("Person Details", person)
-    return {
-        "person_first_name": doc.first_name or "",
-        "person_last_name": doc.last_name or "",
-        "person_email": doc.email or ""
-    }
-
-def fetch_shelter_name(shelter):
-    return frappe.db.get_value("Animal Shelters", shelter, "shelter_name") or shelter
-
-def fetch_organization_name(org):
-    return frappe.db.get_value("Organization Details", org, "organization_name") or org
-
 
 # ---------------------------------------------------
 # CREATE DONATION
 # ---------------------------------------------------
 @frappe.whitelist()
+@instrumented
 def create_donation():
     require_login()
     data = _req()
 
     # -----------------------------
-    # Required & dropdown validation
+    # Required, dropdown and link validation (one query per doctype)
     # -----------------------------
-    donated_to = data.get("donated_to")
-    if donated_to not in ("Person", "Animal Shelter"):
-        frappe.throw(_("donated_to must be 'Person' or 'Animal Shelter'"))
-
-    items = data.get("items")
-    if not items:
-        frappe.throw(_("Donation items are required"))
-
-    contact_person = data.get("contact_person")
-    shelter_details = data.get("shelter_details")
+    links = get_link_resolver()
+    values = validate_payload("Donation", data, links=links)
 
-    if donated_to == "Person" and not contact_person:
-        frappe.throw(_("contact_person is required when donated_to is Person"))
-
-    if donated_to == "Animal Shelter" and not shelter_details:
-        frappe.throw(_("shelter_details is required when donated_to is Animal Shelter"))
-
-    # -----------------------------
-    # Validate links
-    # -----------------------------
-    validate_person(contact_person)
-    validate_shelter(shelter_details)
-    validate_organization(data.get("organization"))
+    donated_to = values["donated_to"]
+    contact_person = values.get("contact_person")
+    shelter_details = values.get("shelter_details")
 
     # -----------------------------
     # Create parent document
     # -----------------------------
     doc = frappe.new_doc("Donation")
-    doc.donation_number = data.get("donation_number")
-    doc.local_number = data.get("local_number")
-    doc.is_anonymous = int(data.get("is_anonymous", 0))
-    doc.is_subscription = int(data.get("is_subscription", 0))
-    doc.donated_at = data.get("donated_at") or now_datetime()
-    doc.currency = data.get("currency")
-    doc.source = data.get("source")
-    doc.ip_address = data.get("ip_address")
-    doc.user_agent = data.get("user_agent")
-    doc.tracking_facebook_fbc = data.get("tracking_facebook_fbc")
-    doc.tracking_facebook_fbp = data.get("tracking_facebook_fbp")
-    doc.wishlist = data.get("wishlist")
-    doc.local_wishlist = data.get("local_wishlist")
-    doc.local_wishlist_title = data.get("local_wishlist_title")
-    doc.bacs_paid = flt(data.get("bacs_paid", 0))
-    doc.should_reprocessing = int(data.get("should_reprocessing", 0))
-    doc.reprocessing_number = data.get("reprocessing_number")
-    doc.organization = data.get("organization")
+    doc.donation_number = values.get("donation_number")
+    doc.local_number = values.get("local_number")
+    doc.is_anonymous = values.get("is_anonymous", 0)
+    doc.is_subscription = values.get("is_subscription", 0)
+    doc.donated_at = values.get("donated_at") or now_datetime()
+    doc.currency = values.get("currency")
+    doc.source = values.get("source")
+    doc.ip_address = values.get("ip_address")
+    doc.user_agent = values.get("user_agent")
+    doc.tracking_facebook_fbc = values.get("tracking_facebook_fbc")
+    doc.tracking_facebook_fbp = values.get("tracking_facebook_fbp")
+    doc.wishlist = values.get("wishlist")
+    doc.local_wishlist = values.get("local_wishlist")
+    doc.local_wishlist_title = values.get("local_wishlist_title")
+    doc.bacs_paid = values.get("bacs_paid", 0)
+    doc.should_reprocessing = values.get("should_reprocessing", 0)
+    doc.reprocessing_number = values.get("reprocessing_number")
+    doc.organization = values.get("organization")
     doc.donated_to = donated_to
 
     # -----------------------------
@@ -1909,24 +2217,18 @@ def create_donation():
     # Child items + price calculation
     # -----------------------------
     total = 0
-    for row in items:
-        product = row.get("product")
-        qty = int(row.get("quantity", 0))
-
-        if not product or not frappe.db.exists("Product Details", product):
-            frappe.throw(_("Invalid product in items"))
+    for row in values["items"]:
+        product = row["product"]
+        qty = row["quantity"]
 
-        if qty <= 0:
-            frappe.throw(_("Quantity must be greater than 0"))
-
-        product_doc = frappe.get_doc("Product Details", product)
-        amount = flt(product_doc.product_price)
+        product_row = links.get("Product Details", product)
+        amount = product_row.product_price
         line_total = qty * amount
 
         doc.append("items", {
             "product": product,
             "product_id": product,
-            "product_name": product_doc.product_name,
+            "product_name": product_row.product_name,
             "quantity": qty,
             "amount": amount,
             "total": line_total,
@@ -1945,21 +2247,221 @@ def create_donation():
     }
 
 
+# ---------------------------------------------------
+# BULK CREATE DONATIONS
+# ---------------------------------------------------
+BULK_DONATION_CHUNK_SIZE = 500
+MAX_BULK_DONATIONS = 10000
+
+DONATION_BULK_FIELDS = [
+    "donation_number", "hash", "local_number", "is_anonymous", "is_subscription",
+    "donated_at", "currency", "source", "ip_address", "user_agent",
+    "tracking_facebook_fbc", "tracking_facebook_fbp", "wishlist", "local_wishlist",
+    "local_wishlist_title", "bacs_paid", "should_reprocessing", "reprocessing_number",
+    "organization", "organization_name", "donated_to", "contact_person",
+    "person_first_name", "person_last_name", "person_email",
+    "shelter_details", "shelter_name", "total"
+]
+
+DONATION_ITEM_BULK_FIELDS = ["product", "product_id", "product_name", "quantity", "amount", "total", "wishlist_item"]
+
+STANDARD_BULK_FIELDS = ["name", "creation", "modified", "owner", "modified_by", "docstatus", "idx"]
+CHILD_BULK_FIELDS = STANDARD_BULK_FIELDS + ["parent", "parenttype", "parentfield"]
+
+
+def reserve_series_names(prefix, digits, count):
+    """Reserve `count` consecutive names of a naming series with one update"""
+    current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s FOR UPDATE", (prefix,))
+    if current and current[0][0] is not None:
+        start = cint(current[0][0])
+        frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (count, prefix))
+    else:
+        start = 0
+        frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (prefix, count))
+    return [f"{prefix}{str(start + i).zfill(digits)}" for i in range(1, count + 1)]
+
+
+def prepare_bulk_donation(values, links):
+    """
+    Build the column values and item rows of one validated payload from
+    already resolved links. Returns (values, items).
+    """
+    items = []
+    total = 0
+    for row in values["items"]:
+        product_row = links.get("Product Details", row["product"])
+        amount = product_row.product_price
+        items.append({
+            "product": row["product"],
+            "product_id": row["product"],
+            "product_name": product_row.product_name,
+            "quantity": row["quantity"],
+            "amount": amount,
+            "total": row["quantity"] * amount,
+            "wishlist_item": row.get("wishlist_item")
+        })
+        total += row["quantity"] * amount
+
+    organization = values.get("organization")
+    donation = {
+        "donation_number": values.get("donation_number"),
+        "hash": values.get("hash") or None,
+        "local_number": values.get("local_number", 0),
+        "is_anonymous": values.get("is_anonymous", 0),
+        "is_subscription": values.get("is_subscription", 0),
+        "donated_at": values.get("donated_at") or now_datetime(),
+        "currency": values.get("currency"),
+        "source": values.get("source"),
+        "ip_address": values.get("ip_address"),
+        "user_agent": values.get("user_agent"),
+        "tracking_facebook_fbc": values.get("tracking_facebook_fbc"),
+        "tracking_facebook_fbp": values.get("tracking_facebook_fbp"),
+        "wishlist": values.get("wishlist"),
+        "local_wishlist": values.get("local_wishlist", 0),
+        "local_wishlist_title": values.get("local_wishlist_title"),
+        "bacs_paid": values.get("bacs_paid", 0),
+        "should_reprocessing": values.get("should_reprocessing", 0),
+        "reprocessing_number": values.get("reprocessing_number"),
+        "organization": organization,
+        "organization_name": fetch_organization_name(organization) if organization else None,
+        "donated_to": values["donated_to"],
+        "contact_person": None,
+        "person_first_name": "",
+        "person_last_name": "",
+        "person_email": "",
+        "shelter_details": None,
+        "shelter_name": "",
+        "total": total
+    }
+
+    if values["donated_to"] == "Person":
+        donation.update({"contact_person": values["contact_person"], **fetch_person_fields(values["contact_person"])})
+    else:
+        donation.update({
+            "shelter_details": values["shelter_details"],
+            "shelter_name": fetch_shelter_name(values["shelter_details"])
+        })
+
+    return donation, items
+
+
+def insert_donation_chunk(chunk):
+    """Insert a list of (values, items) as Donation + Donation Item rows; returns names"""
+    names = reserve_series_names("DON-", 6, len(chunk))
+    now = now_datetime()
+    user = frappe.session.user
+
+    parents = []
+    children = []
+    for name, (values, items) in zip(names, chunk):
+        parents.append([name, now, now, user, user, 0, 0] + [values[f] for f in DONATION_BULK_FIELDS])
+        for idx, item in enumerate(items, start=1):
+            children.append(
+                [frappe.generate_hash(length=10), now, now, user, user, 0, idx, name, "Donation", "items"]
+                + [item[f] for f in DONATION_ITEM_BULK_FIELDS]
+            )
+
+    frappe.db.bulk_insert("Donation", STANDARD_BULK_FIELDS + DONATION_BULK_FIELDS, parents)
+    frappe.db.bulk_insert("Donation Item", CHILD_BULK_FIELDS + DONATION_ITEM_BULK_FIELDS, children)
+    return names
+
+
+@frappe.whitelist()
+@instrumented
+def create_donations_bulk():
+    """
+    Create many donations in one call.
+
+    The whole array is validated against the compiled Donation rules, all
+    person, shelter, organization and product references are checked with
+    one query per doctype, and valid rows are written with multi-row
+    inserts, one transaction per chunk. Document controllers are not run;
+    the same defaults and totals as create_donation are applied here.
+    Returns a per-row report in payload order.
+    """
+    require_login()
+    data = _req()
+
+    donations = data.get("donations") if isinstance(data, dict) else data
+    if not donations or not isinstance(donations, list):
+        frappe.throw(_("'donations' must be a non-empty list"))
+    if len(donations) > MAX_BULK_DONATIONS:
+        frappe.throw(_("At most {0} donations can be created per call").format(MAX_BULK_DONATIONS))
+
+    links = get_link_resolver()
+    checked = validate_payloads("Donation", donations, links=links)
+
+    hashes = [values.get("hash") for values, errors in checked if not errors and values.get("hash")]
+    taken_hashes = set(frappe.get_all("Donation", filters={"hash": ["in", hashes]}, pluck="hash")) if hashes else set()
+
+    results = [None] * len(donations)
+    valid = []
+    for index, (values, errors) in enumerate(checked):
+        if not errors and values.get("hash"):
+            if values["hash"] in taken_hashes:
+                errors = {"hash": f"Donation with hash '{values['hash']}' already exists"}
+            else:
+                taken_hashes.add(values["hash"])
+
+        if errors:
+            results[index] = {"index": index, "status": "error", "errors": errors}
+        else:
+            valid.append((index, *prepare_bulk_donation(values, links)))
+
+    for start in range(0, len(valid), BULK_DONATION_CHUNK_SIZE):
+        chunk = valid[start:start + BULK_DONATION_CHUNK_SIZE]
+        try:
+            names = insert_donation_chunk([(values, items) for _index, values, items in chunk])
+            # controllers and doc_events are skipped for bulk rows
+            apply_kpi_delta(
+                total_donations=len(chunk),
+                total_amount=sum(flt(values["total"]) for _index, values, _items in chunk)
+            )
+            rollup_deltas = {}
+            for _index, values, items in chunk:
+                add_to_deltas(rollup_deltas, values, items)
+            apply_rollup_deltas(rollup_deltas)
+            frappe.db.commit()
+        except Exception as e:
+            frappe.db.rollback()
+            frappe.log_error(title="Bulk donation chunk failed")
+            for index, _values, _items in chunk:
+                results[index] = {"index": index, "status": "error", "errors": {"payload": str(e)}}
+            continue
+
+        for (index, _values, _items), name in zip(chunk, names):
+            results[index] = {"index": index, "status": "success", "name": name}
+
+    created = sum(1 for r in results if r["status"] == "success")
+
+    return {
+        "status": "success",
+        "message": f"📥 {created} of {len(donations)} donations created.",
+        "created": created,
+        "failed": len(donations) - created,
+        "results": results
+    }
+
+
 # ---------------------------------------------------
 # GET SINGLE DONATION
 # ---------------------------------------------------
 @frappe.whitelist()
-def get_donation(name):
+@instrumented
+def get_donation(name, fields=None, exclude=None, expand=None):
     require_login()
 
     if not frappe.db.exists("Donation", name):
         frappe.throw(_("Donation '{}' not found").format(name))
 
-    doc = frappe.get_doc("Donation", name)
+    not_modified = record_not_modified("Donation", name, fields, exclude, expand)
+    if not_modified:
+        return not_modified
+
     return {
         "status": "success",
         "message": f"📦 Donation '{name}' fetched successfully.",
-        "donation": doc.as_dict()
+        "donation": get_projection("Donation", name, fields, exclude, expand)
     }
 
 
@@ -1967,27 +2469,163 @@ def get_donation(name):
 # LIST DONATIONS
 # ---------------------------------------------------
 @frappe.whitelist()
-def list_donations():
+@instrumented
+def list_donations(limit=None, cursor=None, format=None):
     require_login()
+    response_format = negotiate_format(format)
+    not_modified = list_not_modified("Donation", limit, cursor, response_format)
+    if not_modified:
+        return not_modified
 
-    data = frappe.get_all(
+    data, next_cursor = paginate(
         "Donation",
         fields=["name", "donated_to", "organization_name", "total", "donated_at"],
-        order_by="creation desc"
+        limit=limit,
+        cursor=cursor,
+        sort_field="creation"
     )
 
-    return {
+    return encode_list({
         "status": "success",
         "count": len(data),
+        "next_cursor": next_cursor,
         "message": "📋 Donations list retrieved successfully.",
         "data": data
+    }, response_format, "data")
+
+
+# ---------------------------------------------------
+# DONATION TIMESERIES
+# ---------------------------------------------------
+@frappe.whitelist()
+@instrumented
+def get_donation_timeseries(organization=None, from_date=None, to_date=None, granularity="day", donated_to=None):
+    """Donation totals per day, week or month and currency, served from the daily rollup"""
+    require_login()
+    from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import get_timeseries
+
+    validate_organization(organization)
+    data = get_timeseries(organization, from_date, to_date, granularity, donated_to)
+
+    return {
+        "status": "success",
+        "granularity": granularity,
+        "count": len(data),
+        "data": data
     }
 
 
+# ---------------------------------------------------
+# EXPORT DONATIONS (streamed NDJSON / CSV)
+# ---------------------------------------------------
+DONATION_EXPORT_FIELDS = [
+    "name", "donation_number", "hash", "donated_at", "donated_to",
+    "organization", "organization_name", "contact_person", "person_first_name",
+    "person_last_name", "person_email", "shelter_details", "shelter_name",
+    "currency", "total", "is_anonymous", "is_subscription", "source"
+]
+
+DONATION_ITEM_EXPORT_FIELDS = ["product", "product_name", "quantity", "amount", "total", "wishlist_item"]
+
+
+def build_donation_export_query(organization=None, from_date=None, to_date=None, donated_to=None):
+    conditions = []
+    values = {}
+
+    if organization:
+        conditions.append("d.organization = %(organization)s")
+        values["organization"] = organization
+    if donated_to:
+        if donated_to not in ("Person", "Animal Shelter"):
+            frappe.throw(_("donated_to must be 'Person' or 'Animal Shelter'"))
+        conditions.append("d.donated_to = %(donated_to)s")
+        values["donated_to"] = donated_to
+    if from_date:
+        conditions.append("d.donated_at >= %(from_date)s")
+        values["from_date"] = getdate(from_date)
+    if to_date:
+        # to_date is inclusive
+        conditions.append("d.donated_at < %(to_date)s")
+        values["to_date"] = add_days(getdate(to_date), 1)
+
+    columns = [f"d.`{f}` AS `{f}`" for f in DONATION_EXPORT_FIELDS]
+    columns += [f"i.`{f}` AS `item_{f}`" for f in DONATION_ITEM_EXPORT_FIELDS]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    query = f"""
+        SELECT {", ".join(columns)}
+        FROM `tabDonation` d
+        LEFT JOIN `tabDonation Item` i
+            ON i.parent = d.name AND i.parenttype = 'Donation' AND i.parentfield = 'items'
+        {where}
+        ORDER BY d.name, i.idx
+    """
+    return query, values
+
+
+def iter_donation_ndjson(rows):
+    """One JSON line per donation with its items, grouped from the ordered join"""
+    current = None
+    for row in rows:
+        if current is None or current["name"] != row["name"]:
+            if current is not None:
+                yield frappe.as_json(current, indent=None, separators=(",", ":")) + "\n"
+            current = {f: row[f] for f in DONATION_EXPORT_FIELDS}
+            current["items"] = []
+        if row["item_product"] is not None:
+            current["items"].append({f: row[f"item_{f}"] for f in DONATION_ITEM_EXPORT_FIELDS})
+
+    if current is not None:
+        yield frappe.as_json(current, indent=None, separators=(",", ":")) + "\n"
+
+
+def iter_donation_csv(rows):
+    """One CSV line per donation item, donation columns repeated"""
+    header = DONATION_EXPORT_FIELDS + [f"item_{f}" for f in DONATION_ITEM_EXPORT_FIELDS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([row[f] for f in header])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@frappe.whitelist()
+@instrumented
+def export_donations(format="ndjson", organization=None, from_date=None, to_date=None, donated_to=None):
+    """
+    Stream donations joined with their items as NDJSON or CSV.
+    Rows are read through a server-side cursor, so memory stays flat.
+    """
+    require_login()
+
+    if format not in ("ndjson", "csv"):
+        frappe.throw(_("format must be 'ndjson' or 'csv'"))
+
+    query, values = build_donation_export_query(organization, from_date, to_date, donated_to)
+    rows = stream_sql(query, values)
+
+    if format == "csv":
+        body, mimetype = iter_donation_csv(rows), "text/csv"
+    else:
+        body, mimetype = iter_donation_ndjson(rows), "application/x-ndjson"
+
+    response = Response(body, mimetype=mimetype, direct_passthrough=True)
+    response.headers["Content-Disposition"] = f'attachment; filename="donations.{format}"'
+    return response
+
+
 # ---------------------------------------------------
 # UPDATE DONATION
 # ---------------------------------------------------
 @frappe.whitelist()
+@instrumented
 def update_donation():
     require_login()
     data = _req()
@@ -1997,18 +2635,15 @@ def update_donation():
         frappe.throw(_("Donation not found"))
 
     doc = frappe.get_doc("Donation", name)
+    links = get_link_resolver()
+    values = validate_payload("Donation", data, doc=doc, links=links)
 
-    donated_to = data.get("donated_to", doc.donated_to)
-    if donated_to not in ("Person", "Animal Shelter"):
-        frappe.throw(_("donated_to must be 'Person' or 'Animal Shelter'"))
-
+    donated_to = values.get("donated_to", doc.donated_to)
     doc.donated_to = donated_to
 
     # Auto-fill logic
     if donated_to == "Person":
-        contact_person = data.get("contact_person")
-        if not contact_person:
-            frappe.throw(_("contact_person is required"))
+        contact_person = values.get("contact_person", doc.contact_person)
         validate_person(contact_person)
         person = fetch_person_fields(contact_person)
         doc.contact_person = contact_person
@@ -2018,9 +2653,7 @@ def update_donation():
         doc.shelter_details = None
         doc.shelter_name = ""
     else:
-        shelter_details = data.get("shelter_details")
-        if not shelter_details:
-            frappe.throw(_("shelter_details is required"))
+        shelter_details = values.get("shelter_details", doc.shelter_details)
         validate_shelter(shelter_details)
         doc.shelter_details = shelter_details
         doc.shelter_name = fetch_shelter_name(shelter_details)
@@ -2030,21 +2663,21 @@ def update_donation():
         doc.person_email = ""
 
     # Update items if provided
-    if data.get("items"):
+    if values.get("items"):
         doc.items = []
         total = 0
-        for row in data["items"]:
-            product = row.get("product")
-            qty = int(row.get("quantity", 0))
+        for row in values["items"]:
+            product = row["product"]
+            qty = row["quantity"]
 
-            product_doc = frappe.get_doc("Product Details", product)
-            amount = flt(product_doc.product_price)
+            product_row = links.get("Product Details", product)
+            amount = product_row.product_price
             line_total = qty * amount
 
             doc.append("items", {
                 "product": product,
                 "product_id": product,
-                "product_name": product_doc.product_name,
+                "product_name": product_row.product_name,
                 "quantity": qty,
                 "amount": amount,
                 "total": line_total,
@@ -2067,6 +2700,7 @@ def update_donation():
 # DELETE DONATION
 # ---------------------------------------------------
 @frappe.whitelist()
+@instrumented
 def delete_donation(name):
     require_login()
 
@@ -2081,6 +2715,173 @@ def delete_donation(name):
     }
 
 
+# ----------------------------- DONATION PAYMENT API'S -----------------------------
+
+
+# ---------------------------------------------------
+# PAYMENT RECONCILIATION (background job)
+# ---------------------------------------------------
+@frappe.whitelist()
+@instrumented
+def start_payment_reconciliation(time_window_minutes=None):
+    """Queue a run linking unlinked Donation Payments to their Donations"""
+    require_login()
+    from homie_app.homie_app.doctype.payment_reconciliation_run.payment_reconciliation_run import (
+        ACTIVE_STATUSES,
+        start_reconciliation,
+    )
+
+    if frappe.db.exists("Payment Reconciliation Run", {"status": ["in", ACTIVE_STATUSES]}):
+        frappe.throw(_("A payment reconciliation is already running"))
+
+    run = start_reconciliation(time_window_minutes)
+    frappe.db.commit()
+
+    return {
+        "status": "success",
+        "message": f"🔗 Payment reconciliation '{run.name}' queued.",
+        "run": run.name
+    }
+
+
+@frappe.whitelist()
+@instrumented
+def get_payment_reconciliation(name=None):
+    """Progress and match counts of a reconciliation run"""
+    require_login()
+    if not name or not frappe.db.exists("Payment Reconciliation Run", name):
+        frappe.throw(_("Payment reconciliation run not found"))
+
+    run = frappe.db.get_value(
+        "Payment Reconciliation Run",
+        name,
+        ["name", "status", "started_on", "finished_on", "scanned", "matched_by_hash",
+         "matched_by_amount", "ambiguous", "unmatched", "error"],
+        as_dict=True
+    )
+
+    return {"status": "success", "data": run}
+
+
+# ---------------------------------------------------
+# INGEST PAYMENT WEBHOOKS (bulk, idempotent)
+# ---------------------------------------------------
+MAX_PAYMENT_BATCH = 5000
+PAYMENT_LOOKUP_CHUNK_SIZE = 1000
+DONATION_PAYMENT_BULK_FIELDS = [
+    "hash", "type", "amount", "info_1", "info_2", "info_3",
+    "number", "provider", "payment_at", "donation", "created_from_payload"
+]
+
+
+def find_existing_payments(keys):
+    """{(provider, hash, type): name} for keys already stored, looked up through the hash index"""
+    from homie_app.homie_app.doctype.donation_payment.donation_payment import get_dedupe_key
+
+    hashes = list({key[1] for key in keys})
+    existing = {}
+    for start in range(0, len(hashes), PAYMENT_LOOKUP_CHUNK_SIZE):
+        for row in frappe.get_all(
+            "Donation Payment",
+            filters={"hash": ["in", hashes[start:start + PAYMENT_LOOKUP_CHUNK_SIZE]]},
+            fields=["name", "provider", "hash", "type"]
+        ):
+            existing[get_dedupe_key(row)] = row.name
+    return existing
+
+
+@frappe.whitelist()
+@instrumented
+def ingest_donation_payments():
+    """
+    Idempotent bulk intake of payment provider webhooks.
+
+    The batch is validated in one pass against the compiled Donation Payment
+    rules (donations checked with one query), events that are already stored are
+    found with indexed lookups on (provider, hash, type), and new rows are
+    written with one multi-row INSERT IGNORE in a single transaction, so a
+    replayed or concurrently retried webhook never creates a second row. Rows
+    the IGNORE skipped because a concurrent request stored them first are
+    re-read by key and reported as duplicates of the stored row.
+    """
+    require_login()
+    from homie_app.homie_app.doctype.donation_payment.donation_payment import get_dedupe_key, to_system_datetime
+
+    data = _req()
+    payments = data.get("payments") if isinstance(data, dict) else data
+    if not payments or not isinstance(payments, list):
+        frappe.throw(_("'payments' must be a non-empty list"))
+    if len(payments) > MAX_PAYMENT_BATCH:
+        frappe.throw(_("At most {0} payments can be ingested per call").format(MAX_PAYMENT_BATCH))
+
+    results = [None] * len(payments)
+    new = {}
+    for index, (values, errors) in enumerate(validate_payloads("Donation Payment", payments)):
+        if errors:
+            results[index] = {"index": index, "status": "error", "errors": errors}
+            continue
+
+        key = get_dedupe_key(values)
+        if key in new:
+            results[index] = {"index": index, "status": "duplicate", "duplicate_of_index": new[key][0]}
+        else:
+            new[key] = (index, values)
+
+    existing = find_existing_payments(list(new)) if new else {}
+
+    now = now_datetime()
+    user = frappe.session.user
+    rows = []
+    inserted = {}
+    for key, (index, values) in new.items():
+        if key in existing:
+            results[index] = {"index": index, "status": "duplicate", "name": existing[key]}
+            continue
+
+        name = frappe.generate_hash(length=10)
+        inserted[key] = (index, name)
+        provider, _hash, payment_type = key
+        rows.append([name, now, now, user, user, 0, 0] + [
+            values.get("hash"),
+            payment_type,
+            values["amount"],
+            values.get("info_1"),
+            values.get("info_2"),
+            values.get("info_3"),
+            values.get("number"),
+            provider,
+            to_system_datetime(values.get("payment_at")) if values.get("payment_at") else None,
+            values.get("donation"),
+            1
+        ])
+
+    if rows:
+        # IGNORE makes a retry racing this request a no-op on the unique key
+        frappe.db.bulk_insert(
+            "Donation Payment",
+            STANDARD_BULK_FIELDS + DONATION_PAYMENT_BULK_FIELDS,
+            rows,
+            ignore_duplicates=True
+        )
+        stored = find_existing_payments(list(inserted))
+        frappe.db.commit()
+
+        for key, (index, name) in inserted.items():
+            if stored.get(key) == name:
+                results[index] = {"index": index, "status": "created", "name": name}
+            else:
+                results[index] = {"index": index, "status": "duplicate", "name": stored.get(key)}
+
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("created", "duplicate", "error")}
+
+    return {
+        "status": "success",
+        "message": f"💳 {counts['created']} of {len(payments)} payments created.",
+        **counts,
+        "results": results
+    }
+
+
 # # homie_app/api.py
 # import frappe
 # from frappe import _
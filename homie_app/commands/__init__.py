@@ -0,0 +1,159 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-kpi-summary")
+@pass_context
+def rebuild_kpi_summary(context):
+	"Recompute the workspace dashboard KPI Summary from scratch"
+	from homie_app.homie_app.doctype.kpi_summary.kpi_summary import rebuild_kpi_summary
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		values = rebuild_kpi_summary()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+	for key, value in values.items():
+		click.echo(f"{key}: {value}")
+
+
+@click.command("check-indexes")
+@click.option("--fix", is_flag=True, default=False, help="Add the missing indexes")
+@pass_context
+def check_indexes(context, fix=False):
+	"List hot-path lookup columns that have no covering index"
+	from homie_app.indexes import ensure_indexes, get_missing_indexes
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		missing = ensure_indexes() if fix else get_missing_indexes()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+	if not missing:
+		click.echo("All hot-path indexes are present.")
+		return
+
+	for doctype, columns in missing:
+		click.echo(f"{'Added' if fix else 'Missing'}: {doctype} ({', '.join(columns)})")
+
+	if not fix:
+		raise SystemExit(1)
+
+
+@click.command("resync-denormalized-names")
+@click.option("--doctype", help="Only resync copies of this source doctype")
+@pass_context
+def resync_denormalized_names(context, doctype=None):
+	"Copy person, shelter, organization and product names to every record that stores them"
+	from homie_app.propagation import resync_all
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		counts = resync_all(doctype)
+	finally:
+		frappe.destroy()
+
+	for (source, dependent), count in counts.items():
+		click.echo(f"{source} -> {dependent}: {count} updated")
+
+
+@click.command("rebuild-person-search-index")
+@pass_context
+def rebuild_person_search_index(context):
+	"Rebuild the search_persons token index from Person Details"
+	from homie_app.homie_app.doctype.person_search_index.person_search_index import (
+		rebuild_person_search_index,
+	)
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		count = rebuild_person_search_index()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+	click.echo(f"Indexed {count} persons")
+
+
+@click.command("rebuild-donation-rollup")
+@pass_context
+def rebuild_donation_rollup(context):
+	"Recompute the daily donation rollup behind get_donation_timeseries"
+	from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import (
+		rebuild_donation_rollup,
+	)
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		count = rebuild_donation_rollup()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+	click.echo(f"Rebuilt {count} rollup rows")
+
+
+@click.command("rebuild-food-fulfillment-ledger")
+@pass_context
+def rebuild_food_fulfillment_ledger(context):
+	"Re-parse food requirements and recompute the per-recipient fulfillment ledger"
+	from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import (
+		rebuild_food_fulfillment_ledger,
+		reparse_requirement_quantities,
+	)
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		parsed = reparse_requirement_quantities()
+		count = rebuild_food_fulfillment_ledger()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+	click.echo(f"Re-parsed {parsed} food requirements, rebuilt {count} ledger rows")
+
+
+@click.command("rebuild-animal-census")
+@pass_context
+def rebuild_animal_census(context):
+	"Recompute the animal census from Animal Information and refresh today's snapshots"
+	from homie_app.homie_app.doctype.animal_census.animal_census import rebuild_animal_census
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		count = rebuild_animal_census()
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+	click.echo(f"Rebuilt {count} census rows")
+
+
+commands = [
+	rebuild_kpi_summary,
+	check_indexes,
+	resync_denormalized_names,
+	rebuild_person_search_index,
+	rebuild_donation_rollup,
+	rebuild_food_fulfillment_ledger,
+	rebuild_animal_census,
+]
@@ -0,0 +1,115 @@
+"""
+Conditional GET for the read APIs.
+
+Each endpoint derives a cheap validator from the tables it reads (the max of
+`modified` plus a row count for lists, `modified` for a single record and
+the records it embeds) and sends it as an ETag. When the client's
+If-None-Match already holds it, a bodiless 304 is returned before any
+document is loaded.
+"""
+
+import hashlib
+import json
+
+import frappe
+from werkzeug.wrappers import Response
+
+ETAG_VERSION_KEY = "homie_etag_version"
+
+
+def get_etag_version(doctype):
+    """Bumped by writes that bypass `modified`, such as name propagation"""
+    return frappe.cache().get_value(f"{ETAG_VERSION_KEY}|{doctype}") or ""
+
+
+def bump_etag_version(doctype):
+    frappe.cache().set_value(f"{ETAG_VERSION_KEY}|{doctype}", frappe.generate_hash(length=10))
+
+
+def conditional_response(validator, *args):
+    """
+    Send an ETag for `validator` and the request arguments that shape the
+    response. Returns a 304 Response if the client already has it, else None.
+    """
+    etag = hashlib.md5(frappe.as_json([validator, args], indent=None).encode()).hexdigest()
+
+    headers = getattr(frappe.local, "response_headers", None)
+    if headers is not None:
+        headers.set("ETag", f'"{etag}"')
+
+    request = getattr(frappe.local, "request", None)
+    if request is not None and request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
+
+    return None
+
+
+def list_not_modified(doctypes, *args):
+    """
+    304 Response for a list endpoint whose tables have not changed, else None.
+
+    The validator covers whole tables, so it stays valid for any filter or page:
+    an insert or update moves max(modified), a delete changes the count.
+    """
+    if isinstance(doctypes, str):
+        doctypes = [doctypes]
+
+    validator = []
+    for doctype in doctypes:
+        max_modified, count = frappe.db.sql(f"SELECT MAX(`modified`), COUNT(*) FROM `tab{doctype}`")[0]
+        validator.append([doctype, max_modified, count, get_etag_version(doctype)])
+
+    return conditional_response(validator, *args)
+
+
+def get_expanded_links(doctype, expand):
+    """{fieldname: linked doctype} for the `expand` parameter, None if it is not a list of Link fields"""
+    if not expand:
+        return {}
+    if isinstance(expand, str):
+        try:
+            expand = json.loads(expand) if expand.strip().startswith("[") else expand.split(",")
+        except ValueError:
+            return None
+    if not isinstance(expand, (list, tuple)):
+        return None
+
+    meta = frappe.get_meta(doctype)
+    links = {}
+    for fieldname in expand:
+        df = meta.get_field(fieldname.strip()) if isinstance(fieldname, str) else None
+        if not df or df.fieldtype != "Link":
+            return None
+        links[df.fieldname] = df.options
+    return links
+
+
+def record_not_modified(doctype, name, fields=None, exclude=None, expand=None, linked=None):
+    """
+    304 Response for a single record that has not changed, else None.
+    `linked` is an optional (doctype, fieldname) whose record is part of the
+    response; records embedded through `expand` count the same way, so a
+    change to any of them changes the ETag.
+    """
+    links = get_expanded_links(doctype, expand)
+    if links is None:
+        # let the endpoint raise its own validation error
+        return None
+    if linked:
+        links[linked[1]] = linked[0]
+
+    values = frappe.db.get_value(doctype, name, ["modified", *links], as_dict=True)
+    if not values:
+        # let the endpoint raise its own not-found error
+        return None
+
+    validator = [doctype, name, values.modified, get_etag_version(doctype)]
+    for fieldname, link_doctype in sorted(links.items()):
+        if values.get(fieldname):
+            validator.append([
+                fieldname,
+                frappe.db.get_value(link_doctype, values.get(fieldname), "modified"),
+                get_etag_version(link_doctype),
+            ])
+
+    return conditional_response(validator, fields, exclude, expand)
@@ -0,0 +1,103 @@
+"""
+Compact response modes for the list endpoints.
+
+Clients opt in with `format=columnar|msgpack` or an Accept header of
+`application/vnd.homie.columnar+json` / `application/msgpack`. The row list
+is sent as {"keys": [...], "rows": [[...], ...]} instead of a list of
+objects, encoded once, and compressed with brotli or gzip when the client
+accepts it. The default `json` format is left to frappe as before.
+
+msgpack and brotli are declared in pyproject.toml; the import guards only
+keep a bench that has not reinstalled the app working, without msgpack
+in FORMATS and without brotli being offered.
+"""
+
+import gzip
+import json
+
+import frappe
+from frappe import _
+from frappe.utils.response import json_handler
+from werkzeug.wrappers import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FORMATS = ("json", "columnar", "msgpack") if msgpack else ("json", "columnar")
+COLUMNAR_CONTENT_TYPE = "application/vnd.homie.columnar+json"
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+MIN_COMPRESS_BYTES = 1024
+
+
+def negotiate_format(format=None):
+    """Response format from the `format` parameter, else from the Accept header"""
+    if format:
+        if format not in FORMATS:
+            frappe.throw(_("Unsupported format '{0}'. Use one of: {1}").format(format, ", ".join(FORMATS)))
+        return format
+
+    accept = frappe.get_request_header("Accept") or ""
+    if msgpack and any(t in accept for t in MSGPACK_CONTENT_TYPES):
+        return "msgpack"
+    if COLUMNAR_CONTENT_TYPE in accept:
+        return "columnar"
+    return "json"
+
+
+def to_columnar(rows):
+    keys = list(rows[0]) if rows else []
+    return {"keys": keys, "rows": [[row.get(k) for k in keys] for row in rows]}
+
+
+def dumps_json(payload):
+    if orjson:
+        return orjson.dumps(payload, default=json_handler, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(payload, default=json_handler, separators=(",", ":")).encode()
+
+
+def compress(body):
+    """(body, Content-Encoding) using the best encoding the client accepts"""
+    accepted = frappe.get_request_header("Accept-Encoding") or ""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if brotli and "br" in accepted:
+        return brotli.compress(body, quality=5), "br"
+    if "gzip" in accepted:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def encode_list(payload, response_format, rows_key="data"):
+    """
+    Return the payload as is for `json`, else a Response carrying it with
+    `rows_key` in columnar form, serialized and compressed once.
+    """
+    if response_format == "json":
+        return payload
+
+    payload = {**payload, rows_key: to_columnar(payload[rows_key])}
+    if response_format == "msgpack":
+        body = msgpack.packb(payload, default=json_handler, use_bin_type=True)
+        content_type = MSGPACK_CONTENT_TYPES[0]
+    else:
+        body = dumps_json(payload)
+        content_type = COLUMNAR_CONTENT_TYPE
+
+    body, encoding = compress(body)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(body, content_type=content_type, headers=headers)
@@ -0,0 +1,32 @@
+frappe.provide("frappe.dashboards.chart_sources");
+
+frappe.dashboards.chart_sources["Donation Timeseries"] = {
+	method: "homie_app.homie_app.dashboard_chart_source.donation_timeseries.donation_timeseries.get",
+	filters: [
+		{
+			fieldname: "organization",
+			label: __("Organization"),
+			fieldtype: "Link",
+			options: "Organization Details",
+		},
+		{
+			fieldname: "granularity",
+			label: __("Granularity"),
+			fieldtype: "Select",
+			options: "day\nweek\nmonth",
+			default: "day",
+		},
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.add_months(frappe.datetime.get_today(), -1),
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.get_today(),
+		},
+	],
+};
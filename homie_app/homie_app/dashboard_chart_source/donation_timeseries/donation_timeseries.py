@@ -0,0 +1,36 @@
+import json
+
+import frappe
+from frappe import _
+from frappe.utils.dashboard import cache_source
+
+from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import get_timeseries
+
+
+@frappe.whitelist()
+@cache_source
+def get(chart_name=None, chart=None, no_cache=None, filters=None, from_date=None, to_date=None,
+		timespan=None, time_interval=None, heatmap_year=None):
+	if isinstance(filters, str):
+		filters = json.loads(filters)
+	filters = frappe._dict(filters or {})
+
+	rows = get_timeseries(
+		filters.organization,
+		filters.from_date,
+		filters.to_date,
+		filters.granularity or "day",
+	)
+
+	# one dataset per currency over a shared list of periods
+	labels = sorted({str(row.period) for row in rows})
+	position = {label: i for i, label in enumerate(labels)}
+	datasets = {}
+	for row in rows:
+		values = datasets.setdefault(row.currency or _("No Currency"), [0] * len(labels))
+		values[position[str(row.period)]] = row.total_amount
+
+	return {
+		"labels": labels,
+		"datasets": [{"name": currency, "values": values} for currency, values in datasets.items()],
+	}
@@ -0,0 +1,276 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, getdate, now_datetime
+
+OVERALL = "Overall"
+RECIPIENT_TYPES = ("Person Details", "Animal Shelters")
+DOG_FIELDS = ["adult_dogs", "puppies", "senior_sick_dogs"]
+CAT_FIELDS = ["adult_cats", "kittens", "senior_sick_cats"]
+COUNT_FIELDS = DOG_FIELDS + CAT_FIELDS
+CENSUS_FIELDS = ["record_count"] + COUNT_FIELDS + ["total_dogs", "total_cats", "total_animals"]
+
+
+class AnimalCensus(Document):
+	pass
+
+
+def on_doctype_update():
+	# one row per recipient, whatever its name
+	frappe.db.add_unique("Animal Census", ["recipient_type", "recipient"], constraint_name="unique_recipient")
+	# get_census ranks recipients by population, optionally for one recipient type
+	frappe.db.add_index("Animal Census", ["recipient_type", "total_animals"])
+
+
+def get_recipient(animal):
+	"""(recipient_type, recipient, recipient_name) an Animal Information record counts towards"""
+	if animal.get("source") == "Person" and animal.get("person_details"):
+		name = " ".join(p for p in (animal.get("first_name"), animal.get("last_name")) if p)
+		return "Person Details", animal.get("person_details"), name
+	if animal.get("source") == "Animal Shelter" and animal.get("shelter_detail"):
+		return "Animal Shelters", animal.get("shelter_detail"), animal.get("shelter_name") or ""
+	return None
+
+
+def get_census_name(recipient_type=None, recipient=None):
+	return f"{recipient_type}|{recipient}" if recipient else OVERALL
+
+
+def add_animal(deltas, animal, sign=1):
+	"""Accumulate one record into {census name: delta}, for its recipient and the overall row"""
+	recipient = get_recipient(animal)
+	keys = [(None, None, "")]
+	if recipient:
+		keys.append(recipient)
+
+	for recipient_type, name, recipient_name in keys:
+		delta = deltas.setdefault(get_census_name(recipient_type, name), {
+			"recipient_type": recipient_type,
+			"recipient": name,
+			**dict.fromkeys(["record_count"] + COUNT_FIELDS, 0),
+		})
+		delta["recipient_name"] = recipient_name
+		delta["record_count"] += sign
+		for field in COUNT_FIELDS:
+			delta[field] += sign * cint(animal.get(field))
+	return deltas
+
+
+def apply_census_deltas(deltas):
+	"""
+	Upsert deltas into the census with one multi-row statement, then write
+	today's snapshot of every row that changed. A snapshot holds the totals
+	at the end of its day; days without changes have no snapshot.
+	"""
+	deltas = {k: v for k, v in deltas.items() if any(v[f] for f in ["record_count"] + COUNT_FIELDS)}
+	if not deltas:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	rows = []
+	values = []
+	for name, delta in deltas.items():
+		dogs = sum(delta[f] for f in DOG_FIELDS)
+		cats = sum(delta[f] for f in CAT_FIELDS)
+		rows.append("(%s, %s, %s, %s, %s, 0, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
+		values += [
+			name, now, now, user, user,
+			delta["recipient_type"], delta["recipient"], delta["recipient_name"], delta["record_count"],
+			*(delta[f] for f in COUNT_FIELDS),
+			dogs, cats, dogs + cats,
+		]
+
+	# assignments run left to right, so the totals see the updated counts
+	frappe.db.sql(f"""
+		INSERT INTO `tabAnimal Census`
+			(name, creation, modified, owner, modified_by, docstatus,
+			recipient_type, recipient, recipient_name, record_count,
+			{", ".join(COUNT_FIELDS)}, total_dogs, total_cats, total_animals)
+		VALUES {", ".join(rows)}
+		ON DUPLICATE KEY UPDATE
+			recipient_name = IF(VALUES(recipient_name) != '', VALUES(recipient_name), recipient_name),
+			record_count = record_count + VALUES(record_count),
+			{", ".join(f"{f} = {f} + VALUES({f})" for f in COUNT_FIELDS)},
+			total_dogs = {" + ".join(DOG_FIELDS)},
+			total_cats = {" + ".join(CAT_FIELDS)},
+			total_animals = total_dogs + total_cats,
+			modified = VALUES(modified)
+	""", values)
+
+	write_snapshots(list(deltas), now)
+
+
+def write_snapshots(census_names=None, now=None):
+	"""Copy the current totals of the given census rows (all when None) into today's snapshots"""
+	now = now or now_datetime()
+	condition = "WHERE c.name IN %(names)s" if census_names else ""
+	frappe.db.sql(f"""
+		INSERT INTO `tabAnimal Census Snapshot`
+			(name, creation, modified, owner, modified_by, docstatus,
+			snapshot_date, census, {", ".join(CENSUS_FIELDS)})
+		SELECT
+			CONCAT(%(date)s, '|', c.name), %(now)s, %(now)s, %(user)s, %(user)s, 0,
+			%(date)s, c.name, {", ".join(f"c.{f}" for f in CENSUS_FIELDS)}
+		FROM `tabAnimal Census` c
+		{condition}
+		ON DUPLICATE KEY UPDATE
+			{", ".join(f"{f} = VALUES({f})" for f in CENSUS_FIELDS)},
+			modified = VALUES(modified)
+	""", {"names": tuple(census_names or ()), "date": getdate(now), "now": now, "user": frappe.session.user})
+
+
+def get_sums(alias):
+	"""SUM() expressions over `alias` for the count columns, then total_dogs, total_cats, total_animals"""
+	counts = {f: f"SUM(IFNULL({alias}.{f}, 0))" for f in COUNT_FIELDS}
+	dogs = " + ".join(counts[f] for f in DOG_FIELDS)
+	cats = " + ".join(counts[f] for f in CAT_FIELDS)
+	return ", ".join(list(counts.values()) + [dogs, cats, f"{dogs} + {cats}"])
+
+
+def rebuild_animal_census():
+	"""
+	Recompute the census from Animal Information and overwrite today's
+	snapshots with it; earlier snapshots are kept. Returns the number of rows.
+	"""
+	frappe.db.sql("DELETE FROM `tabAnimal Census`")
+	columns = f"""
+		(name, creation, modified, owner, modified_by, docstatus,
+		recipient_type, recipient, recipient_name, record_count,
+		{", ".join(COUNT_FIELDS)}, total_dogs, total_cats, total_animals)
+	"""
+	now = now_datetime()
+	values = {"now": now, "user": frappe.session.user, "overall": OVERALL}
+
+	frappe.db.sql(f"""
+		INSERT INTO `tabAnimal Census` {columns}
+		SELECT
+			CONCAT(k.recipient_type, '|', k.recipient), %(now)s, %(now)s, %(user)s, %(user)s, 0,
+			k.recipient_type, k.recipient, MAX(k.recipient_name), COUNT(*), {get_sums("k")}
+		FROM (
+			SELECT
+				IF(a.source = 'Person', 'Person Details', 'Animal Shelters') AS recipient_type,
+				IF(a.source = 'Person', a.person_details, a.shelter_detail) AS recipient,
+				IF(a.source = 'Person', TRIM(CONCAT_WS(' ', a.first_name, a.last_name)), IFNULL(a.shelter_name, '')) AS recipient_name,
+				{", ".join(f"a.{f}" for f in COUNT_FIELDS)}
+			FROM `tabAnimal Information` a
+			WHERE (a.source = 'Person' AND IFNULL(a.person_details, '') != '')
+				OR (a.source = 'Animal Shelter' AND IFNULL(a.shelter_detail, '') != '')
+		) k
+		GROUP BY k.recipient_type, k.recipient
+	""", values)
+
+	frappe.db.sql(f"""
+		INSERT INTO `tabAnimal Census` {columns}
+		SELECT %(overall)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, NULL, NULL, '', COUNT(*), {get_sums("a")}
+		FROM `tabAnimal Information` a
+	""", values)
+
+	write_snapshots(now=now)
+	return frappe.db.count("Animal Census")
+
+
+def get_census(recipient_type=None, recipient=None, limit=20):
+	"""(overall row, [recipient rows]) with recipients ranked by total animals"""
+	if (recipient or recipient_type) and recipient_type not in RECIPIENT_TYPES:
+		frappe.throw(_("Recipient type must be one of: {0}").format(", ".join(RECIPIENT_TYPES)))
+
+	fields = ", ".join(["name", "recipient_type", "recipient", "recipient_name"] + CENSUS_FIELDS)
+	if recipient:
+		conditions = "WHERE name = %(name)s"
+	elif recipient_type:
+		conditions = "WHERE recipient_type = %(recipient_type)s"
+	else:
+		conditions = "WHERE recipient_type IS NOT NULL"
+
+	rows = frappe.db.sql(f"""
+		(SELECT {fields} FROM `tabAnimal Census` WHERE name = %(overall)s)
+		UNION ALL
+		(SELECT {fields} FROM `tabAnimal Census` {conditions} ORDER BY total_animals DESC LIMIT %(limit)s)
+	""", {
+		"overall": OVERALL,
+		"name": get_census_name(recipient_type, recipient),
+		"recipient_type": recipient_type,
+		"limit": limit,
+	}, as_dict=True)
+
+	overall = next((r for r in rows if r.name == OVERALL), None)
+	return overall, [r for r in rows if r.name != OVERALL]
+
+
+def get_trend(recipient_type=None, recipient=None, from_date=None, to_date=None):
+	"""Snapshots of one census row (overall by default) ordered by date"""
+	if recipient and recipient_type not in RECIPIENT_TYPES:
+		frappe.throw(_("Recipient type must be one of: {0}").format(", ".join(RECIPIENT_TYPES)))
+
+	conditions = ["census = %(census)s"]
+	values = {"census": get_census_name(recipient_type, recipient)}
+	if from_date:
+		conditions.append("snapshot_date >= %(from_date)s")
+		values["from_date"] = getdate(from_date)
+	if to_date:
+		conditions.append("snapshot_date < %(to_date)s")
+		values["to_date"] = add_days(getdate(to_date), 1)
+
+	return frappe.db.sql(f"""
+		SELECT snapshot_date, {", ".join(CENSUS_FIELDS)}
+		FROM `tabAnimal Census Snapshot`
+		WHERE {" AND ".join(conditions)}
+		ORDER BY snapshot_date
+	""", values, as_dict=True)
+
+
+# -----------------------------
+# doc_events
+# -----------------------------
+def on_animal_update(doc, method=None):
+	deltas = {}
+	before = doc.get_doc_before_save()
+	if before:
+		add_animal(deltas, before, sign=-1)
+	apply_census_deltas(add_animal(deltas, doc))
+
+
+def on_animal_delete(doc, method=None):
+	apply_census_deltas(add_animal({}, doc, sign=-1))
+
+
+def on_recipient_trash(doc, method=None):
+	"""Person Details / Animal Shelters: drop the recipient's row and history (Animal Census is in ignore_links_on_delete)"""
+	name = get_census_name(doc.doctype, doc.name)
+	frappe.db.delete("Animal Census Snapshot", {"census": name})
+	frappe.db.delete("Animal Census", {"recipient_type": doc.doctype, "recipient": doc.name})
+
+
+def on_recipient_rename(doc, method=None, old=None, new=None, merge=False):
+	"""
+	Person Details / Animal Shelters before_rename: move the recipient's row
+	and snapshots to its new name. On a merge the counts are added to the
+	target's row and the target's snapshots win on days both have one.
+	Runs before frappe renames the Dynamic Link, which would otherwise
+	collide with the target's row on the unique (recipient_type, recipient) key.
+	"""
+	old_name = get_census_name(doc.doctype, old)
+	new_name = get_census_name(doc.doctype, new)
+	row = frappe.db.get_value("Animal Census", old_name, ["recipient_name", "record_count", *COUNT_FIELDS], as_dict=True)
+	if not row:
+		return
+
+	frappe.db.sql("""
+		UPDATE IGNORE `tabAnimal Census Snapshot`
+		SET census = %(new)s, name = CONCAT(snapshot_date, '|', %(new)s)
+		WHERE census = %(old)s
+	""", {"old": old_name, "new": new_name})
+	frappe.db.delete("Animal Census Snapshot", {"census": old_name})
+	frappe.db.delete("Animal Census", old_name)
+
+	apply_census_deltas({new_name: {
+		**row,
+		"recipient_type": doc.doctype,
+		"recipient": new,
+		# the target keeps its own name
+		"recipient_name": "" if merge else row.recipient_name,
+	}})
@@ -0,0 +1,124 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from homie_app.homie_app.doctype.animal_census.animal_census import (
+	CENSUS_FIELDS,
+	OVERALL,
+	get_census_name,
+	get_trend,
+	rebuild_animal_census,
+)
+
+
+def make_shelter():
+	return frappe.get_doc({
+		"doctype": "Animal Shelters",
+		"shelter_name": f"Census Shelter {frappe.generate_hash(length=6)}",
+	}).insert(ignore_permissions=True)
+
+
+def make_animal(shelter, **counts):
+	return frappe.get_doc({
+		"doctype": "Animal Information",
+		"source": "Animal Shelter",
+		"animal_type": "Dog",
+		"shelter_detail": shelter.name,
+		"shelter_name": shelter.shelter_name,
+		**counts,
+	}).insert(ignore_permissions=True)
+
+
+def get_row(name):
+	return frappe.db.get_value("Animal Census", name, CENSUS_FIELDS, as_dict=True)
+
+
+def get_shelter_row(shelter_name):
+	return get_row(get_census_name("Animal Shelters", shelter_name))
+
+
+class TestAnimalCensus(FrappeTestCase):
+	def test_deltas_follow_animal_changes(self):
+		first, second = make_shelter(), make_shelter()
+		before = get_row(OVERALL) or frappe._dict(total_animals=0, record_count=0)
+
+		animal = make_animal(first, adult_dogs=2, puppies=3)
+		row = get_shelter_row(first.name)
+		self.assertEqual((row.record_count, row.adult_dogs, row.puppies, row.total_dogs, row.total_animals), (1, 2, 3, 5, 5))
+		overall = get_row(OVERALL)
+		self.assertEqual(overall.total_animals - before.total_animals, 5)
+		self.assertEqual(overall.record_count - before.record_count, 1)
+
+		animal.puppies = 1
+		animal.save(ignore_permissions=True)
+		self.assertEqual(get_shelter_row(first.name).total_animals, 3)
+
+		# moving the record moves its counts
+		animal.shelter_detail = second.name
+		animal.shelter_name = second.shelter_name
+		animal.save(ignore_permissions=True)
+		self.assertEqual(get_shelter_row(first.name).record_count, 0)
+		self.assertEqual(get_shelter_row(first.name).total_animals, 0)
+		self.assertEqual(get_shelter_row(second.name).total_animals, 3)
+
+		animal.delete(ignore_permissions=True)
+		self.assertEqual(get_shelter_row(second.name).total_animals, 0)
+		self.assertEqual(get_row(OVERALL).total_animals, before.total_animals)
+
+	def test_snapshot_holds_end_of_day_totals(self):
+		shelter = make_shelter()
+		animal = make_animal(shelter, adult_dogs=4)
+		animal.adult_dogs = 6
+		animal.save(ignore_permissions=True)
+
+		trend = get_trend("Animal Shelters", shelter.name)
+		self.assertEqual(len(trend), 1)
+		self.assertEqual(getdate(trend[0].snapshot_date), getdate())
+		self.assertEqual((trend[0].record_count, trend[0].total_animals), (1, 6))
+
+		self.assertEqual(get_trend("Animal Shelters", shelter.name, from_date=frappe.utils.add_days(getdate(), 1)), [])
+
+	def test_rebuild_matches_incremental_rows(self):
+		first, second = make_shelter(), make_shelter()
+		make_animal(first, adult_dogs=1, puppies=2)
+		make_animal(first, senior_sick_dogs=3)
+		make_animal(second, adult_dogs=5)
+		names = [get_census_name("Animal Shelters", s.name) for s in (first, second)] + [OVERALL]
+		incremental = {name: get_row(name) for name in names}
+
+		rebuild_animal_census()
+
+		for name in names:
+			with self.subTest(census=name):
+				self.assertEqual(get_row(name), incremental[name])
+		self.assertEqual(get_trend("Animal Shelters", first.name)[-1].total_animals, 6)
+
+	def test_deleting_a_recipient_removes_its_rows(self):
+		shelter = make_shelter()
+		make_animal(shelter, adult_dogs=1).delete(ignore_permissions=True)
+		self.assertIsNotNone(get_shelter_row(shelter.name))
+
+		# the zeroed census row must not block the delete
+		frappe.delete_doc("Animal Shelters", shelter.name, ignore_permissions=True)
+		self.assertIsNone(get_shelter_row(shelter.name))
+		self.assertEqual(get_trend("Animal Shelters", shelter.name), [])
+
+	def test_rename_moves_row_and_history(self):
+		shelter = make_shelter()
+		make_animal(shelter, adult_dogs=2)
+		new_name = f"SHR-RENAMED-{frappe.generate_hash(length=6)}"
+
+		frappe.rename_doc("Animal Shelters", shelter.name, new_name, force=True)
+		self.assertIsNone(get_shelter_row(shelter.name))
+		self.assertEqual(get_shelter_row(new_name).total_animals, 2)
+		self.assertEqual([t.total_animals for t in get_trend("Animal Shelters", new_name)], [2])
+
+		make_animal(frappe.get_doc("Animal Shelters", new_name), adult_dogs=1)
+		row = get_shelter_row(new_name)
+		self.assertEqual((row.record_count, row.total_animals), (2, 3))
+		self.assertEqual(
+			frappe.db.count("Animal Census", {"recipient_type": "Animal Shelters", "recipient": new_name}), 1
+		)
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Anonymous and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Animal Census Snapshot', {
+	// refresh: function(frm) {
+
+	// }
+});
@@ -0,0 +1,13 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class AnimalCensusSnapshot(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Animal Census Snapshot", ["census", "snapshot_date"])
@@ -0,0 +1,246 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import csv
+import os
+import zipfile
+from itertools import islice
+from urllib.parse import unquote
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, add_to_date, cint, getdate, now_datetime
+
+EXPORT_CHUNK_SIZE = 500
+FILE_HEARTBEAT_EVERY = 100
+STALE_AFTER_MINUTES = 15
+ACTIVE_STATUSES = ("Queued", "Exporting Rows", "Collecting Files")
+
+DELIVERY_EXPORT_FIELDS = [
+	"name", "deleivery_date", "deleivery_type", "deleiver_to", "display_title",
+	"organization_detail", "organization_name", "person_details", "first_name", "last_name",
+	"shleter_details", "shleter_name", "no_of_pallets", "no_of_kilogram", "deleivery_note",
+	"arrival_proof",
+]
+# path of the attachment inside the ZIP, filled in while exporting rows
+ATTACHMENT_COLUMN = "arrival_proof_file"
+
+
+class DeliveryExportJob(Document):
+	def get_csv_path(self):
+		return frappe.get_site_path("private", "homie_exports", f"{self.name}.csv")
+
+	def get_zip_path(self):
+		# outside the files folders: only download_delivery_export serves it
+		return frappe.get_site_path("private", "homie_exports", self.get_zip_filename())
+
+	def get_zip_filename(self):
+		return f"{self.name}-deliveries.zip"
+
+
+def start_export(organization, from_date=None, to_date=None):
+	job = frappe.get_doc({
+		"doctype": "Delivery Export Job",
+		"organization": organization,
+		"from_date": from_date,
+		"to_date": to_date,
+	}).insert(ignore_permissions=True)
+	enqueue_export(job.name)
+	return job
+
+
+def enqueue_export(job_name):
+	frappe.enqueue(
+		"homie_app.homie_app.doctype.delivery_export_job.delivery_export_job.run_export",
+		queue="long",
+		timeout=6 * 3600,
+		job_id=f"delivery_export::{job_name}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		job_name=job_name,
+	)
+
+
+def get_conditions(job):
+	conditions = ["organization_detail = %(organization)s"]
+	values = {"organization": job.organization}
+	if job.from_date:
+		conditions.append("deleivery_date >= %(from_date)s")
+		values["from_date"] = getdate(job.from_date)
+	if job.to_date:
+		conditions.append("deleivery_date < %(to_date)s")
+		values["to_date"] = add_days(getdate(job.to_date), 1)
+	return " AND ".join(conditions), values
+
+
+def run_export(job_name):
+	"""
+	Export (or resume exporting) a job. Rows are appended to a working CSV
+	in chunks, each followed by a checkpoint of the last delivery and the
+	CSV size. The ZIP is only built once all rows are out, reading the file
+	paths back from the CSV; if that phase is interrupted it starts over.
+	"""
+	job = frappe.get_doc("Delivery Export Job", job_name)
+	if job.status not in ACTIVE_STATUSES:
+		return
+
+	try:
+		if job.status in ("Queued", "Exporting Rows"):
+			export_rows(job)
+		build_archive(job)
+	except Exception:
+		frappe.db.rollback()
+		job.reload()
+		job.db_set({"status": "Failed", "error": frappe.get_traceback()})
+		frappe.db.commit()
+		raise
+
+
+def export_rows(job):
+	conditions, values = get_conditions(job)
+	if job.status == "Queued":
+		total = frappe.db.sql(f"SELECT COUNT(*) FROM `tabDeleivery Informations` WHERE {conditions}", values)[0][0]
+		job.db_set({"status": "Exporting Rows", "total_rows": total, "exported_rows": 0, "csv_bytes": 0, "last_exported_name": None})
+		frappe.db.commit()
+
+	path = job.get_csv_path()
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	header = DELIVERY_EXPORT_FIELDS + [ATTACHMENT_COLUMN]
+
+	with open(path, "a+", newline="", encoding="utf-8") as f:
+		# drop whatever was written after the last checkpoint
+		f.truncate(cint(job.csv_bytes))
+		f.seek(0, os.SEEK_END)
+		writer = csv.writer(f)
+		if not job.csv_bytes:
+			writer.writerow(header)
+
+		fields = ", ".join(f"`{field}`" for field in DELIVERY_EXPORT_FIELDS)
+		while True:
+			rows = frappe.db.sql(f"""
+				SELECT {fields} FROM `tabDeleivery Informations`
+				WHERE {conditions} AND name > %(after)s
+				ORDER BY name
+				LIMIT %(limit)s
+			""", {**values, "after": job.last_exported_name or "", "limit": EXPORT_CHUNK_SIZE}, as_dict=True)
+			if not rows:
+				break
+
+			for row in rows:
+				writer.writerow([row[field] for field in DELIVERY_EXPORT_FIELDS] + [get_archive_name(row)])
+
+			f.flush()
+			os.fsync(f.fileno())
+
+			exported = cint(job.exported_rows) + len(rows)
+			job.db_set({
+				"exported_rows": exported,
+				"last_exported_name": rows[-1].name,
+				"csv_bytes": f.tell(),
+				"progress": 90 * exported / max(cint(job.total_rows), exported),
+			})
+			frappe.db.commit()
+
+	job.db_set({"status": "Collecting Files", "progress": 90})
+	frappe.db.commit()
+
+
+def get_archive_name(row):
+	if not row.arrival_proof:
+		return ""
+	return f"attachments/{row.name}-{os.path.basename(unquote(row.arrival_proof))}"
+
+
+def get_attachment_path(file_url):
+	"""
+	Local path of a /files or /private/files URL, None for anything else.
+	The resolved path (symlinks and ".." included) must stay inside the
+	files folder the URL names.
+	"""
+	file_url = unquote(file_url or "")
+	if "\0" in file_url:
+		return None
+	for prefix, folder in (("/private/files/", ("private", "files")), ("/files/", ("public", "files"))):
+		if file_url.startswith(prefix):
+			root = os.path.realpath(frappe.get_site_path(*folder))
+			path = os.path.realpath(os.path.join(root, file_url[len(prefix):]))
+			if os.path.commonpath([root, path]) != root:
+				return None
+			return path if os.path.isfile(path) else None
+	return None
+
+
+def get_attachment_files(rows):
+	"""
+	{delivery: File} for the rows whose arrival_proof is a File attached to
+	that same delivery. The URL alone is client input and may name any file
+	on the site.
+	"""
+	proofs = {row["name"]: row["arrival_proof"] for row in rows if row["arrival_proof"]}
+	if not proofs:
+		return {}
+
+	files = frappe.get_all(
+		"File",
+		filters={
+			"attached_to_doctype": "Deleivery Informations",
+			"attached_to_name": ["in", list(proofs)],
+			"file_url": ["in", list(set(proofs.values()))],
+			"is_folder": 0,
+		},
+		fields=["name", "file_url", "attached_to_name"],
+	)
+	return {f.attached_to_name: f for f in files if proofs[f.attached_to_name] == f.file_url}
+
+
+def build_archive(job):
+	"""Stream the CSV and every attachment it lists into the job's ZIP"""
+	csv_path = job.get_csv_path()
+	zip_path = job.get_zip_path()
+	partial_path = f"{zip_path}.part"
+
+	added = missing = 0
+	with zipfile.ZipFile(partial_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+		archive.write(csv_path, "deliveries.csv")
+
+		with open(csv_path, newline="", encoding="utf-8") as f:
+			reader = csv.DictReader(f)
+			for chunk in iter(lambda: list(islice(reader, EXPORT_CHUNK_SIZE)), []):
+				rows = [row for row in chunk if row[ATTACHMENT_COLUMN]]
+				files = get_attachment_files(rows)
+
+				for row in rows:
+					file = files.get(row["name"])
+					path = file and get_attachment_path(file.file_url)
+					if path:
+						# images are already compressed
+						archive.write(path, row[ATTACHMENT_COLUMN], compress_type=zipfile.ZIP_STORED)
+						added += 1
+					else:
+						missing += 1
+
+					if (added + missing) % FILE_HEARTBEAT_EVERY == 0:
+						job.db_set({"files_added": added, "missing_files": missing})
+						frappe.db.commit()
+
+	os.replace(partial_path, zip_path)
+
+	job.db_set({
+		"status": "Completed",
+		"progress": 100,
+		"files_added": added,
+		"missing_files": missing,
+	})
+	frappe.db.commit()
+	os.remove(csv_path)
+
+
+def resume_stale_exports():
+	"""Scheduled: re-enqueue unfinished jobs whose worker went away"""
+	stale_before = add_to_date(now_datetime(), minutes=-STALE_AFTER_MINUTES)
+	for name in frappe.get_all(
+		"Delivery Export Job",
+		filters={"status": ["in", ACTIVE_STATUSES], "modified": ["<", stale_before]},
+		pluck="name",
+	):
+		enqueue_export(name)
@@ -0,0 +1,81 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import os
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from homie_app import api
+from homie_app.homie_app.doctype.delivery_export_job.delivery_export_job import (
+	get_attachment_files,
+	get_attachment_path,
+)
+
+
+class TestDeliveryExportJob(FrappeTestCase):
+	def test_attachment_path_stays_in_files_folder(self):
+		name = f"export-test-{frappe.generate_hash(length=8)}.txt"
+		path = frappe.get_site_path("public", "files", name)
+		with open(path, "w") as f:
+			f.write("proof")
+		self.addCleanup(os.remove, path)
+
+		self.assertEqual(get_attachment_path(f"/files/{name}"), os.path.realpath(path))
+		for url in (
+			"/files/../../site_config.json",
+			"/files/..%2F..%2Fsite_config.json",
+			"/private/files/../../site_config.json",
+			"/files//etc/passwd",
+			"/etc/passwd",
+			"/files/%00",
+		):
+			with self.subTest(url=url):
+				self.assertIsNone(get_attachment_path(url))
+
+	def test_attachments_resolve_through_their_delivery(self):
+		own = frappe.get_doc({"doctype": "Deleivery Informations"}).insert(ignore_permissions=True)
+		other = frappe.get_doc({"doctype": "Deleivery Informations"}).insert(ignore_permissions=True)
+		proof = frappe.get_doc({
+			"doctype": "File",
+			"file_name": f"proof-{frappe.generate_hash(length=8)}.txt",
+			"content": b"proof",
+			"is_private": 1,
+			"attached_to_doctype": "Deleivery Informations",
+			"attached_to_name": own.name,
+		}).insert(ignore_permissions=True)
+		self.addCleanup(lambda: os.path.exists(proof.get_full_path()) and os.remove(proof.get_full_path()))
+
+		files = get_attachment_files([
+			{"name": own.name, "arrival_proof": proof.file_url},
+			# a private file of another delivery, named by URL only
+			{"name": other.name, "arrival_proof": proof.file_url},
+			{"name": other.name, "arrival_proof": ""},
+		])
+		self.assertEqual(list(files), [own.name])
+		self.assertEqual(files[own.name].name, proof.name)
+
+	def test_export_endpoints_check_permission(self):
+		email = f"export-{frappe.generate_hash(length=8)}@example.com"
+		frappe.get_doc({
+			"doctype": "User",
+			"email": email,
+			"first_name": "Export",
+			"send_welcome_email": 0,
+		}).insert(ignore_permissions=True)
+		organization = frappe.get_doc({
+			"doctype": "Organization Details",
+			"organization_name": f"Export Org {frappe.generate_hash(length=6)}",
+		}).insert(ignore_permissions=True)
+		job = frappe.get_doc({
+			"doctype": "Delivery Export Job",
+			"organization": organization.name,
+		}).insert(ignore_permissions=True)
+
+		frappe.set_user(email)
+		self.addCleanup(frappe.set_user, "Administrator")
+		with self.assertRaises(frappe.PermissionError):
+			api.start_delivery_export(organization.name)
+		for method in (api.get_delivery_export, api.download_delivery_export):
+			with self.subTest(method=method.__name__), self.assertRaises(frappe.PermissionError):
+				method(job.name)
@@ -7,12 +7,16 @@
 import frappe
 from frappe.model.document import Document
 
+from homie_app.homie_app.doctype.product_details.product_details import get_product_prices
+
 class Donation(Document):
     def validate(self):
+        prices = get_product_prices(item.product for item in self.items)
+
         donation_total = 0
         for item in self.items:
             if item.product:
-                item.amount = frappe.get_value("Product Details", item.product, "product_price") or 0
+                item.amount = prices.get(item.product, {}).get("product_price") or 0
             item.total = (item.quantity or 0) * (item.amount or 0)
             donation_total += item.total
 
@@ -0,0 +1,161 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, flt, getdate, now_datetime
+
+GRANULARITIES = {
+	"day": "r.donation_date",
+	"week": "DATE_SUB(r.donation_date, INTERVAL WEEKDAY(r.donation_date) DAY)",
+	"month": "DATE_FORMAT(r.donation_date, '%%Y-%%m-01')",
+}
+ROLLUP_FIELDS = ["donation_date", "organization", "donated_to", "currency", "total_amount", "donation_count", "item_quantity"]
+
+
+class DonationDailyRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Donation Daily Rollup", ["organization", "donation_date"])
+	frappe.db.add_index("Donation Daily Rollup", ["donation_date"])
+
+
+def get_rollup_key(donation):
+	"""(date, organization, donated_to, currency); empty strings instead of NULL so the key is comparable"""
+	return (
+		getdate(donation.get("donated_at") or now_datetime()),
+		donation.get("organization") or "",
+		donation.get("donated_to") or "",
+		donation.get("currency") or "",
+	)
+
+
+def add_to_deltas(deltas, donation, items, sign=1):
+	"""Accumulate one donation's contribution into {key: [amount, count, quantity]}"""
+	delta = deltas.setdefault(get_rollup_key(donation), [0.0, 0, 0])
+	delta[0] += sign * flt(donation.get("total"))
+	delta[1] += sign
+	delta[2] += sign * sum(cint(item.get("quantity")) for item in items or [])
+	return deltas
+
+
+def get_rollup_name(key):
+	donation_date, organization, donated_to, currency = key
+	return f"{donation_date}|{organization}|{donated_to}|{currency}"
+
+
+def apply_rollup_deltas(deltas):
+	"""
+	Upsert deltas into the rollup with one multi-row statement. The row name
+	is derived from its key, so the primary key doubles as the unique key.
+	"""
+	deltas = {k: v for k, v in deltas.items() if any(v)}
+	if not deltas:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	rows = []
+	values = []
+	for key, (amount, count, quantity) in deltas.items():
+		rows.append("(%s, %s, %s, %s, %s, 0, %s, %s, %s, %s, %s, %s, %s)")
+		values += [get_rollup_name(key), now, now, user, user, *key, amount, count, quantity]
+
+	frappe.db.sql(f"""
+		INSERT INTO `tabDonation Daily Rollup`
+			(name, creation, modified, owner, modified_by, docstatus,
+			donation_date, organization, donated_to, currency, total_amount, donation_count, item_quantity)
+		VALUES {", ".join(rows)}
+		ON DUPLICATE KEY UPDATE
+			total_amount = total_amount + VALUES(total_amount),
+			donation_count = donation_count + VALUES(donation_count),
+			item_quantity = item_quantity + VALUES(item_quantity),
+			modified = VALUES(modified)
+	""", values)
+
+
+def rebuild_donation_rollup():
+	"""Recompute the whole rollup from Donation; returns the number of rollup rows"""
+	frappe.db.sql("DELETE FROM `tabDonation Daily Rollup`")
+	now = now_datetime()
+	frappe.db.sql("""
+		INSERT INTO `tabDonation Daily Rollup`
+			(name, creation, modified, owner, modified_by, docstatus,
+			donation_date, organization, donated_to, currency, total_amount, donation_count, item_quantity)
+		SELECT
+			CONCAT_WS('|', k.donation_date, k.organization, k.donated_to, k.currency),
+			%(now)s, %(now)s, %(user)s, %(user)s, 0,
+			k.donation_date, k.organization, k.donated_to, k.currency,
+			SUM(k.total), COUNT(*), SUM(k.quantity)
+		FROM (
+			SELECT
+				DATE(IFNULL(d.donated_at, d.creation)) AS donation_date,
+				IFNULL(d.organization, '') AS organization,
+				IFNULL(d.donated_to, '') AS donated_to,
+				IFNULL(d.currency, '') AS currency,
+				IFNULL(d.total, 0) AS total,
+				IFNULL((
+					SELECT SUM(i.quantity) FROM `tabDonation Item` i
+					WHERE i.parent = d.name AND i.parenttype = 'Donation'
+				), 0) AS quantity
+			FROM `tabDonation` d
+		) k
+		GROUP BY k.donation_date, k.organization, k.donated_to, k.currency
+	""", {"now": now, "user": frappe.session.user})
+	return frappe.db.count("Donation Daily Rollup")
+
+
+def get_timeseries(organization=None, from_date=None, to_date=None, granularity="day", donated_to=None):
+	"""[{period, currency, total_amount, donation_count, item_quantity}] ordered by period"""
+	if granularity not in GRANULARITIES:
+		frappe.throw(_("Granularity must be one of: {0}").format(", ".join(GRANULARITIES)))
+
+	conditions = []
+	values = {}
+	if organization:
+		conditions.append("r.organization = %(organization)s")
+		values["organization"] = organization
+	if donated_to:
+		conditions.append("r.donated_to = %(donated_to)s")
+		values["donated_to"] = donated_to
+	if from_date:
+		conditions.append("r.donation_date >= %(from_date)s")
+		values["from_date"] = getdate(from_date)
+	if to_date:
+		conditions.append("r.donation_date < %(to_date)s")
+		values["to_date"] = add_days(getdate(to_date), 1)
+
+	period = GRANULARITIES[granularity]
+	where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+	return frappe.db.sql(f"""
+		SELECT
+			{period} AS period,
+			r.currency,
+			SUM(r.total_amount) AS total_amount,
+			SUM(r.donation_count) AS donation_count,
+			SUM(r.item_quantity) AS item_quantity
+		FROM `tabDonation Daily Rollup` r
+		{where}
+		GROUP BY period, r.currency
+		ORDER BY period, r.currency
+	""", values, as_dict=True)
+
+
+# -----------------------------
+# doc_events
+# -----------------------------
+def on_donation_update(doc, method=None):
+	deltas = {}
+	before = doc.get_doc_before_save()
+	if before:
+		add_to_deltas(deltas, before, before.items, sign=-1)
+	add_to_deltas(deltas, doc, doc.items)
+	apply_rollup_deltas(deltas)
+
+
+def on_donation_delete(doc, method=None):
+	apply_rollup_deltas(add_to_deltas({}, doc, doc.items, sign=-1))
@@ -0,0 +1,99 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import cint, flt
+
+from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import (
+	get_timeseries,
+	rebuild_donation_rollup,
+)
+
+
+class TestDonationDailyRollup(FrappeTestCase):
+	def setUp(self):
+		self.product = frappe.get_doc({
+			"doctype": "Product Details",
+			"product_name": f"Rollup Product {frappe.generate_hash(length=6)}",
+			"product_status": "Instock",
+			"product_price": 10,
+		}).insert(ignore_permissions=True)
+		self.organizations = [
+			frappe.get_doc({
+				"doctype": "Organization Details",
+				"organization_name": f"Rollup Org {frappe.generate_hash(length=6)}",
+				"status": "Active",
+			}).insert(ignore_permissions=True).name
+			for _ in range(2)
+		]
+
+	def make_donation(self, organization, donated_at, quantity):
+		return frappe.get_doc({
+			"doctype": "Donation",
+			"hash": f"ROLLUP-{frappe.generate_hash(length=10)}",
+			"donated_to": "Person",
+			"organization": organization,
+			"donated_at": donated_at,
+			"items": [{"product": self.product.name, "quantity": quantity}],
+		}).insert(ignore_permissions=True)
+
+	def get_rows(self):
+		# deltas leave emptied rows behind, a rebuild does not create them
+		rows = frappe.get_all(
+			"Donation Daily Rollup",
+			filters={"organization": ["in", self.organizations], "donation_count": ["!=", 0]},
+			fields=["name", "total_amount", "donation_count", "item_quantity"],
+		)
+		return {r.name: (flt(r.total_amount), cint(r.donation_count), cint(r.item_quantity)) for r in rows}
+
+	def assertMatchesRebuild(self):
+		incremental = self.get_rows()
+		rebuild_donation_rollup()
+		self.assertEqual(incremental, self.get_rows())
+
+	def get_periods(self, organization, granularity):
+		return [
+			(str(r.period), flt(r.total_amount), cint(r.donation_count), cint(r.item_quantity))
+			for r in get_timeseries(organization, granularity=granularity)
+			if r.donation_count
+		]
+
+	def test_incremental_rollup_matches_rebuild(self):
+		first, second = self.organizations
+		wednesday = self.make_donation(first, "2003-03-05 09:00:00", 2)
+		monday = self.make_donation(first, "2003-03-10 18:00:00", 1)
+		april = self.make_donation(first, "2003-04-02 12:00:00", 3)
+		self.assertMatchesRebuild()
+
+		self.assertEqual(self.get_periods(first, "day"), [
+			("2003-03-05", 20, 1, 2),
+			("2003-03-10", 10, 1, 1),
+			("2003-04-02", 30, 1, 3),
+		])
+		# weeks start on Monday, so 2 April falls in the week of 31 March
+		self.assertEqual(self.get_periods(first, "week"), [
+			("2003-03-03", 20, 1, 2),
+			("2003-03-10", 10, 1, 1),
+			("2003-03-31", 30, 1, 3),
+		])
+		self.assertEqual(self.get_periods(first, "month"), [
+			("2003-03-01", 30, 2, 3),
+			("2003-04-01", 30, 1, 3),
+		])
+
+		# amount change, then a move to another organization
+		wednesday.items[0].quantity = 4
+		wednesday.save(ignore_permissions=True)
+		monday.organization = second
+		monday.save(ignore_permissions=True)
+		self.assertMatchesRebuild()
+		self.assertEqual(self.get_periods(first, "month"), [
+			("2003-03-01", 40, 1, 4),
+			("2003-04-01", 30, 1, 3),
+		])
+		self.assertEqual(self.get_periods(second, "month"), [("2003-03-01", 10, 1, 1)])
+
+		april.delete(ignore_permissions=True)
+		self.assertMatchesRebuild()
+		self.assertEqual(self.get_periods(first, "month"), [("2003-03-01", 40, 1, 4)])
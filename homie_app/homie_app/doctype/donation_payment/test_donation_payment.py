@@ -1,9 +1,58 @@
 # Copyright (c) 2025, Anonymous and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from homie_app import api
+
 
 class TestDonationPayment(FrappeTestCase):
-	pass
+	def payment(self, hash, **values):
+		return {"hash": hash, "type": "deposit", "provider": "stripe", "number": "1", "amount": 25, **values}
+
+	def store(self, payment):
+		return frappe.get_doc({"doctype": "Donation Payment", **payment}).insert(ignore_permissions=True)
+
+	def test_ingest_reports_duplicates(self):
+		prefix = f"DPT-{frappe.generate_hash(length=8)}"
+		stored = self.store(self.payment(f"{prefix}-stored"))
+		raced = self.payment(f"{prefix}-raced")
+		payments = [
+			self.payment(f"{prefix}-new"),
+			# the same event again in this batch, differing only in case
+			self.payment(f"{prefix}-NEW", provider="Stripe"),
+			self.payment(f"{prefix}-stored"),
+			raced,
+			self.payment(f"{prefix}-invalid", amount=None),
+		]
+
+		# a concurrent request stores the raced payment between the lookup and the INSERT IGNORE
+		racing = []
+		find_existing_payments = api.find_existing_payments
+
+		def find_then_race(keys):
+			existing = find_existing_payments(keys)
+			if not racing:
+				racing.append(self.store(raced))
+			return existing
+
+		with (
+			patch.object(api, "_req", return_value={"payments": payments}),
+			patch.object(api, "find_existing_payments", side_effect=find_then_race),
+			# keep the rows in the test transaction
+			patch.object(frappe.db, "commit"),
+		):
+			response = api.ingest_donation_payments()
+
+		results = response["results"]
+		self.assertEqual(results[0]["status"], "created")
+		self.assertEqual(results[1], {"index": 1, "status": "duplicate", "duplicate_of_index": 0})
+		self.assertEqual(results[2], {"index": 2, "status": "duplicate", "name": stored.name})
+		self.assertEqual(results[3], {"index": 3, "status": "duplicate", "name": racing[0].name})
+		self.assertEqual(results[4]["status"], "error")
+		self.assertEqual((response["created"], response["duplicate"], response["error"]), (1, 3, 1))
+
+		self.assertEqual(frappe.db.count("Donation Payment", {"hash": ["like", f"{prefix}-%"]}), 3)
@@ -4,5 +4,8 @@
 # import frappe
 from frappe.model.document import Document
 
+from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import set_requirement_quantities
+
 class FoodDemands(Document):
-	pass
+	def validate(self):
+		set_requirement_quantities(self)
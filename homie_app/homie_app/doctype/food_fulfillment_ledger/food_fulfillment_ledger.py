@@ -0,0 +1,308 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import re
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import cint, flt, now_datetime
+
+# "25 kg", "25kgs", "1,5 t", "1.000 kg", "500g", "12 lbs", "15 pounds". The lookarounds keep a
+# number whole, so the regex cannot backtrack into "2" of "25kgs" when the unit does not fit; a
+# letter may precede it, as in "2x10kg".
+QUANTITY_RE = re.compile(
+	r"(?<![\d.,])(\d+(?:[.,]\d+)*)(?![\d]|[.,]\d)"
+	r"(?:\s*(kilo(?:gram(?:me)?)?s?|kgs?|grams?|g|tonnes?|tons?|t|pounds?|lbs?)(?![a-z]))?",
+	re.IGNORECASE,
+)
+KG_PER_UNIT = {"k": 1, "g": 0.001, "t": 1000, "l": 0.45359237, "p": 0.45359237}
+
+RECIPIENT_TYPES = ("Person Details", "Animal Shelters")
+LEDGER_MEASURES = ["demanded_dogs_kg", "demanded_cats_kg", "delivered_kg", "delivered_pallets", "demand_count", "delivery_count"]
+REPARSE_CHUNK_SIZE = 1000
+
+
+class FoodFulfillmentLedger(Document):
+	pass
+
+
+def on_doctype_update():
+	# one row per recipient, whatever its name
+	frappe.db.add_unique("Food Fulfillment Ledger", ["recipient_type", "recipient"], constraint_name="unique_recipient")
+	# get_shortfall ranks by shortfall, optionally for one recipient type
+	frappe.db.add_index("Food Fulfillment Ledger", ["shortfall_kg"])
+	frappe.db.add_index("Food Fulfillment Ledger", ["recipient_type", "shortfall_kg"])
+
+
+def parse_number(text):
+	"""
+	A number written with "." or "," as decimal or thousands separator:
+	"1,5" and "2.75" are decimals, "1.000", "12,500" and "1.234,5" use
+	thousands separators (a single separator followed by exactly three
+	digits is read as one, unless the number starts with 0).
+	"""
+	if "." in text and "," in text:
+		decimal = max(text.rfind("."), text.rfind(","))
+		return flt(re.sub(r"[.,]", "", text[:decimal]) + "." + text[decimal + 1:])
+
+	parts = re.split(r"[.,]", text)
+	if len(parts) > 2 or (len(parts) == 2 and len(parts[1]) == 3 and cint(parts[0]) > 0):
+		return flt("".join(parts))
+	return flt(".".join(parts))
+
+
+def parse_quantity_kg(text):
+	"""
+	Kilograms in a free-text food requirement, 0 when there is none. The
+	first number with a unit wins over bare counts ("10 bags of 15 kg" is
+	15 kg); without any unit the first number is taken as kg.
+	"""
+	matches = list(QUANTITY_RE.finditer(text or ""))
+	if not matches:
+		return 0.0
+	match = next((m for m in matches if m.group(2)), matches[0])
+	unit = (match.group(2) or "kg").lower()
+	return parse_number(match.group(1)) * KG_PER_UNIT[unit[0]]
+
+
+def set_requirement_quantities(demand):
+	"""Fill the parsed kg fields of a Food Demands document from its free-text requirements"""
+	demand.food_requirements_dogs_kg = parse_quantity_kg(demand.food_requirements_dogs)
+	demand.food_requirements_cats_kg = parse_quantity_kg(demand.food_requirements_cats)
+
+
+def get_demand_recipient(demand):
+	"""(recipient_type, recipient, recipient_name) of a food demand, None if it names nobody"""
+	if demand.get("order_by") == "Person" and demand.get("person_details"):
+		name = " ".join(p for p in (demand.get("first_name"), demand.get("last_name")) if p)
+		return "Person Details", demand.get("person_details"), name
+	if demand.get("order_by") == "Animal Shelters" and demand.get("contacted_animal_shelter"):
+		return "Animal Shelters", demand.get("contacted_animal_shelter"), demand.get("shelter_name") or ""
+	return None
+
+
+def get_delivery_recipient(delivery):
+	"""(recipient_type, recipient, recipient_name) a delivery went to, None if it names nobody"""
+	if delivery.get("deleiver_to") == "Person" and delivery.get("person_details"):
+		name = " ".join(p for p in (delivery.get("first_name"), delivery.get("last_name")) if p)
+		return "Person Details", delivery.get("person_details"), name
+	if delivery.get("deleiver_to") == "Animal Shelter" and delivery.get("shleter_details"):
+		return "Animal Shelters", delivery.get("shleter_details"), delivery.get("shleter_name") or ""
+	return None
+
+
+def get_ledger_name(recipient_type, recipient):
+	return f"{recipient_type}|{recipient}"
+
+
+def get_delta(deltas, recipient):
+	recipient_type, name, recipient_name = recipient
+	delta = deltas.setdefault((recipient_type, name), dict.fromkeys(LEDGER_MEASURES, 0))
+	delta["recipient_name"] = recipient_name
+	return delta
+
+
+def add_demand(deltas, demand, sign=1):
+	recipient = get_demand_recipient(demand)
+	if recipient:
+		delta = get_delta(deltas, recipient)
+		delta["demanded_dogs_kg"] += sign * flt(demand.get("food_requirements_dogs_kg"))
+		delta["demanded_cats_kg"] += sign * flt(demand.get("food_requirements_cats_kg"))
+		delta["demand_count"] += sign
+	return deltas
+
+
+def add_delivery(deltas, delivery, sign=1):
+	recipient = get_delivery_recipient(delivery)
+	if recipient:
+		delta = get_delta(deltas, recipient)
+		delta["delivered_kg"] += sign * flt(delivery.get("no_of_kilogram"))
+		delta["delivered_pallets"] += sign * cint(delivery.get("no_of_pallets"))
+		delta["delivery_count"] += sign
+	return deltas
+
+
+def apply_ledger_deltas(deltas):
+	"""
+	Upsert deltas into the ledger with one multi-row statement. The row name
+	is `recipient_type|recipient` (on_recipient_rename keeps it in step with
+	renames), so the primary key doubles as the unique key; totals and the
+	shortfall are recomputed from the updated columns.
+	"""
+	deltas = {k: v for k, v in deltas.items() if any(v[m] for m in LEDGER_MEASURES)}
+	if not deltas:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	rows = []
+	values = []
+	for (recipient_type, recipient), delta in deltas.items():
+		demanded = delta["demanded_dogs_kg"] + delta["demanded_cats_kg"]
+		rows.append("(%s, %s, %s, %s, %s, 0, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
+		values += [
+			get_ledger_name(recipient_type, recipient), now, now, user, user,
+			recipient_type, recipient, delta["recipient_name"],
+			*(delta[m] for m in LEDGER_MEASURES),
+			demanded, demanded - delta["delivered_kg"],
+		]
+
+	# assignments run left to right, so the totals see the updated measures
+	frappe.db.sql(f"""
+		INSERT INTO `tabFood Fulfillment Ledger`
+			(name, creation, modified, owner, modified_by, docstatus,
+			recipient_type, recipient, recipient_name,
+			demanded_dogs_kg, demanded_cats_kg, delivered_kg, delivered_pallets, demand_count, delivery_count,
+			demanded_kg, shortfall_kg)
+		VALUES {", ".join(rows)}
+		ON DUPLICATE KEY UPDATE
+			recipient_name = IF(VALUES(recipient_name) != '', VALUES(recipient_name), recipient_name),
+			demanded_dogs_kg = demanded_dogs_kg + VALUES(demanded_dogs_kg),
+			demanded_cats_kg = demanded_cats_kg + VALUES(demanded_cats_kg),
+			delivered_kg = delivered_kg + VALUES(delivered_kg),
+			delivered_pallets = delivered_pallets + VALUES(delivered_pallets),
+			demand_count = demand_count + VALUES(demand_count),
+			delivery_count = delivery_count + VALUES(delivery_count),
+			demanded_kg = demanded_dogs_kg + demanded_cats_kg,
+			shortfall_kg = demanded_kg - delivered_kg,
+			modified = VALUES(modified)
+	""", values)
+
+
+def reparse_requirement_quantities():
+	"""Re-derive the parsed kg fields of every Food Demand; returns the number of rows changed"""
+	changed = 0
+	after = ""
+	while True:
+		rows = frappe.db.sql("""
+			SELECT name, food_requirements_dogs, food_requirements_cats,
+				food_requirements_dogs_kg, food_requirements_cats_kg
+			FROM `tabFood Demands`
+			WHERE name > %(after)s
+			ORDER BY name
+			LIMIT %(limit)s
+		""", {"after": after, "limit": REPARSE_CHUNK_SIZE}, as_dict=True)
+		if not rows:
+			return changed
+
+		for row in rows:
+			dogs = parse_quantity_kg(row.food_requirements_dogs)
+			cats = parse_quantity_kg(row.food_requirements_cats)
+			if (dogs, cats) != (flt(row.food_requirements_dogs_kg), flt(row.food_requirements_cats_kg)):
+				frappe.db.set_value("Food Demands", row.name, {
+					"food_requirements_dogs_kg": dogs,
+					"food_requirements_cats_kg": cats,
+				}, update_modified=False)
+				changed += 1
+		after = rows[-1].name
+
+
+def rebuild_food_fulfillment_ledger():
+	"""Recompute the whole ledger from Food Demands and Deleivery Informations; returns the number of rows"""
+	frappe.db.sql("DELETE FROM `tabFood Fulfillment Ledger`")
+	now = now_datetime()
+	frappe.db.sql("""
+		INSERT INTO `tabFood Fulfillment Ledger`
+			(name, creation, modified, owner, modified_by, docstatus,
+			recipient_type, recipient, recipient_name,
+			demanded_dogs_kg, demanded_cats_kg, delivered_kg, delivered_pallets, demand_count, delivery_count,
+			demanded_kg, shortfall_kg)
+		SELECT
+			CONCAT(k.recipient_type, '|', k.recipient),
+			%(now)s, %(now)s, %(user)s, %(user)s, 0,
+			k.recipient_type, k.recipient, MAX(k.recipient_name),
+			SUM(k.dogs), SUM(k.cats), SUM(k.kg), SUM(k.pallets), SUM(k.demands), SUM(k.deliveries),
+			SUM(k.dogs + k.cats), SUM(k.dogs + k.cats) - SUM(k.kg)
+		FROM (
+			SELECT
+				IF(d.order_by = 'Person', 'Person Details', 'Animal Shelters') AS recipient_type,
+				IF(d.order_by = 'Person', d.person_details, d.contacted_animal_shelter) AS recipient,
+				IF(d.order_by = 'Person', TRIM(CONCAT_WS(' ', d.first_name, d.last_name)), IFNULL(d.shelter_name, '')) AS recipient_name,
+				IFNULL(d.food_requirements_dogs_kg, 0) AS dogs,
+				IFNULL(d.food_requirements_cats_kg, 0) AS cats,
+				0 AS kg, 0 AS pallets, 1 AS demands, 0 AS deliveries
+			FROM `tabFood Demands` d
+			WHERE (d.order_by = 'Person' AND IFNULL(d.person_details, '') != '')
+				OR (d.order_by = 'Animal Shelters' AND IFNULL(d.contacted_animal_shelter, '') != '')
+			UNION ALL
+			SELECT
+				IF(v.deleiver_to = 'Person', 'Person Details', 'Animal Shelters'),
+				IF(v.deleiver_to = 'Person', v.person_details, v.shleter_details),
+				IF(v.deleiver_to = 'Person', TRIM(CONCAT_WS(' ', v.first_name, v.last_name)), IFNULL(v.shleter_name, '')),
+				0, 0,
+				IFNULL(v.no_of_kilogram, 0), IFNULL(v.no_of_pallets, 0), 0, 1
+			FROM `tabDeleivery Informations` v
+			WHERE (v.deleiver_to = 'Person' AND IFNULL(v.person_details, '') != '')
+				OR (v.deleiver_to = 'Animal Shelter' AND IFNULL(v.shleter_details, '') != '')
+		) k
+		GROUP BY k.recipient_type, k.recipient
+	""", {"now": now, "user": frappe.session.user})
+	return frappe.db.count("Food Fulfillment Ledger")
+
+
+def get_shortfall(recipient_type=None, limit=20):
+	"""Recipients with outstanding demand, largest shortfall first, read through the shortfall index"""
+	if recipient_type and recipient_type not in RECIPIENT_TYPES:
+		frappe.throw(_("Recipient type must be one of: {0}").format(", ".join(RECIPIENT_TYPES)))
+
+	condition = "AND recipient_type = %(recipient_type)s" if recipient_type else ""
+	return frappe.db.sql(f"""
+		SELECT recipient_type, recipient, recipient_name, demanded_kg, delivered_kg, shortfall_kg,
+			demanded_dogs_kg, demanded_cats_kg, delivered_pallets, demand_count, delivery_count
+		FROM `tabFood Fulfillment Ledger`
+		WHERE shortfall_kg > 0 {condition}
+		ORDER BY shortfall_kg DESC
+		LIMIT %(limit)s
+	""", {"recipient_type": recipient_type, "limit": limit}, as_dict=True)
+
+
+# -----------------------------
+# doc_events
+# -----------------------------
+def on_demand_update(doc, method=None):
+	deltas = {}
+	before = doc.get_doc_before_save()
+	if before:
+		add_demand(deltas, before, sign=-1)
+	apply_ledger_deltas(add_demand(deltas, doc))
+
+
+def on_demand_delete(doc, method=None):
+	apply_ledger_deltas(add_demand({}, doc, sign=-1))
+
+
+def on_delivery_update(doc, method=None):
+	deltas = {}
+	before = doc.get_doc_before_save()
+	if before:
+		add_delivery(deltas, before, sign=-1)
+	apply_ledger_deltas(add_delivery(deltas, doc))
+
+
+def on_delivery_delete(doc, method=None):
+	apply_ledger_deltas(add_delivery({}, doc, sign=-1))
+
+
+def on_recipient_trash(doc, method=None):
+	"""Person Details / Animal Shelters: drop the recipient's row (the ledger is in ignore_links_on_delete)"""
+	frappe.db.delete("Food Fulfillment Ledger", {"recipient_type": doc.doctype, "recipient": doc.name})
+
+
+def on_recipient_rename(doc, method=None, old=None, new=None, merge=False):
+	"""
+	Person Details / Animal Shelters before_rename: move the recipient's row
+	to its new name, adding it to the target's row on a merge. Runs before
+	frappe renames the Dynamic Link, which would otherwise collide with the
+	target's row on the unique (recipient_type, recipient) key.
+	"""
+	name = get_ledger_name(doc.doctype, old)
+	row = frappe.db.get_value("Food Fulfillment Ledger", name, ["recipient_name", *LEDGER_MEASURES], as_dict=True)
+	if not row:
+		return
+
+	if merge:
+		# the target keeps its own name
+		row.recipient_name = ""
+	frappe.db.delete("Food Fulfillment Ledger", name)
+	apply_ledger_deltas({(doc.doctype, new): row})
@@ -0,0 +1,89 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import parse_quantity_kg
+
+
+class TestParseQuantity(FrappeTestCase):
+	def test_parse_quantity_kg(self):
+		cases = {
+			"25 kg": 25,
+			"25kgs": 25,
+			"3 kilograms": 3,
+			"2 x 20kg": 20,
+			"2x10kg": 10,
+			"2×10kg": 10,
+			"10 bags of 15 kg": 15,
+			"15 pounds": 15 * 0.45359237,
+			"12 lbs": 12 * 0.45359237,
+			"500g": 0.5,
+			"1,5 t": 1500,
+			"5 tonnes": 5000,
+			"2.5 kg": 2.5,
+			"0.250 kg": 0.25,
+			"1.000 kg": 1000,
+			"12,500 kg": 12500,
+			"1.234,5 kg": 1234.5,
+			"10": 10,
+			"about 3 bags": 3,
+			"": 0,
+			None: 0,
+			"as much as possible": 0,
+		}
+		for text, kg in cases.items():
+			with self.subTest(text=text):
+				self.assertAlmostEqual(parse_quantity_kg(text), kg)
+
+
+class TestFoodFulfillmentLedger(FrappeTestCase):
+	def make_shelter(self):
+		return frappe.get_doc({
+			"doctype": "Animal Shelters",
+			"shelter_name": f"Ledger Shelter {frappe.generate_hash(length=6)}",
+		}).insert(ignore_permissions=True)
+
+	def make_demand(self, shelter, requirement):
+		return frappe.get_doc({
+			"doctype": "Food Demands",
+			"order_by": "Animal Shelters",
+			"contacted_animal_shelter": shelter.name,
+			"shelter_name": shelter.shelter_name,
+			"food_requirements_dogs": requirement,
+		}).insert(ignore_permissions=True)
+
+	def get_row(self, shelter_name):
+		return frappe.db.get_value(
+			"Food Fulfillment Ledger",
+			{"recipient_type": "Animal Shelters", "recipient": shelter_name},
+			["name", "demanded_kg", "demand_count"],
+			as_dict=True,
+		)
+
+	def test_deleting_a_recipient_removes_its_row(self):
+		shelter = self.make_shelter()
+		demand = self.make_demand(shelter, "20 kg")
+		self.assertEqual(self.get_row(shelter.name).demanded_kg, 20)
+
+		demand.delete(ignore_permissions=True)
+		self.assertEqual(self.get_row(shelter.name).demand_count, 0)
+
+		# the zeroed ledger row must not block the delete
+		frappe.delete_doc("Animal Shelters", shelter.name, ignore_permissions=True)
+		self.assertIsNone(self.get_row(shelter.name))
+
+	def test_rename_keeps_one_row(self):
+		shelter = self.make_shelter()
+		self.make_demand(shelter, "20 kg")
+		new_name = f"SHR-RENAMED-{frappe.generate_hash(length=6)}"
+
+		frappe.rename_doc("Animal Shelters", shelter.name, new_name, force=True)
+		self.assertIsNone(self.get_row(shelter.name))
+		row = self.get_row(new_name)
+		self.assertEqual(row.name, f"Animal Shelters|{new_name}")
+
+		self.make_demand(frappe.get_doc("Animal Shelters", new_name), "5 kg")
+		row = self.get_row(new_name)
+		self.assertEqual((row.demanded_kg, row.demand_count), (25, 2))
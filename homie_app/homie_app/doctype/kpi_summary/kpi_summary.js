@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Anonymous and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('KPI Summary', {
+	// refresh: function(frm) {
+
+	// }
+});
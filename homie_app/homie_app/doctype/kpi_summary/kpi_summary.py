@@ -0,0 +1,92 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now_datetime
+
+KPI_SUMMARY_NAME = "Global"
+KPI_FIELDS = ["total_donations", "total_amount", "total_products", "out_of_stock", "active_organizations"]
+
+
+class KPISummary(Document):
+	pass
+
+
+def get_kpis():
+	"""Workspace KPIs from the single summary row, rebuilt if it does not exist yet"""
+	kpis = frappe.db.get_value("KPI Summary", KPI_SUMMARY_NAME, KPI_FIELDS, as_dict=True)
+	return kpis or rebuild_kpi_summary()
+
+
+def rebuild_kpi_summary():
+	"""Recompute every KPI from the source tables and store it"""
+	values = {
+		"total_donations": frappe.db.count("Donation"),
+		"total_amount": frappe.db.sql("""SELECT SUM(total) FROM `tabDonation`""")[0][0] or 0,
+		"total_products": frappe.db.count("Product Details"),
+		"out_of_stock": frappe.db.count("Product Details", {"product_status": "Out of stock"}),
+		"active_organizations": frappe.db.count("Organization Details", {"status": "Active"}),
+	}
+
+	if frappe.db.exists("KPI Summary", KPI_SUMMARY_NAME):
+		frappe.db.set_value("KPI Summary", KPI_SUMMARY_NAME, {**values, "last_rebuilt_on": now_datetime()})
+	else:
+		doc = frappe.get_doc({"doctype": "KPI Summary", "last_rebuilt_on": now_datetime(), **values})
+		doc.insert(ignore_permissions=True, set_name=KPI_SUMMARY_NAME)
+
+	return frappe._dict(values)
+
+
+def apply_kpi_delta(**deltas):
+	"""
+	Atomically add deltas to the summary row. If the row does not exist yet
+	nothing is done; it is built from scratch on the next read.
+	"""
+	deltas = {k: v for k, v in deltas.items() if v}
+	if not deltas:
+		return
+
+	set_clause = ", ".join(f"`{k}` = IFNULL(`{k}`, 0) + %({k})s" for k in deltas)
+	frappe.db.sql(
+		f"""UPDATE `tabKPI Summary` SET {set_clause} WHERE name = %(name)s""",
+		{**deltas, "name": KPI_SUMMARY_NAME},
+	)
+
+
+# -----------------------------
+# doc_events
+# -----------------------------
+def on_donation_update(doc, method=None):
+	before = doc.get_doc_before_save()
+	if before is None:
+		apply_kpi_delta(total_donations=1, total_amount=flt(doc.total))
+	else:
+		apply_kpi_delta(total_amount=flt(doc.total) - flt(before.total))
+
+
+def on_donation_delete(doc, method=None):
+	apply_kpi_delta(total_donations=-1, total_amount=-flt(doc.total))
+
+
+def on_product_update(doc, method=None):
+	before = doc.get_doc_before_save()
+	was_out_of_stock = before is not None and before.product_status == "Out of stock"
+	apply_kpi_delta(
+		total_products=0 if before else 1,
+		out_of_stock=int(doc.product_status == "Out of stock") - int(was_out_of_stock),
+	)
+
+
+def on_product_delete(doc, method=None):
+	apply_kpi_delta(total_products=-1, out_of_stock=-int(doc.product_status == "Out of stock"))
+
+
+def on_organization_update(doc, method=None):
+	before = doc.get_doc_before_save()
+	was_active = before is not None and before.status == "Active"
+	apply_kpi_delta(active_organizations=int(doc.status == "Active") - int(was_active))
+
+
+def on_organization_delete(doc, method=None):
+	apply_kpi_delta(active_organizations=-int(doc.status == "Active"))
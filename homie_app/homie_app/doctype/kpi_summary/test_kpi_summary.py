@@ -0,0 +1,75 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt
+
+from homie_app.homie_app.doctype.kpi_summary.kpi_summary import (
+	KPI_FIELDS,
+	KPI_SUMMARY_NAME,
+	rebuild_kpi_summary,
+)
+
+
+def get_stored_kpis():
+	kpis = frappe.db.get_value("KPI Summary", KPI_SUMMARY_NAME, KPI_FIELDS, as_dict=True)
+	return {field: flt(kpis[field]) for field in KPI_FIELDS}
+
+
+class TestKPISummary(FrappeTestCase):
+	def assertMatchesRebuild(self):
+		incremental = get_stored_kpis()
+		rebuild_kpi_summary()
+		self.assertEqual(incremental, get_stored_kpis())
+
+	def test_incremental_kpis_match_rebuild(self):
+		rebuild_kpi_summary()
+		before = get_stored_kpis()
+
+		product = frappe.get_doc({
+			"doctype": "Product Details",
+			"product_name": f"KPI Product {frappe.generate_hash(length=6)}",
+			"product_status": "Instock",
+			"product_price": 12,
+		}).insert(ignore_permissions=True)
+		organization = frappe.get_doc({
+			"doctype": "Organization Details",
+			"organization_name": f"KPI Org {frappe.generate_hash(length=6)}",
+			"status": "Active",
+		}).insert(ignore_permissions=True)
+		donation = frappe.get_doc({
+			"doctype": "Donation",
+			"hash": f"KPI-{frappe.generate_hash(length=10)}",
+			"donated_to": "Person",
+			"organization": organization.name,
+			"items": [{"product": product.name, "quantity": 2}],
+		}).insert(ignore_permissions=True)
+
+		created = get_stored_kpis()
+		self.assertEqual(created["total_products"] - before["total_products"], 1)
+		self.assertEqual(created["active_organizations"] - before["active_organizations"], 1)
+		self.assertEqual(created["total_donations"] - before["total_donations"], 1)
+		self.assertEqual(created["total_amount"] - before["total_amount"], 24)
+		self.assertMatchesRebuild()
+
+		# updates go through get_doc_before_save
+		product.product_status = "Out of stock"
+		product.save(ignore_permissions=True)
+		organization.status = "Inactive"
+		organization.save(ignore_permissions=True)
+		donation.items[0].quantity = 5
+		donation.save(ignore_permissions=True)
+
+		updated = get_stored_kpis()
+		self.assertEqual(updated["out_of_stock"] - before["out_of_stock"], 1)
+		self.assertEqual(updated["active_organizations"], before["active_organizations"])
+		self.assertEqual(updated["total_amount"] - before["total_amount"], 60)
+		self.assertMatchesRebuild()
+
+		donation.delete(ignore_permissions=True)
+		product.delete(ignore_permissions=True)
+		organization.delete(ignore_permissions=True)
+
+		self.assertEqual(get_stored_kpis(), before)
+		self.assertMatchesRebuild()
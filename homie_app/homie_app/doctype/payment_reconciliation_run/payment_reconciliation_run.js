@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Anonymous and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Payment Reconciliation Run', {
+	// refresh: function(frm) {
+
+	// }
+});
@@ -0,0 +1,160 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_to_date, cint, now_datetime
+
+RECONCILIATION_BATCH_SIZE = 5000
+STALE_AFTER_MINUTES = 15
+ACTIVE_STATUSES = ("Queued", "Running")
+UNLINKED = "IFNULL(p.donation, '') = ''"
+
+
+class PaymentReconciliationRun(Document):
+	pass
+
+
+def start_reconciliation(time_window_minutes=None):
+	run = frappe.get_doc({
+		"doctype": "Payment Reconciliation Run",
+		"time_window_minutes": cint(time_window_minutes) or 60,
+	}).insert(ignore_permissions=True)
+	enqueue_reconciliation(run.name)
+	return run
+
+
+def enqueue_reconciliation(run_name):
+	frappe.enqueue(
+		"homie_app.homie_app.doctype.payment_reconciliation_run.payment_reconciliation_run.run_reconciliation",
+		queue="long",
+		timeout=6 * 3600,
+		job_id=f"payment_reconciliation::{run_name}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		run_name=run_name,
+	)
+
+
+def run_reconciliation(run_name):
+	"""
+	Link unlinked Donation Payments to Donations, one batch of payment names
+	at a time. Each batch is matched by hash with a single UPDATE ... JOIN,
+	then whatever is left by amount and time window, and committed together
+	with the checkpoint so an interrupted run resumes where it stopped.
+	"""
+	run = frappe.get_doc("Payment Reconciliation Run", run_name)
+	if run.status not in ACTIVE_STATUSES:
+		return
+
+	if run.status == "Queued":
+		run.db_set({"status": "Running", "started_on": now_datetime()})
+		frappe.db.commit()
+
+	try:
+		while True:
+			batch = frappe.db.sql(f"""
+				SELECT p.name FROM `tabDonation Payment` p
+				WHERE p.name > %(after)s AND {UNLINKED}
+				ORDER BY p.name
+				LIMIT %(limit)s
+			""", {"after": run.last_payment_name or "", "limit": RECONCILIATION_BATCH_SIZE}, pluck=True)
+			if not batch:
+				break
+
+			bounds = {"after": run.last_payment_name or "", "upto": batch[-1]}
+			by_hash = match_by_hash(bounds)
+			by_amount, ambiguous = match_by_amount(bounds, cint(run.time_window_minutes))
+
+			run.db_set({
+				"last_payment_name": batch[-1],
+				"scanned": cint(run.scanned) + len(batch),
+				"matched_by_hash": cint(run.matched_by_hash) + by_hash,
+				"matched_by_amount": cint(run.matched_by_amount) + by_amount,
+				"ambiguous": cint(run.ambiguous) + ambiguous,
+			})
+			frappe.db.commit()
+
+		unmatched = frappe.db.sql(f"SELECT COUNT(*) FROM `tabDonation Payment` p WHERE {UNLINKED}")[0][0]
+		run.db_set({"status": "Completed", "unmatched": unmatched, "finished_on": now_datetime()})
+		frappe.db.commit()
+	except Exception:
+		frappe.db.rollback()
+		run.reload()
+		run.db_set({"status": "Failed", "error": frappe.get_traceback()})
+		frappe.db.commit()
+		raise
+
+
+def match_by_hash(bounds):
+	"""Link every unlinked payment in (after, upto] whose hash is a donation's hash"""
+	frappe.db.sql(f"""
+		UPDATE `tabDonation Payment` p
+		JOIN `tabDonation` d ON d.hash = p.hash
+		SET p.donation = d.name, p.match_method = 'Hash'
+		WHERE p.name > %(after)s AND p.name <= %(upto)s
+			AND {UNLINKED} AND IFNULL(p.hash, '') != ''
+	""", bounds)
+	return frappe.db._cursor.rowcount
+
+
+def match_by_amount(bounds, window_minutes):
+	"""
+	Link remaining payments in (after, upto] to the only donation of the same
+	amount made within the time window that has no payment yet. Payments with
+	several candidates, or competing for the same donation, are left alone.
+	Returns (matched, ambiguous).
+	"""
+	candidates = frappe.db.sql(f"""
+		SELECT p.name AS payment, MIN(d.name) AS donation, COUNT(*) AS candidates
+		FROM `tabDonation Payment` p
+		JOIN `tabDonation` d
+			ON d.total = p.amount
+			AND d.donated_at BETWEEN p.payment_at - INTERVAL %(window)s MINUTE
+				AND p.payment_at + INTERVAL %(window)s MINUTE
+		WHERE p.name > %(after)s AND p.name <= %(upto)s
+			AND {UNLINKED} AND p.payment_at IS NOT NULL
+			AND NOT EXISTS (SELECT 1 FROM `tabDonation Payment` x WHERE x.donation = d.name)
+		GROUP BY p.name
+	""", {**bounds, "window": window_minutes}, as_dict=True)
+
+	claims = {}
+	for row in candidates:
+		if row.candidates == 1:
+			claims.setdefault(row.donation, []).append(row.payment)
+
+	matches = {payments[0]: donation for donation, payments in claims.items() if len(payments) == 1}
+	ambiguous = len(candidates) - len(matches)
+	if not matches:
+		return 0, ambiguous
+
+	values = {}
+	cases = []
+	for i, (payment, donation) in enumerate(matches.items()):
+		values[f"p{i}"] = payment
+		values[f"d{i}"] = donation
+		cases.append(f"WHEN %(p{i})s THEN %(d{i})s")
+
+	frappe.db.sql(f"""
+		UPDATE `tabDonation Payment`
+		SET donation = CASE name {" ".join(cases)} END, match_method = 'Amount and Time'
+		WHERE name IN ({", ".join(f"%(p{i})s" for i in range(len(matches)))})
+	""", values)
+	return len(matches), ambiguous
+
+
+def resume_stale_reconciliations():
+	"""Scheduled: re-enqueue runs whose worker went away"""
+	stale_before = add_to_date(now_datetime(), minutes=-STALE_AFTER_MINUTES)
+	for name in frappe.get_all(
+		"Payment Reconciliation Run",
+		filters={"status": ["in", ACTIVE_STATUSES], "modified": ["<", stale_before]},
+		pluck="name",
+	):
+		enqueue_reconciliation(name)
+
+
+def schedule_reconciliation():
+	"""Scheduled: start a daily run unless one is already in progress"""
+	if not frappe.db.exists("Payment Reconciliation Run", {"status": ["in", ACTIVE_STATUSES]}):
+		start_reconciliation()
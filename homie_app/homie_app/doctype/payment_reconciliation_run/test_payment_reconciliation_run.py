@@ -0,0 +1,123 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import random
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, get_datetime
+
+from homie_app.homie_app.doctype.payment_reconciliation_run import payment_reconciliation_run
+from homie_app.homie_app.doctype.payment_reconciliation_run.payment_reconciliation_run import (
+	match_by_amount,
+	match_by_hash,
+	run_reconciliation,
+)
+
+DONATED_AT = get_datetime("2001-02-03 10:00:00")
+
+
+class TestPaymentReconciliationRun(FrappeTestCase):
+	def setUp(self):
+		# payment names sort together, so (after, upto] holds only this test's payments
+		self.prefix = f"PRT-{frappe.generate_hash(length=8)}"
+		self.bounds = {"after": f"{self.prefix}-00", "upto": f"{self.prefix}-99"}
+
+	def make_donation(self, total=0, donated_at=DONATED_AT):
+		donation = frappe.get_doc({
+			"doctype": "Donation",
+			"hash": f"PRT-{frappe.generate_hash(length=10)}",
+			"donated_to": "Person",
+		}).insert(ignore_permissions=True)
+		# the total is otherwise computed from the items
+		frappe.db.set_value("Donation", donation.name, {"total": total, "donated_at": donated_at})
+		return donation
+
+	def make_payment(self, i, amount, hash=None, payment_at=DONATED_AT, donation=None):
+		return frappe.get_doc({
+			"doctype": "Donation Payment",
+			"hash": hash or f"PRT-{frappe.generate_hash(length=10)}",
+			"type": "deposit",
+			"provider": "stripe",
+			"number": "1",
+			"amount": amount,
+			"payment_at": payment_at,
+			"donation": donation,
+		}).insert(ignore_permissions=True, set_name=f"{self.prefix}-{i:02d}")
+
+	def get_link(self, payment):
+		link = frappe.db.get_value("Donation Payment", payment.name, ["donation", "match_method"], as_dict=True)
+		return (link.donation, link.match_method) if link.donation else None
+
+	def unique_amount(self):
+		# no other donation of the test site has the same total
+		return random.randint(10**6, 10**7)
+
+	def test_match_by_hash(self):
+		donation = self.make_donation()
+		matching = self.make_payment(1, 10, hash=donation.hash)
+		other = self.make_payment(2, 10)
+
+		self.assertEqual(match_by_hash(self.bounds), 1)
+		self.assertEqual(self.get_link(matching), (donation.name, "Hash"))
+		self.assertIsNone(self.get_link(other))
+
+	def test_match_by_amount(self):
+		later = add_to_date(DONATED_AT, minutes=20)
+
+		# the only donation of its amount within the window
+		amount = self.unique_amount()
+		unique = self.make_donation(amount)
+		matched = self.make_payment(1, amount, payment_at=later)
+
+		# two donations of the same amount: ambiguous
+		amount = self.unique_amount()
+		self.make_donation(amount)
+		self.make_donation(amount)
+		several = self.make_payment(2, amount)
+
+		# two payments competing for one donation: both ambiguous
+		amount = self.unique_amount()
+		self.make_donation(amount)
+		competing = [self.make_payment(3, amount), self.make_payment(4, amount)]
+
+		# the donation already has a payment: no candidate at all
+		amount = self.unique_amount()
+		claimed = self.make_donation(amount)
+		self.make_payment(5, amount, donation=claimed.name)
+		unclaimed = self.make_payment(6, amount)
+
+		# outside the window
+		amount = self.unique_amount()
+		self.make_donation(amount)
+		too_late = self.make_payment(7, amount, payment_at=add_to_date(DONATED_AT, minutes=90))
+
+		self.assertEqual(match_by_amount(self.bounds, 60), (1, 3))
+		self.assertEqual(self.get_link(matched), (unique.name, "Amount and Time"))
+		for payment in (several, *competing, unclaimed, too_late):
+			with self.subTest(payment=payment.name):
+				self.assertIsNone(self.get_link(payment))
+
+	def test_run_resumes_after_checkpoint(self):
+		donations = [self.make_donation() for _ in range(3)]
+		payments = [self.make_payment(i + 1, 10, hash=d.hash) for i, d in enumerate(donations)]
+		run = frappe.get_doc({
+			"doctype": "Payment Reconciliation Run",
+			"status": "Running",
+			"time_window_minutes": 60,
+			# the first payment was handled before the worker went away
+			"last_payment_name": payments[0].name,
+		}).insert(ignore_permissions=True)
+
+		# the run commits after each batch; keep the test data in this transaction
+		with patch.object(payment_reconciliation_run, "RECONCILIATION_BATCH_SIZE", 1), patch.object(frappe.db, "commit"):
+			run_reconciliation(run.name)
+
+		run.reload()
+		self.assertEqual(run.status, "Completed")
+		self.assertIsNone(self.get_link(payments[0]))
+		for payment, donation in zip(payments[1:], donations[1:]):
+			self.assertEqual(self.get_link(payment), (donation.name, "Hash"))
+		self.assertGreaterEqual(run.matched_by_hash, 2)
+		self.assertGreaterEqual(run.scanned, 2)
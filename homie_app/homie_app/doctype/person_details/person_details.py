@@ -4,6 +4,15 @@
 import frappe
 from frappe.model.document import Document
 
+from homie_app.homie_app.doctype.person_search_index.person_search_index import (
+    SEARCH_FIELDS,
+    remove_person_index,
+    update_person_index,
+)
+
+PERSON_EMAIL_CACHE_KEY = "homie_person_by_email"
+PERSON_FIRST_NAME_CACHE_KEY = "homie_person_by_first_name"
+
 
 class PersonDetails(Document):
     def validate(self):
@@ -13,5 +22,93 @@ class PersonDetails(Document):
         parts = [self.first_name, self.last_name]
         self.full_name = " ".join(p for p in parts if p)
 
+    def on_update(self):
+        # also runs on insert, where a new person can make a cached first name ambiguous
+        before = self.get_doc_before_save()
+        clear_person_lookup_cache(self.email, self.first_name)
+        if before:
+            clear_person_lookup_cache(before.email, before.first_name)
+
+        if not before or any(before.get(f) != self.get(f) for f in SEARCH_FIELDS):
+            update_person_index(self)
+
+    def on_trash(self):
+        clear_person_lookup_cache(self.email, self.first_name)
+        # before the link check in delete_doc
+        remove_person_index(self.name)
+
+    def after_rename(self, old, new, merge=False):
+        clear_person_lookup_cache(self.email, self.first_name)
+
+
+def _key(value):
+    # lookups go through a case-insensitive collation
+    return (value or "").strip().lower()
+
+
+def resolve_person(name=None, email=None, first_name=None):
+    """
+    Resolve a Person Details name from its name, email or first name, in that
+    order of preference. Email and first name lookups that found someone are
+    served from redis; misses are not cached, so unknown values cannot grow
+    the hashes. Throws if nothing matches or the first name is shared by
+    more than one person.
+    """
+    if name:
+        if not frappe.db.exists("Person Details", name):
+            frappe.throw(f"No person found with name '{name}'.")
+        return name
+
+    cache = frappe.cache()
+
+    if email:
+        person_name = cache.hget(PERSON_EMAIL_CACHE_KEY, _key(email))
+        if not person_name:
+            person_name = frappe.db.get_value("Person Details", {"email": email}, "name")
+            if person_name:
+                cache.hset(PERSON_EMAIL_CACHE_KEY, _key(email), person_name)
+
+        if not person_name:
+            frappe.throw(f"No person found with email '{email}'.")
+        return person_name
+
+    matches = cache.hget(PERSON_FIRST_NAME_CACHE_KEY, _key(first_name))
+    if not matches:
+        # two rows are enough to tell unique from ambiguous
+        matches = frappe.get_all(
+            "Person Details",
+            filters={"first_name": first_name},
+            pluck="name",
+            limit_page_length=2
+        )
+        if matches:
+            cache.hset(PERSON_FIRST_NAME_CACHE_KEY, _key(first_name), matches)
+
+    if not matches:
+        frappe.throw(f"No person found with first name '{first_name}'.")
+
+    if len(matches) > 1:
+        frappe.throw(
+            f"Multiple persons found with first name '{first_name}'. "
+            "Please use email or name instead."
+        )
+
+    return matches[0]
+
+
+def clear_person_lookup_cache(email=None, first_name=None):
+    """
+    Drop the cached lookups now and again once the transaction commits: a
+    concurrent resolve_person still sees the old row until then and may
+    re-cache the stale mapping.
+    """
+    _clear_person_lookup_cache(email, first_name)
+    frappe.db.after_commit.add(lambda: _clear_person_lookup_cache(email, first_name))
 
 
+def _clear_person_lookup_cache(email=None, first_name=None):
+    cache = frappe.cache()
+    if email:
+        cache.hdel(PERSON_EMAIL_CACHE_KEY, _key(email))
+    if first_name:
+        cache.hdel(PERSON_FIRST_NAME_CACHE_KEY, _key(first_name))
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Anonymous and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Person Search Index', {
+	// refresh: function(frm) {
+
+	// }
+});
@@ -0,0 +1,171 @@
+# Copyright (c) 2026, Anonymous and contributors
+# For license information, please see license.txt
+
+import re
+
+import frappe
+from frappe.model.document import Document
+
+# Person Details field -> weight of a prefix match on one of its tokens.
+# An exact token match scores one more.
+SEARCH_FIELDS = {
+	"full_name": 4,
+	"email": 3,
+	"contact_no": 3,
+	"person_city": 1,
+}
+# shorter prefixes match too large a share of the index to group quickly
+MIN_TERM_LENGTH = 3
+# persons scored per search; the most selective term picks them
+MAX_CANDIDATES = 1000
+MAX_TOKEN_LENGTH = 140
+REBUILD_CHUNK_SIZE = 5000
+INDEX_FIELDS = ["name", "token", "person", "source_field", "weight", "owner", "modified_by", "creation", "modified"]
+
+
+class PersonSearchIndex(Document):
+	pass
+
+
+def normalize_phone(value):
+	return re.sub(r"\D", "", value or "")
+
+
+def get_field_tokens(field, value):
+	"""Lowercase tokens a value is findable by; prefixes of each token match"""
+	value = (value or "").strip().lower()
+	if not value:
+		return set()
+
+	if field == "contact_no":
+		digits = normalize_phone(value)
+		# typed with or without the international/trunk prefix
+		return {t for t in (digits, digits.lstrip("0")) if t}
+
+	if field == "email":
+		# the domain and TLD are shared by too many persons to narrow anything down
+		tokens = set(re.findall(r"\w+", value.split("@", 1)[0]))
+		tokens.add(value)
+		return tokens
+	return set(re.findall(r"\w+", value))
+
+
+def get_person_tokens(person):
+	"""{token: (source_field, weight)} keeping the heaviest field per token"""
+	tokens = {}
+	for field, weight in SEARCH_FIELDS.items():
+		for token in get_field_tokens(field, person.get(field)):
+			token = token[:MAX_TOKEN_LENGTH]
+			if token not in tokens or tokens[token][1] < weight:
+				tokens[token] = (field, weight)
+	return tokens
+
+
+def make_rows(person_name, tokens, now):
+	return [
+		(frappe.generate_hash(length=12), token, person_name, field, weight, "Administrator", "Administrator", now, now)
+		for token, (field, weight) in tokens.items()
+	]
+
+
+def update_person_index(person):
+	"""Replace the index rows of one Person Details document"""
+	frappe.db.delete("Person Search Index", {"person": person.name})
+	rows = make_rows(person.name, get_person_tokens(person), frappe.utils.now())
+	if rows:
+		frappe.db.bulk_insert("Person Search Index", INDEX_FIELDS, rows)
+
+
+def remove_person_index(person_name):
+	frappe.db.delete("Person Search Index", {"person": person_name})
+
+
+def rebuild_person_search_index():
+	"""Rebuild every index row from Person Details; returns the number of persons indexed"""
+	frappe.db.sql("TRUNCATE `tabPerson Search Index`")
+	now = frappe.utils.now()
+	count = 0
+	after = ""
+
+	# each page is read in full before inserting: the inserts share the cursor
+	fields = ", ".join(f"`{f}`" for f in ["name", *SEARCH_FIELDS])
+	while True:
+		persons = frappe.db.sql(f"""
+			SELECT {fields} FROM `tabPerson Details`
+			WHERE name > %(after)s
+			ORDER BY name
+			LIMIT %(limit)s
+		""", {"after": after, "limit": REBUILD_CHUNK_SIZE}, as_dict=True)
+		if not persons:
+			return count
+
+		rows = []
+		for person in persons:
+			rows.extend(make_rows(person.name, get_person_tokens(person), now))
+		if rows:
+			frappe.db.bulk_insert("Person Search Index", INDEX_FIELDS, rows)
+		count += len(persons)
+		after = persons[-1].name
+
+
+def get_query_terms(q):
+	"""Lowercase search terms; phone-like input is reduced to its digits"""
+	q = (q or "").strip().lower()
+	if re.fullmatch(r"[\d\s()+\-./]+", q):
+		digits = normalize_phone(q).lstrip("0")
+		return [digits] if len(digits) >= MIN_TERM_LENGTH else []
+
+	terms = []
+	for term in re.findall(r"[\w@.+\-]+", q):
+		term = term.strip(".-+")[:MAX_TOKEN_LENGTH]
+		if len(term) >= MIN_TERM_LENGTH and term not in terms:
+			terms.append(term)
+	return terms
+
+
+def escape_like(value):
+	return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_person_index(q, limit):
+	"""
+	Persons whose tokens start with every search term, best scoring first.
+	Each term scores the weight of its best matching token (+1 when exact).
+	Only the first MAX_CANDIDATES persons matching the longest term are
+	scored, so a common prefix cannot make the grouping scan the index.
+	"""
+	terms = get_query_terms(q)
+	if not terms:
+		return []
+
+	driver = max(terms, key=len)
+	values = {"limit": limit, "candidates": MAX_CANDIDATES, "driver": escape_like(driver) + "%"}
+	scores = []
+	matches = []
+	for i, term in enumerate(terms):
+		values[f"p{i}"] = escape_like(term) + "%"
+		values[f"t{i}"] = term
+		matches.append(f"i.token LIKE %(p{i})s")
+		scores.append(
+			f"MAX(CASE WHEN i.token LIKE %(p{i})s THEN i.weight + (i.token = %(t{i})s) ELSE 0 END)"
+		)
+
+	return frappe.db.sql(f"""
+		SELECT p.name, p.full_name, p.first_name, p.last_name, p.email, p.contact_no, p.person_city, m.score
+		FROM (
+			SELECT i.person, {" + ".join(scores)} AS score
+			FROM (
+				SELECT DISTINCT person FROM `tabPerson Search Index`
+				WHERE token LIKE %(driver)s
+				LIMIT %(candidates)s
+			) c
+			JOIN `tabPerson Search Index` i ON i.person = c.person
+			WHERE {" OR ".join(matches)}
+			GROUP BY i.person
+			HAVING {" AND ".join(f"{s} > 0" for s in scores)}
+			ORDER BY score DESC
+			LIMIT %(limit)s
+		) m
+		JOIN `tabPerson Details` p ON p.name = m.person
+		ORDER BY m.score DESC, p.full_name
+	""", values, as_dict=True)
@@ -0,0 +1,66 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from homie_app.homie_app.doctype.person_search_index import person_search_index
+from homie_app.homie_app.doctype.person_search_index.person_search_index import (
+	get_query_terms,
+	get_field_tokens,
+	rebuild_person_search_index,
+	search_person_index,
+)
+
+
+class TestPersonSearchIndex(FrappeTestCase):
+	def make_person(self, i):
+		return frappe.get_doc({
+			"doctype": "Person Details",
+			"first_name": f"Rebuildtest{i}",
+			"last_name": "Indexcheck",
+			"email": f"rebuildtest{i}@search.test",
+			"contact_no": f"0301{i:07d}",
+		}).insert(ignore_permissions=True)
+
+	def test_rebuild_spans_several_chunks(self):
+		persons = [self.make_person(i) for i in range(7)]
+
+		# two persons per page, so the rebuild has to page past the first inserts
+		with patch.object(person_search_index, "REBUILD_CHUNK_SIZE", 2):
+			count = rebuild_person_search_index()
+
+		self.assertGreaterEqual(count, len(persons))
+		last = max(persons, key=lambda p: p.name)
+		found = search_person_index(last.email, 5)
+		self.assertIn(last.name, [r.name for r in found])
+
+	def test_email_domain_is_not_indexed(self):
+		self.assertEqual(
+			get_field_tokens("email", "Jane.Doe@Gmail.com"),
+			{"jane", "doe", "jane.doe@gmail.com"},
+		)
+		person = self.make_person(100)
+		tokens = frappe.get_all("Person Search Index", filters={"person": person.name}, pluck="token")
+		self.assertNotIn("search", tokens)
+		self.assertNotIn("test", tokens)
+		self.assertEqual(search_person_index("search.test", 5), [])
+
+	def test_common_prefix_scores_bounded_candidates(self):
+		persons = [self.make_person(200 + i) for i in range(6)]
+
+		# every one of them has a token starting with "rebuildtest2"
+		with patch.object(person_search_index, "MAX_CANDIDATES", 3):
+			found = search_person_index("rebuildtest2", 10)
+			self.assertLessEqual(len(found), 3)
+
+			# the longest term drives the candidates, the others only filter them
+			found = search_person_index(f"indexcheck {persons[-1].email}", 10)
+			self.assertEqual([r.name for r in found], [persons[-1].name])
+
+	def test_short_terms_are_ignored(self):
+		self.assertEqual(get_query_terms("ab"), [])
+		self.assertEqual(get_query_terms("ab cde"), ["cde"])
+		self.assertEqual(get_query_terms("12"), [])
@@ -1,8 +1,70 @@
 # Copyright (c) 2025, Anonymous and contributors
 # For license information, please see license.txt
 
-# import frappe
+import pickle
+
+import frappe
 from frappe.model.document import Document
+from frappe.utils import flt
+
+PRODUCT_PRICE_CACHE_KEY = "homie_product_prices"
+
 
 class ProductDetails(Document):
-	pass
+	def clear_cache(self):
+		# called on save and db_set
+		super().clear_cache()
+		clear_product_price_cache(self.name)
+
+	def on_trash(self):
+		clear_product_price_cache(self.name)
+
+	def after_rename(self, old, new, merge=False):
+		clear_product_price_cache(old)
+		clear_product_price_cache(new)
+
+
+def get_product_prices(products):
+	"""
+	Return {product: {"product_name": ..., "product_price": ...}} for the given
+	Product Details names. Served from the shared redis cache with one HMGET;
+	all misses are loaded with a single query and written back in one
+	pipeline. Unknown products are absent from the result.
+	"""
+	products = list({p for p in products if p})
+	if not products:
+		return {}
+
+	# raw hash commands, stored the way RedisWrapper.hset/hget pickle values
+	cache = frappe.cache()
+	key = cache.make_key(PRODUCT_PRICE_CACHE_KEY)
+	result = {}
+	missing = []
+
+	for product, cached in zip(products, cache.hmget(key, products)):
+		if cached is None:
+			missing.append(product)
+		else:
+			result[product] = pickle.loads(cached)
+
+	if missing:
+		rows = frappe.get_all(
+			"Product Details",
+			filters={"name": ["in", missing]},
+			fields=["name", "product_name", "product_price"],
+		)
+		pipeline = cache.pipeline()
+		for row in rows:
+			value = {"product_name": row.product_name, "product_price": flt(row.product_price)}
+			pipeline.hset(key, row.name, pickle.dumps(value))
+			result[row.name] = value
+		pipeline.execute()
+
+	return result
+
+
+def clear_product_price_cache(product=None):
+	if product:
+		frappe.cache().hdel(PRODUCT_PRICE_CACHE_KEY, product)
+	else:
+		frappe.cache().delete_value(PRODUCT_PRICE_CACHE_KEY)
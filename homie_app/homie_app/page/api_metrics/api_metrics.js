@@ -0,0 +1,76 @@
+frappe.pages["api-metrics"] = frappe.pages["api-metrics"] || {};
+
+frappe.pages["api-metrics"].on_page_load = function(wrapper) {
+
+    const page = frappe.ui.make_app_page({
+        parent: wrapper,
+        title: "API Metrics",
+        single_column: true
+    });
+
+    const main = $(page.main);
+
+    page.set_primary_action("Refresh", () => load());
+    page.set_secondary_action("Reset", () => {
+        frappe.confirm("Clear all recorded samples?", () => {
+            frappe.call("homie_app.homie_app.page.api_metrics.api_metrics.reset_api_metrics").then(() => load());
+        });
+    });
+
+    function fmt(value) {
+        return Number(value || 0).toFixed(1);
+    }
+
+    function render(data) {
+        const endpoints = Object.entries(data.endpoints || {});
+
+        if (!endpoints.length) {
+            main.html(`
+                <div style="padding:16px; color:#64748b;">
+                    No samples recorded. Sample rate: ${data.sample_rate}
+                    (set <code>homie_api_sample_rate</code> in site config to enable).
+                </div>
+            `);
+            return;
+        }
+
+        const rows = endpoints.map(([endpoint, s]) => `
+            <tr>
+                <td>${frappe.utils.escape_html(endpoint)}</td>
+                <td>${s.samples}</td>
+                <td>${fmt(s.wall_ms.p50)} / ${fmt(s.wall_ms.p95)} / ${fmt(s.wall_ms.p99)}</td>
+                <td>${fmt(s.db_ms.p50)} / ${fmt(s.db_ms.p95)} / ${fmt(s.db_ms.p99)}</td>
+                <td>${s.queries.p50} / ${s.queries.p95} / ${s.queries.p99}</td>
+                <td>${s.rows.p50} / ${s.rows.p95}</td>
+                <td>${s.bytes.p50} / ${s.bytes.p95}</td>
+            </tr>
+        `).join("");
+
+        main.html(`
+            <div style="padding:16px;">
+                <div style="margin-bottom:12px; color:#64748b;">Sample rate: ${data.sample_rate}</div>
+                <table class="table table-bordered table-sm">
+                    <thead>
+                        <tr>
+                            <th>Endpoint</th>
+                            <th>Samples</th>
+                            <th>Wall ms (p50/p95/p99)</th>
+                            <th>DB ms (p50/p95/p99)</th>
+                            <th>Queries (p50/p95/p99)</th>
+                            <th>Rows (p50/p95)</th>
+                            <th>Bytes (p50/p95)</th>
+                        </tr>
+                    </thead>
+                    <tbody>${rows}</tbody>
+                </table>
+            </div>
+        `);
+    }
+
+    function load() {
+        frappe.call("homie_app.homie_app.page.api_metrics.api_metrics.get_api_metrics")
+            .then(r => render(r.message || {}));
+    }
+
+    load();
+};
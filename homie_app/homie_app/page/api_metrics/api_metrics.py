@@ -0,0 +1,18 @@
+import frappe
+
+from homie_app.instrumentation import clear_metrics, get_endpoint_stats
+
+
+@frappe.whitelist()
+def get_api_metrics():
+    frappe.only_for("System Manager")
+    return {
+        "sample_rate": frappe.conf.get("homie_api_sample_rate") or 0,
+        "endpoints": get_endpoint_stats(),
+    }
+
+
+@frappe.whitelist()
+def reset_api_metrics():
+    frappe.only_for("System Manager")
+    clear_metrics()
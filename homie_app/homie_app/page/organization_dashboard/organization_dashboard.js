@@ -7,6 +7,42 @@ frappe.pages['organization-dashboard'].on_page_load = function(wrapper) {
     });
 
     const main = $(page.main);
+    const method_path = "homie_app.homie_app.page.organization_dashboard.organization_dashboard";
+
+    /* ---------------- STATE ---------------- */
+    const state = {
+        organization: null,
+        donations: [],
+        deliveries: [],
+        next_donation_cursor: null,
+        next_delivery_cursor: null
+    };
+
+    /* ---------------- DATE RANGE FILTERS ---------------- */
+    const from_date_field = page.add_field({
+        fieldname: "from_date",
+        label: __("From Date"),
+        fieldtype: "Date",
+        change() {
+            if (state.organization) load_organization(state.organization);
+        }
+    });
+
+    const to_date_field = page.add_field({
+        fieldname: "to_date",
+        label: __("To Date"),
+        fieldtype: "Date",
+        change() {
+            if (state.organization) load_organization(state.organization);
+        }
+    });
+
+    function date_args() {
+        return {
+            from_date: from_date_field.get_value() || null,
+            to_date: to_date_field.get_value() || null
+        };
+    }
 
     /* ---------------- SPINNER STYLE ---------------- */
     if (!document.getElementById("org-spinner-style")) {
@@ -125,6 +161,12 @@ td {
     border-top: 1px solid #1e293b;
 }
 
+/* Load more */
+.load-more {
+    display: block;
+    margin: 12px auto 0;
+}
+
 /* Empty text */
 #donations p,
 #deliveries p {
@@ -164,9 +206,11 @@ td {
         $("#content").css("opacity", 0);
         $("#loading-spinner").show();
 
+        state.organization = org_name;
+
         frappe.call({
-            method: "homie_app.homie_app.page.organization_dashboard.organization_dashboard.get_organization_dashboard",
-            args: { organization: org_name },
+            method: `${method_path}.get_organization_dashboard`,
+            args: { organization: org_name, ...date_args() },
             callback(r) {
                 $("#loading-spinner").hide();
                 if (r.message) {
@@ -222,11 +266,23 @@ td {
 `);
 
 
-        /* DONATIONS TABLE */
-       /* DONATIONS TABLE */
+        state.donations = data.donations || [];
+        state.deliveries = data.deliveries || [];
+        state.next_donation_cursor = data.next_donation_cursor;
+        state.next_delivery_cursor = data.next_delivery_cursor;
+
+        render_donations();
+        render_deliveries();
+
+
+        $("#content").css("opacity", 1);
+    }
+
+    /* ---------------- DONATIONS TABLE ---------------- */
+    function render_donations() {
 let donation_html = `<p>No donations found</p>`;
 
-if (data.donations?.length) {
+if (state.donations.length) {
     donation_html = `
         <table>
             <thead>
@@ -243,7 +299,7 @@ if (data.donations?.length) {
                 </tr>
             </thead>
             <tbody>
-                ${data.donations.map(d => {
+                ${state.donations.map(d => {
 
                     const person_name =
                         `${d.person_first_name || ""} ${d.person_last_name || ""}`.trim();
@@ -289,14 +345,19 @@ if (data.donations?.length) {
     `;
 }
 
-$("#donations").html(donation_html);
+if (state.next_donation_cursor) {
+    donation_html += `<button class="btn btn-default btn-sm load-more" id="more-donations">${__("Load more")}</button>`;
+}
 
+$("#donations").html(donation_html);
+$("#more-donations").on("click", load_more_donations);
+    }
 
-        /* DELIVERIES */
-        /* ---------------- DELIVERIES TABLE ---------------- */
+    /* ---------------- DELIVERIES TABLE ---------------- */
+    function render_deliveries() {
 let delivery_html = `<p>No deliveries found</p>`;
 
-if (data.deliveries?.length) {
+if (state.deliveries.length) {
     delivery_html = `
         <table>
             <thead>
@@ -308,7 +369,7 @@ if (data.deliveries?.length) {
                 </tr>
             </thead>
             <tbody>
-                ${data.deliveries.map(d => {
+                ${state.deliveries.map(d => {
                     // Recipient display
                     let recipient = "";
                     if (d.deleiver_to === "Person") {
@@ -331,10 +392,47 @@ if (data.deliveries?.length) {
     `;
 }
 
+if (state.next_delivery_cursor) {
+    delivery_html += `<button class="btn btn-default btn-sm load-more" id="more-deliveries">${__("Load more")}</button>`;
+}
+
 $("#deliveries").html(delivery_html);
+$("#more-deliveries").on("click", load_more_deliveries);
+    }
 
+    /* ---------------- LOAD MORE (next page via cursor) ---------------- */
+    function load_more_donations() {
+        frappe.call({
+            method: `${method_path}.get_organization_donations`,
+            args: {
+                organization: state.organization,
+                cursor: state.next_donation_cursor,
+                ...date_args()
+            },
+            callback(r) {
+                const page_data = r.message || {};
+                state.donations = state.donations.concat(page_data.data || []);
+                state.next_donation_cursor = page_data.next_cursor;
+                render_donations();
+            }
+        });
+    }
 
-        $("#content").css("opacity", 1);
+    function load_more_deliveries() {
+        frappe.call({
+            method: `${method_path}.get_organization_deliveries`,
+            args: {
+                organization: state.organization,
+                cursor: state.next_delivery_cursor,
+                ...date_args()
+            },
+            callback(r) {
+                const page_data = r.message || {};
+                state.deliveries = state.deliveries.concat(page_data.data || []);
+                state.next_delivery_cursor = page_data.next_cursor;
+                render_deliveries();
+            }
+        });
     }
 
     function getRecipient(d) {
@@ -1,32 +1,136 @@
 import frappe
+from frappe.utils import add_days, getdate
+
+from homie_app.api import paginate
+from homie_app.instrumentation import instrumented
+
+DASHBOARD_PAGE_LENGTH = 20
+
+DONATION_FIELDS = [
+    "name",
+    "donated_at",
+    "total",
+    "donated_to",
+    "contact_person",
+    "person_first_name",
+    "person_last_name",
+    "shelter_details",
+    "shelter_name",
+    "organization_name"
+]
+
+DELIVERY_FIELDS = [
+    "name",
+    "deleivery_type",
+    "organization_detail",
+    "organization_name",
+    "deleiver_to",
+    "person_details",
+    "first_name",
+    "last_name",
+    "shleter_details",
+    "shleter_name",
+    # "order_date",
+    "deleivery_date"
+]
+
+
+def date_filters(fieldname, from_date=None, to_date=None):
+    """Inclusive from/to date range on a Datetime field"""
+    filters = []
+    if from_date:
+        filters.append([fieldname, ">=", getdate(from_date)])
+    if to_date:
+        filters.append([fieldname, "<", add_days(getdate(to_date), 1)])
+    return filters
+
 
 @frappe.whitelist()
-def get_organization_dashboard(organization):
+@instrumented
+def get_organization_dashboard(organization, from_date=None, to_date=None,
+                               donation_limit=None, donation_cursor=None,
+                               delivery_limit=None, delivery_cursor=None):
     # 1️⃣ Organization
-    org = frappe.get_doc("Organization Details", organization)
+    org = frappe.db.get_value(
+        "Organization Details", organization, ["name", "organization_name"], as_dict=True
+    )
+    if not org:
+        frappe.throw(f"Organization '{organization}' not found")
+
+    # 2️⃣ KPIs aggregated in the database
+    kpis = get_organization_kpis(organization, from_date, to_date)
+
+    # 3️⃣ One page of donations (with items) and deliveries
+    donations = get_organization_donations(organization, from_date, to_date, donation_limit, donation_cursor)
+    deliveries = get_organization_deliveries(organization, from_date, to_date, delivery_limit, delivery_cursor)
+
+    return {
+        "organization": {
+            "name": org.name,
+            "organization_name": org.organization_name,
+        },
+        "kpis": kpis,
+        "donations": donations["data"],
+        "next_donation_cursor": donations["next_cursor"],
+        "deliveries": deliveries["data"],
+        "next_delivery_cursor": deliveries["next_cursor"]
+    }
+
+
+def get_organization_kpis(organization, from_date=None, to_date=None):
+    conditions = ["organization = %(organization)s"]
+    values = {"organization": organization}
+    if from_date:
+        conditions.append("donated_at >= %(from_date)s")
+        values["from_date"] = getdate(from_date)
+    if to_date:
+        conditions.append("donated_at < %(to_date)s")
+        values["to_date"] = add_days(getdate(to_date), 1)
+
+    totals = frappe.db.sql(f"""
+        SELECT donated_to, COUNT(*) AS donation_count, SUM(total) AS total_donated
+        FROM `tabDonation`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY donated_to
+    """, values, as_dict=True)
 
-    # 2️⃣ Donations (parent)
-    donations = frappe.get_all(
+    by_recipient = {t.donated_to: t for t in totals}
+
+    delivery_count = frappe.db.count(
+        "Deleivery Informations",
+        [["organization_detail", "=", organization]]
+        + date_filters("deleivery_date", from_date, to_date)
+    )
+
+    return {
+        "total_donated": sum(t.total_donated or 0 for t in totals),
+        "donation_count": sum(t.donation_count for t in totals),
+        "donation_to_person_count": by_recipient.get("Person", {}).get("donation_count", 0),
+        "donation_to_shelter_count": by_recipient.get("Animal Shelter", {}).get("donation_count", 0),
+        "delivery_count": delivery_count,
+    }
+
+
+@frappe.whitelist()
+@instrumented
+def get_organization_donations(organization, from_date=None, to_date=None, limit=None, cursor=None):
+    """
+    One page of donations, newest first, with the items of that page only.
+    Paged on creation rather than the nullable donated_at, so a cursor always
+    points at a real value and the (organization, creation) index is used.
+    """
+    donations, next_cursor = paginate(
         "Donation",
-        filters={"organization": organization},
-        fields=[
-            "name",
-            "donated_at",
-            "total",
-            "donated_to",
-            "contact_person",
-            "person_first_name",
-            "person_last_name",
-            "shelter_details",
-            "shelter_name",
-            "organization_name"
-        ],
-        order_by="donated_at desc"
+        fields=DONATION_FIELDS,
+        filters=[["organization", "=", organization]] + date_filters("donated_at", from_date, to_date),
+        limit=limit or DASHBOARD_PAGE_LENGTH,
+        cursor=cursor,
+        sort_field="creation"
     )
 
     donation_names = [d.name for d in donations]
 
-    # 3️⃣ Donation Items (child table)
+    # Donation Items (child table) of the visible page
     items = []
     if donation_names:
         items = frappe.get_all(
@@ -43,53 +147,34 @@ def get_organization_dashboard(organization):
                 "quantity",
                 "amount",
                 "total"
-            ]
+            ],
+            order_by="idx asc"
         )
 
-    # 4️⃣ Group items by donation
     items_map = {}
     for i in items:
         items_map.setdefault(i.parent, []).append(i)
 
-    # 5️⃣ Attach items to donations
     for d in donations:
         d["items"] = items_map.get(d.name, [])
 
-    # 6️⃣ KPI totals
-    total_donated = sum(d.total or 0 for d in donations)
+    return {"data": donations, "next_cursor": next_cursor}
 
-    # ➕ Donation recipient counts (ADDED)
-    donated_to_person = 0
-    donated_to_shelter = 0
 
-    for d in donations:
-        if d.get("donated_to") == "Person":
-            donated_to_person += 1
-        elif d.get("donated_to") == "Animal Shelter":
-            donated_to_shelter += 1
-
-    # 7️⃣ Deliveries (show all relevant info)
-    deliveries = frappe.get_all(
+@frappe.whitelist()
+@instrumented
+def get_organization_deliveries(organization, from_date=None, to_date=None, limit=None, cursor=None):
+    """One page of deliveries, newest first (paged on creation, see get_organization_donations)"""
+    deliveries, next_cursor = paginate(
         "Deleivery Informations",
-        filters={"organization_detail": organization},
-        fields=[
-            "name",
-            "deleivery_type",
-            "organization_detail",
-            "organization_name",
-            "deleiver_to",
-            "person_details",
-            "first_name",
-            "last_name",
-            "shleter_details",
-            "shleter_name",
-            # "order_date",
-            "deleivery_date"
-        ],
-        order_by="deleivery_date desc"
+        fields=DELIVERY_FIELDS,
+        filters=[["organization_detail", "=", organization]] + date_filters("deleivery_date", from_date, to_date),
+        limit=limit or DASHBOARD_PAGE_LENGTH,
+        cursor=cursor,
+        sort_field="creation"
     )
 
-    # 8️⃣ Format recipient display
+    # Format recipient display
     for d in deliveries:
         if d.get("deleiver_to") == "Person" and d.get("person_details"):
             d["recipient_display"] = f"{d.get('first_name') or ''} {d.get('last_name') or ''}".strip()
@@ -98,18 +183,4 @@ def get_organization_dashboard(organization):
         else:
             d["recipient_display"] = ""
 
-    return {
-        "organization": {
-            "name": org.name,
-            "organization_name": org.organization_name,
-        },
-        "kpis": {
-            "total_donated": total_donated,
-            "donation_count": len(donations),
-            "donation_to_person_count": donated_to_person,
-            "donation_to_shelter_count": donated_to_shelter,
-            "delivery_count": len(deliveries),
-        },
-        "donations": donations,
-        "deliveries": deliveries
-    }
+    return {"data": deliveries, "next_cursor": next_cursor}
@@ -1,30 +1,22 @@
 import frappe
 from frappe import _
 
+from homie_app.homie_app.doctype.kpi_summary.kpi_summary import get_kpis
+from homie_app.instrumentation import instrumented
+
 @frappe.whitelist()
+@instrumented
 def get_admin_kpis():
     """
-    Return KPI totals for workspace dashboard
+    Return KPI totals for workspace dashboard, read from the
+    incrementally maintained KPI Summary row
     """
-    total = frappe.db.sql("""SELECT SUM(total) FROM `tabDonation`""")[0][0] or 0
-
-    return {
-        "total_products": frappe.db.count("Product Details"),
-        "total_donations": frappe.db.count("Donation"),
-        "total_amount": total,
-        "out_of_stock": frappe.db.count(
-            "Product Details",
-            {"product_status": "Out of stock"}
-        ),
-        "active_organizations": frappe.db.count(
-            "Organization Details",
-            {"status": "Active"}
-        )
-    }
+    return get_kpis()
 
 
 
 @frappe.whitelist()
+@instrumented
 def get_organizations():
     """
     Return latest products data
@@ -46,6 +38,7 @@ def get_organizations():
 
 
 @frappe.whitelist()
+@instrumented
 def get_products():
     """
     Return latest products data
@@ -69,6 +62,7 @@ def get_products():
 
 
 @frappe.whitelist()
+@instrumented
 def get_persons():
     """
     """
@@ -88,6 +82,7 @@ def get_persons():
     )
 
 @frappe.whitelist()
+@instrumented
 def get_donations():
     return frappe.get_all(
         "Donation",
@@ -115,13 +115,66 @@ app_license = "MIT"
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"Person Details": {
+		"on_update": "homie_app.propagation.on_source_update",
+		"on_trash": [
+			"homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_recipient_trash",
+			"homie_app.homie_app.doctype.animal_census.animal_census.on_recipient_trash",
+		],
+		"before_rename": [
+			"homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_recipient_rename",
+			"homie_app.homie_app.doctype.animal_census.animal_census.on_recipient_rename",
+		],
+	},
+	"Animal Shelters": {
+		"on_update": "homie_app.propagation.on_source_update",
+		"on_trash": [
+			"homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_recipient_trash",
+			"homie_app.homie_app.doctype.animal_census.animal_census.on_recipient_trash",
+		],
+		"before_rename": [
+			"homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_recipient_rename",
+			"homie_app.homie_app.doctype.animal_census.animal_census.on_recipient_rename",
+		],
+	},
+	"Donation": {
+		"on_update": [
+			"homie_app.homie_app.doctype.kpi_summary.kpi_summary.on_donation_update",
+			"homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup.on_donation_update",
+		],
+		"after_delete": [
+			"homie_app.homie_app.doctype.kpi_summary.kpi_summary.on_donation_delete",
+			"homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup.on_donation_delete",
+		],
+	},
+	"Product Details": {
+		"on_update": [
+			"homie_app.homie_app.doctype.kpi_summary.kpi_summary.on_product_update",
+			"homie_app.propagation.on_source_update",
+		],
+		"after_delete": "homie_app.homie_app.doctype.kpi_summary.kpi_summary.on_product_delete",
+	},
+	"Organization Details": {
+		"on_update": [
+			"homie_app.homie_app.doctype.kpi_summary.kpi_summary.on_organization_update",
+			"homie_app.propagation.on_source_update",
+		],
+		"after_delete": "homie_app.homie_app.doctype.kpi_summary.kpi_summary.on_organization_delete",
+	},
+	"Animal Information": {
+		"on_update": "homie_app.homie_app.doctype.animal_census.animal_census.on_animal_update",
+		"after_delete": "homie_app.homie_app.doctype.animal_census.animal_census.on_animal_delete",
+	},
+	"Food Demands": {
+		"on_update": "homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_demand_update",
+		"after_delete": "homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_demand_delete",
+	},
+	"Deleivery Informations": {
+		"on_update": "homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_delivery_update",
+		"after_delete": "homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger.on_delivery_delete",
+	},
+}
 
 # Scheduled Tasks
 # ---------------
@@ -144,6 +197,18 @@ app_license = "MIT"
 # 	],
 # }
 
+scheduler_events = {
+	"cron": {
+		"*/10 * * * *": [
+			"homie_app.homie_app.doctype.delivery_export_job.delivery_export_job.resume_stale_exports",
+			"homie_app.homie_app.doctype.payment_reconciliation_run.payment_reconciliation_run.resume_stale_reconciliations",
+		],
+	},
+	"daily_long": [
+		"homie_app.homie_app.doctype.payment_reconciliation_run.payment_reconciliation_run.schedule_reconciliation",
+	],
+}
+
 # Testing
 # -------
 
@@ -172,6 +237,9 @@ app_license = "MIT"
 
 # ignore_links_on_delete = ["Communication", "ToDo"]
 
+# rollup rows of a person or shelter are removed by its on_trash hooks
+ignore_links_on_delete = ["Food Fulfillment Ledger", "Animal Census"]
+
 # Request Events
 # ----------------
 # before_request = ["homie_app.utils.before_request"]
@@ -0,0 +1,69 @@
+import frappe
+
+# (doctype, columns) for every column the API filters, sorts or looks up on.
+# A definition is satisfied by any existing index that starts with the same
+# columns, so single-column lookups covered by a composite are not repeated.
+HOT_PATH_INDEXES = [
+    # Donation: organization dashboard, exports, list_donations
+    ("Donation", ["organization", "donated_at"]),
+    ("Donation", ["organization", "creation"]),
+    ("Donation", ["donated_at"]),
+    ("Donation", ["creation"]),
+    ("Donation", ["contact_person"]),
+    ("Donation", ["shelter_details"]),
+    ("Donation Item", ["product"]),
+    # Deliveries
+    ("Deleivery Informations", ["organization_detail", "deleivery_date"]),
+    ("Deleivery Informations", ["organization_detail", "creation"]),
+    ("Deleivery Informations", ["deleivery_date"]),
+    ("Deleivery Informations", ["person_details"]),
+    ("Deleivery Informations", ["shleter_details"]),
+    # Persons
+    ("Person Details", ["email"]),
+    ("Person Details", ["first_name"]),
+    # Organizations
+    ("Organization Details", ["organization_email"]),
+    ("Organization Details", ["organization_name"]),
+    # Products
+    ("Product Details", ["product_name"]),
+    # Animals & shelters
+    ("Animal Information", ["person_details"]),
+    ("Animal Information", ["shelter_detail"]),
+    ("Animal Shelters", ["shelter_name"]),
+    # Food demands
+    ("Food Demands", ["person_details"]),
+    ("Food Demands", ["contacted_animal_shelter"]),
+    # Payment reconciliation and bulk donation dedupe
+    ("Donation", ["hash"]),
+    ("Donation", ["total", "donated_at"]),
+    ("Donation Payment", ["donation"]),
+    ("Donation Payment", ["hash"]),
+]
+
+
+def get_existing_indexes(doctype):
+    """{index_name: [columns in order]} for the doctype's table"""
+    indexes = {}
+    for row in frappe.db.sql(f"SHOW INDEX FROM `tab{doctype}`", as_dict=True):
+        indexes.setdefault(row.Key_name, []).append((row.Seq_in_index, row.Column_name))
+    return {name: [col for _seq, col in sorted(cols)] for name, cols in indexes.items()}
+
+
+def get_missing_indexes(definitions=None):
+    """Index definitions not covered by any existing index on the site"""
+    missing = []
+    existing = {}
+    for doctype, columns in definitions or HOT_PATH_INDEXES:
+        if doctype not in existing:
+            existing[doctype] = list(get_existing_indexes(doctype).values())
+        if not any(cols[:len(columns)] == columns for cols in existing[doctype]):
+            missing.append((doctype, columns))
+    return missing
+
+
+def ensure_indexes(definitions=None):
+    """Add every missing index; returns the definitions that were added"""
+    missing = get_missing_indexes(definitions)
+    for doctype, columns in missing:
+        frappe.db.add_index(doctype, columns)
+    return missing
@@ -0,0 +1,173 @@
+"""
+Opt-in timing for whitelisted endpoints.
+
+Set `homie_api_sample_rate` in site_config.json (0..1) to sample that share
+of calls. Each sample records wall time, DB time, SQL statement count, rows
+returned and response bytes into a bounded redis list per endpoint. With
+sampling off, the decorator costs one config lookup per call.
+"""
+
+import functools
+import inspect
+import json
+import random
+import time
+
+import frappe
+from werkzeug.wrappers import Response
+
+SAMPLE_RATE_KEY = "homie_api_sample_rate"
+RING_SIZE_KEY = "homie_api_ring_size"
+DEFAULT_RING_SIZE = 1000
+
+METRICS_KEY = "homie_api_metrics"
+ENDPOINTS_KEY = "homie_api_metrics_endpoints"
+
+METRIC_FIELDS = ["wall_ms", "db_ms", "queries", "rows", "bytes"]
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def instrumented(fn):
+    """Wrap a whitelisted function so sampled calls are measured"""
+    endpoint = f"{fn.__module__}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        rate = frappe.conf.get(SAMPLE_RATE_KEY)
+        if not rate or getattr(frappe.local, "homie_sampling", False) or random.random() >= rate:
+            return fn(*args, **kwargs)
+        return call_sampled(endpoint, fn, args, kwargs)
+
+    # frappe.call passes only the arguments the function declares
+    wrapper.fnargs = list(inspect.signature(fn).parameters)
+    return wrapper
+
+
+def call_sampled(endpoint, fn, args, kwargs):
+    stats = {"queries": 0, "db_seconds": 0.0}
+    previous_sql = frappe.db.__dict__.get("sql")
+    original_sql = frappe.db.sql
+
+    def timed_sql(*a, **kw):
+        start = time.perf_counter()
+        try:
+            return original_sql(*a, **kw)
+        finally:
+            stats["queries"] += 1
+            stats["db_seconds"] += time.perf_counter() - start
+
+    frappe.db.sql = timed_sql
+    frappe.local.homie_sampling = True
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        wall = time.perf_counter() - start
+        frappe.local.homie_sampling = False
+        if previous_sql is None:
+            del frappe.db.sql
+        else:
+            frappe.db.sql = previous_sql
+
+    try:
+        record_sample(endpoint, {
+            "wall_ms": wall * 1000,
+            "db_ms": stats["db_seconds"] * 1000,
+            "queries": stats["queries"],
+            "rows": count_rows(result),
+            "bytes": response_bytes(result),
+        })
+    except Exception:
+        # metrics must never break the endpoint
+        frappe.log_error(title="Failed to record API sample")
+
+    return result
+
+
+def count_rows(result):
+    """Rows in the largest top-level list of the response"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return max((len(v) for v in result.values() if isinstance(v, list)), default=0)
+    return 0
+
+
+def response_bytes(result):
+    if isinstance(result, Response):
+        # streamed responses have no known length
+        return result.content_length or 0
+    return len(frappe.as_json(result, indent=None).encode())
+
+
+def record_sample(endpoint, sample):
+    cache = frappe.cache()
+    key = f"{METRICS_KEY}|{endpoint}"
+    ring_size = frappe.conf.get(RING_SIZE_KEY) or DEFAULT_RING_SIZE
+
+    cache.lpush(key, json.dumps(sample))
+    cache.ltrim(key, 0, ring_size - 1)
+    cache.sadd(ENDPOINTS_KEY, endpoint)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def get_endpoint_stats():
+    """{endpoint: {"samples": n, metric: {"p50": .., "p95": .., "p99": ..}}} over the ring buffers"""
+    cache = frappe.cache()
+    result = {}
+
+    for endpoint in sorted(e.decode() if isinstance(e, bytes) else e for e in cache.smembers(ENDPOINTS_KEY)):
+        samples = [json.loads(s) for s in cache.lrange(f"{METRICS_KEY}|{endpoint}", 0, -1)]
+        if not samples:
+            continue
+
+        stats = {"samples": len(samples)}
+        for field in METRIC_FIELDS:
+            values = sorted(s[field] for s in samples)
+            stats[field] = {f"p{int(q * 100)}": percentile(values, q) for q in QUANTILES}
+        result[endpoint] = stats
+
+    return result
+
+
+def clear_metrics():
+    cache = frappe.cache()
+    for endpoint in cache.smembers(ENDPOINTS_KEY):
+        endpoint = endpoint.decode() if isinstance(endpoint, bytes) else endpoint
+        cache.delete_value(f"{METRICS_KEY}|{endpoint}")
+    cache.delete_value(ENDPOINTS_KEY)
+
+
+PROMETHEUS_METRICS = {
+    "wall_ms": ("homie_api_wall_seconds", "Wall time of sampled homie API calls", 1 / 1000),
+    "db_ms": ("homie_api_db_seconds", "Database time of sampled homie API calls", 1 / 1000),
+    "queries": ("homie_api_sql_statements", "SQL statements per sampled homie API call", 1),
+    "rows": ("homie_api_rows", "Rows returned per sampled homie API call", 1),
+    "bytes": ("homie_api_response_bytes", "Response size of sampled homie API calls", 1),
+}
+
+
+@frappe.whitelist()
+def metrics():
+    """Endpoint percentiles in the Prometheus text exposition format"""
+    frappe.only_for("System Manager")
+    stats = get_endpoint_stats()
+
+    lines = []
+    for field, (metric, help_text, scale) in PROMETHEUS_METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} summary")
+        for endpoint, endpoint_stats in stats.items():
+            for q in QUANTILES:
+                value = endpoint_stats[field][f"p{int(q * 100)}"] * scale
+                lines.append(f'{metric}{{endpoint="{endpoint}",quantile="{q}"}} {value}')
+            lines.append(f'{metric}_count{{endpoint="{endpoint}"}} {endpoint_stats["samples"]}')
+
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,11 @@
+import frappe
+
+from homie_app.homie_app.doctype.animal_census.animal_census import on_doctype_update, rebuild_animal_census
+
+
+def execute():
+    # rows split by renames are merged by the rebuild before the unique key is added
+    count = rebuild_animal_census()
+    on_doctype_update()
+    print(f"Rebuilt {count} animal census rows")
+    frappe.db.commit()
@@ -0,0 +1,11 @@
+import frappe
+
+from homie_app.indexes import ensure_indexes
+
+
+def execute():
+    # picks up the (organization, creation) entries the dashboard lists page on
+    added = ensure_indexes()
+    for doctype, columns in added:
+        print(f"Added index on {doctype} ({', '.join(columns)})")
+    frappe.db.commit()
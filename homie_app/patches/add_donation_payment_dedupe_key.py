@@ -0,0 +1,27 @@
+import frappe
+
+from homie_app.homie_app.doctype.donation_payment.donation_payment import DEDUPE_KEY
+
+
+def execute():
+    """
+    Enforce one Donation Payment per (provider, hash, type). Sites that already
+    hold retried webhooks get a plain index instead, so ingestion can still
+    dedupe with an indexed lookup; clean up the duplicates and re-run to
+    upgrade it to a unique key.
+    """
+    columns = ", ".join(f"`{c}`" for c in DEDUPE_KEY)
+    duplicates = frappe.db.sql(f"""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM `tabDonation Payment`
+            GROUP BY {columns}
+            HAVING COUNT(*) > 1
+        ) t
+    """)[0][0]
+
+    if duplicates:
+        print(f"{duplicates} duplicate Donation Payment keys found; adding a non-unique index")
+        frappe.db.add_index("Donation Payment", DEDUPE_KEY, index_name="provider_hash_type_index")
+    else:
+        frappe.db.add_unique("Donation Payment", DEDUPE_KEY, constraint_name="unique_provider_hash_type")
+    frappe.db.commit()
@@ -0,0 +1,10 @@
+import frappe
+
+from homie_app.indexes import ensure_indexes
+
+
+def execute():
+    added = ensure_indexes()
+    for doctype, columns in added:
+        print(f"Added index on {doctype} ({', '.join(columns)})")
+    frappe.db.commit()
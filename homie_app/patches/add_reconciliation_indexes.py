@@ -0,0 +1,11 @@
+import frappe
+
+from homie_app.indexes import ensure_indexes
+
+
+def execute():
+    # picks up the payment reconciliation entries added to HOT_PATH_INDEXES
+    added = ensure_indexes()
+    for doctype, columns in added:
+        print(f"Added index on {doctype} ({', '.join(columns)})")
+    frappe.db.commit()
@@ -0,0 +1,11 @@
+import frappe
+
+from homie_app.homie_app.doctype.animal_census.animal_census import rebuild_animal_census
+
+
+def execute():
+    frappe.reload_doc("homie_app", "doctype", "animal_census")
+    frappe.reload_doc("homie_app", "doctype", "animal_census_snapshot")
+    count = rebuild_animal_census()
+    print(f"Built {count} animal census rows")
+    frappe.db.commit()
@@ -0,0 +1,10 @@
+import frappe
+
+from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import rebuild_donation_rollup
+
+
+def execute():
+    frappe.reload_doc("homie_app", "doctype", "donation_daily_rollup")
+    count = rebuild_donation_rollup()
+    print(f"Built {count} donation rollup rows")
+    frappe.db.commit()
@@ -0,0 +1,15 @@
+import frappe
+
+from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import (
+    rebuild_food_fulfillment_ledger,
+    reparse_requirement_quantities,
+)
+
+
+def execute():
+    frappe.reload_doc("homie_app", "doctype", "food_demands")
+    frappe.reload_doc("homie_app", "doctype", "food_fulfillment_ledger")
+    parsed = reparse_requirement_quantities()
+    count = rebuild_food_fulfillment_ledger()
+    print(f"Parsed {parsed} food requirements, built {count} fulfillment ledger rows")
+    frappe.db.commit()
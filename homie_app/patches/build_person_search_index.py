@@ -0,0 +1,10 @@
+import frappe
+
+from homie_app.homie_app.doctype.person_search_index.person_search_index import rebuild_person_search_index
+
+
+def execute():
+    frappe.reload_doc("homie_app", "doctype", "person_search_index")
+    count = rebuild_person_search_index()
+    print(f"Indexed {count} persons for search")
+    frappe.db.commit()
@@ -0,0 +1,16 @@
+import frappe
+
+from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import (
+    on_doctype_update,
+    rebuild_food_fulfillment_ledger,
+    reparse_requirement_quantities,
+)
+
+
+def execute():
+    # quantities parsed by the first version of the regex, and rows split by renames
+    parsed = reparse_requirement_quantities()
+    count = rebuild_food_fulfillment_ledger()
+    on_doctype_update()
+    print(f"Re-parsed {parsed} food requirements, rebuilt {count} fulfillment ledger rows")
+    frappe.db.commit()
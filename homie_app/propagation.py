@@ -0,0 +1,159 @@
+import frappe
+
+from homie_app.conditional import bump_etag_version
+
+# Denormalized copies of source fields kept on other doctypes.
+# source doctype -> [(dependent doctype, link field, {dependent field: source field}[, type field])]
+# A Dynamic Link names its type field, so only rows pointing at the source doctype are updated.
+PROPAGATION_MAP = {
+    "Person Details": [
+        ("Animal Information", "person_details", {"first_name": "first_name", "last_name": "last_name"}),
+        ("Food Demands", "person_details", {"first_name": "first_name", "last_name": "last_name"}),
+        ("Deleivery Informations", "person_details", {"first_name": "first_name", "last_name": "last_name"}),
+        ("Donation", "contact_person", {
+            "person_first_name": "first_name",
+            "person_last_name": "last_name",
+            "person_email": "email",
+        }),
+        ("Food Fulfillment Ledger", "recipient", {"recipient_name": "full_name"}, "recipient_type"),
+        ("Animal Census", "recipient", {"recipient_name": "full_name"}, "recipient_type"),
+    ],
+    "Animal Shelters": [
+        ("Animal Information", "shelter_detail", {"shelter_name": "shelter_name"}),
+        ("Food Demands", "contacted_animal_shelter", {"shelter_name": "shelter_name"}),
+        ("Deleivery Informations", "shleter_details", {"shleter_name": "shelter_name"}),
+        ("Donation", "shelter_details", {"shelter_name": "shelter_name"}),
+        ("Food Fulfillment Ledger", "recipient", {"recipient_name": "shelter_name"}, "recipient_type"),
+        ("Animal Census", "recipient", {"recipient_name": "shelter_name"}, "recipient_type"),
+    ],
+    "Organization Details": [
+        ("Deleivery Informations", "organization_detail", {"organization_name": "organization_name"}),
+        ("Donation", "organization", {"organization_name": "organization_name"}),
+    ],
+    "Product Details": [
+        ("Donation Item", "product", {"product_name": "product_name"}),
+    ],
+}
+
+PROPAGATION_CHUNK_SIZE = 1000
+
+
+def get_dependents(source_doctype):
+    """(dependent, link field, mapping, type field or None) for every copy of the source's fields"""
+    for dependent, link_field, mapping, *type_field in PROPAGATION_MAP.get(source_doctype, []):
+        yield dependent, link_field, mapping, (type_field[0] if type_field else None)
+
+
+def get_source_fields(doctype):
+    return {source for _dt, _link, mapping, _type in get_dependents(doctype) for source in mapping.values()}
+
+
+def on_source_update(doc, method=None):
+    """doc_event: queue propagation when a copied field changes (inserts have nothing to propagate)"""
+    before = doc.get_doc_before_save()
+    if not before:
+        return
+
+    changed = [f for f in get_source_fields(doc.doctype) if before.get(f) != doc.get(f)]
+    if not changed:
+        return
+
+    frappe.enqueue(
+        "homie_app.propagation.propagate",
+        queue="long",
+        enqueue_after_commit=True,
+        source_doctype=doc.doctype,
+        source_name=doc.name,
+        changed_fields=changed,
+    )
+
+
+def propagate(source_doctype, source_name, changed_fields=None):
+    """
+    Copy the source's current values to every dependent row linking to it.
+
+    Values are read when the job runs rather than when it is queued, so jobs
+    for the same source are idempotent and the latest save always wins.
+    `modified` on dependents is left alone: only the copy changed, not the record.
+    """
+    source_fields = get_source_fields(source_doctype)
+    values = frappe.db.get_value(source_doctype, source_name, list(source_fields), as_dict=True)
+    if not values:
+        return
+
+    for dependent, link_field, mapping, type_field in get_dependents(source_doctype):
+        if changed_fields and not set(mapping.values()) & set(changed_fields):
+            continue
+        if update_dependents(dependent, link_field, mapping, source_name, values, source_doctype, type_field):
+            invalidate_etags(dependent)
+
+
+def invalidate_etags(dependent):
+    """`modified` is not touched here, so cached ETags have to be invalidated explicitly"""
+    bump_etag_version(dependent)
+    if frappe.get_meta(dependent).istable:
+        for parent in frappe.get_all("DocField", filters={"fieldtype": "Table", "options": dependent}, pluck="parent"):
+            bump_etag_version(parent)
+
+
+def update_dependents(dependent, link_field, mapping, source_name, values, source_doctype=None, type_field=None):
+    """Chunked `UPDATE ... WHERE link = X`, committing between chunks to keep locks short"""
+    params = {"source": source_name, "source_doctype": source_doctype, "chunk": PROPAGATION_CHUNK_SIZE}
+    link_condition = f"`{link_field}` = %(source)s"
+    if type_field:
+        link_condition += f" AND `{type_field}` = %(source_doctype)s"
+    set_clause = []
+    stale = []
+    for target, source in mapping.items():
+        params[target] = values.get(source) or ""
+        set_clause.append(f"`{target}` = %({target})s")
+        # binary: the table collation ignores case and trailing spaces, which a rename may change
+        stale.append(f"BINARY IFNULL(`{target}`, '') <> BINARY %({target})s")
+
+    query = f"""
+        UPDATE `tab{dependent}`
+        SET {", ".join(set_clause)}
+        WHERE {link_condition} AND ({" OR ".join(stale)})
+        LIMIT %(chunk)s
+    """
+
+    total = 0
+    while True:
+        frappe.db.sql(query, params)
+        updated = frappe.db._cursor.rowcount
+        frappe.db.commit()
+        total += updated
+        if updated < PROPAGATION_CHUNK_SIZE:
+            return total
+
+
+def resync_all(source_doctype=None):
+    """
+    Bring every denormalized copy back in line with its source in one set-based
+    UPDATE ... JOIN per dependent. Used for backfills and after bulk imports
+    that bypassed doc events. Returns {(source, dependent): rows updated}.
+    """
+    counts = {}
+    for source_doctype_ in PROPAGATION_MAP:
+        if source_doctype and source_doctype_ != source_doctype:
+            continue
+
+        for dependent, link_field, mapping, type_field in get_dependents(source_doctype_):
+            set_clause = ", ".join(f"d.`{target}` = IFNULL(s.`{source}`, '')" for target, source in mapping.items())
+            stale = " OR ".join(
+                f"BINARY IFNULL(d.`{target}`, '') <> BINARY IFNULL(s.`{source}`, '')"
+                for target, source in mapping.items()
+            )
+            type_condition = f"AND d.`{type_field}` = %(source_doctype)s" if type_field else ""
+            frappe.db.sql(f"""
+                UPDATE `tab{dependent}` d
+                JOIN `tab{source_doctype_}` s ON s.name = d.`{link_field}` {type_condition}
+                SET {set_clause}
+                WHERE {stale}
+            """, {"source_doctype": source_doctype_})
+            counts[(source_doctype_, dependent)] = frappe.db._cursor.rowcount
+            frappe.db.commit()
+            if counts[(source_doctype_, dependent)]:
+                invalidate_etags(dependent)
+
+    return counts
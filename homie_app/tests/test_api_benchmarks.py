@@ -0,0 +1,436 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+"""
+Endpoint benchmarks: seed a dataset, call every endpoint and fail when its
+SQL query count or peak Python memory exceeds the budget. Wall time is
+reported for every call but only checked against a generous ceiling, so a
+slow CI runner does not fail the suite.
+
+Dataset sizes (persons, donations and deliveries) come from the
+HOMIE_BENCHMARK_SIZES environment variable, e.g. "1000,10000,100000";
+only 1000 rows are seeded by default. Budgets can be overridden per
+endpoint with the `homie_benchmark_budgets` site config key:
+
+	{"get_all_persons": {"max_queries": 3, "max_seconds": 0.5, "max_memory_mb": 20}}
+
+Set HOMIE_BENCHMARK_REPORT to a path to get the measurements as JSON.
+
+Query budgets are fixed numbers on purpose: an endpoint whose query count
+grows with the table size (N+1) fails as soon as the dataset grows.
+
+	bench --site test_site run-tests --module homie_app.tests.test_api_benchmarks
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from homie_app import api
+from homie_app.homie_app.doctype.animal_census.animal_census import rebuild_animal_census
+from homie_app.homie_app.doctype.donation_daily_rollup.donation_daily_rollup import rebuild_donation_rollup
+from homie_app.homie_app.doctype.food_fulfillment_ledger.food_fulfillment_ledger import (
+	rebuild_food_fulfillment_ledger,
+	reparse_requirement_quantities,
+)
+from homie_app.homie_app.doctype.kpi_summary.kpi_summary import rebuild_kpi_summary
+from homie_app.homie_app.doctype.person_search_index.person_search_index import rebuild_person_search_index
+from homie_app.homie_app.page.organization_dashboard import organization_dashboard
+from homie_app.homie_app.page.workspace_dashboard import workspace_dashboard
+
+DEFAULT_SIZES = "1000"
+BULK_PAYLOAD_SIZE = 100
+
+SEEDED_DOCTYPES = [
+	"Donation Item", "Donation", "Deleivery Informations", "Food Demands", "Animal Information",
+	"Person Details", "Animal Shelters", "Product Details", "Organization Details", "Bank Details",
+]
+
+DEFAULT_BUDGET = {"max_queries": 10, "max_seconds": 2.0, "max_memory_mb": 50}
+
+BUDGETS = {
+	# list endpoints, one page each (plus the ETag validator query)
+	"get_all_organizations": {"max_queries": 4},
+	"get_all_animals": {"max_queries": 3},
+	"get_all_persons": {"max_queries": 3},
+	"get_all_shelters": {"max_queries": 3},
+	"get_all_food_demands": {"max_queries": 3},
+	"get_all_delivery_info": {"max_queries": 3},
+	"get_all_products": {"max_queries": 3},
+	"list_donations": {"max_queries": 3},
+	"search_persons": {"max_queries": 1},
+	# single reads
+	"get_organization": {"max_queries": 5},
+	"get_person": {"max_queries": 4},
+	"get_shelter": {"max_queries": 4},
+	"get_product": {"max_queries": 4},
+	"get_donation": {"max_queries": 5},
+	"get_donation_sparse": {"max_queries": 4},
+	"get_delivery_info": {"max_queries": 4},
+	"get_food_demand": {"max_queries": 4},
+	"get_animal": {"max_queries": 4},
+	# dashboards
+	"get_admin_kpis": {"max_queries": 2},
+	"get_organization_dashboard": {"max_queries": 8},
+	"get_donation_timeseries": {"max_queries": 2},
+	"get_food_shortfall": {"max_queries": 2},
+	"get_animal_census": {"max_queries": 2},
+	"get_animal_census_trend": {"max_queries": 2},
+	# writes
+	"create_donation": {"max_queries": 60},
+	"create_donations_bulk": {"max_queries": 20, "max_seconds": 5.0},
+	"ingest_donation_payments": {"max_queries": 6},
+	"create_person": {"max_queries": 40},
+	"create_animal": {"max_queries": 40},
+	"update_person": {"max_queries": 40},
+	"update_animal": {"max_queries": 40},
+	"update_food_demand": {"max_queries": 40},
+	"update_delivery_info": {"max_queries": 40},
+	# deletes check every doctype that links to the record
+	"delete_person": {"max_queries": 60},
+	"delete_animal": {"max_queries": 60},
+	"delete_food_demand": {"max_queries": 60},
+	"delete_delivery_info": {"max_queries": 60},
+}
+
+
+def get_sizes():
+	sizes = os.environ.get("HOMIE_BENCHMARK_SIZES") or DEFAULT_SIZES
+	return sorted(int(s) for s in sizes.split(",") if s.strip())
+
+
+def get_budget(endpoint):
+	budget = dict(DEFAULT_BUDGET)
+	budget.update(BUDGETS.get(endpoint, {}))
+	budget.update((frappe.conf.get("homie_benchmark_budgets") or {}).get(endpoint, {}))
+	return budget
+
+
+def measure(fn, *args, **kwargs):
+	"""Call fn and return (result, stats) with query count, wall time and peak memory"""
+	queries = 0
+	original_sql = frappe.db.sql
+
+	def counting_sql(*a, **kw):
+		nonlocal queries
+		queries += 1
+		return original_sql(*a, **kw)
+
+	frappe.db.sql = counting_sql
+	tracemalloc.start()
+	start = time.perf_counter()
+	try:
+		result = fn(*args, **kwargs)
+	finally:
+		seconds = time.perf_counter() - start
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		del frappe.db.sql
+
+	return result, {"queries": queries, "seconds": seconds, "memory_mb": peak / (1024 * 1024)}
+
+
+class BenchmarkDataset:
+	"""Seeds rows with multi-row inserts; all names are prefixed with BENCH-"""
+
+	def __init__(self):
+		self.persons = 0
+		self.donations = 0
+		self.deliveries = 0
+		self.now = now_datetime()
+		self.user = frappe.session.user
+		self.organizations = []
+		self.products = []
+		self.shelters = []
+
+	def standard(self, name, i):
+		ts = add_to_date(self.now, seconds=-i)
+		return [name, ts, ts, self.user, self.user, 0, 0]
+
+	def insert(self, doctype, fields, rows):
+		if rows:
+			frappe.db.bulk_insert(
+				doctype, ["name", "creation", "modified", "owner", "modified_by", "docstatus", "idx"] + fields, rows
+			)
+
+	def seed_fixed(self):
+		"""Organizations, products and shelters do not scale with the dataset"""
+		self.organizations = [f"BENCH-ORG-{i:05d}" for i in range(20)]
+		self.insert("Bank Details", ["iban_no", "bank_name", "account_title"], [
+			self.standard(f"BENCH-IBAN-{i:05d}", i) + [f"BENCH-IBAN-{i:05d}", "Bench Bank", f"Org {i}"]
+			for i in range(len(self.organizations))
+		])
+		self.insert("Organization Details", [
+			"organization_name", "organization_email", "status", "bank_details"
+		], [
+			self.standard(org, i) + [f"Bench Org {i}", f"org{i}@bench.test", "Active", f"BENCH-IBAN-{i:05d}"]
+			for i, org in enumerate(self.organizations)
+		])
+
+		self.products = [f"BENCH-PRO-{i:05d}" for i in range(50)]
+		self.insert("Product Details", ["product_name", "product_status", "product_price", "type"], [
+			self.standard(p, i) + [f"Bench Product {i}", "Instock", 10 + i, "Food"]
+			for i, p in enumerate(self.products)
+		])
+
+		self.shelters = [f"BENCH-SHR-{i:05d}" for i in range(100)]
+		self.insert("Animal Shelters", ["shelter_name", "truck_access"], [
+			self.standard(s, i) + [f"Bench Shelter {i}", "Yes"]
+			for i, s in enumerate(self.shelters)
+		])
+
+	def grow_to(self, size):
+		"""Top the dataset up to `size` persons, donations and deliveries"""
+		if not self.organizations:
+			self.seed_fixed()
+
+		persons = range(self.persons, size)
+		self.insert("Person Details", ["first_name", "last_name", "full_name", "email", "contact_no", "person_city"], [
+			self.standard(f"BENCH-PER-{i:07d}", i)
+			+ [f"First{i}", f"Last{i}", f"First{i} Last{i}", f"person{i}@bench.test", f"0300{i:07d}", "Bench City"]
+			for i in persons
+		])
+		self.insert("Animal Information", [
+			"source", "animal_type", "person_details", "first_name", "last_name", "adult_dogs", "puppies"
+		], [
+			self.standard(f"BENCH-AND-{i:07d}", i)
+			+ ["Person", "Dog", f"BENCH-PER-{i:07d}", f"First{i}", f"Last{i}", i % 5, i % 3]
+			for i in persons if i % 10 == 0
+		])
+		self.insert("Food Demands", [
+			"order_by", "person_details", "first_name", "last_name", "food_requirements_dogs"
+		], [
+			self.standard(f"BENCH-DEM-{i:07d}", i)
+			+ ["Person", f"BENCH-PER-{i:07d}", f"First{i}", f"Last{i}", f"{i % 40} kg"]
+			for i in persons if i % 10 == 0
+		])
+		self.persons = size
+
+		donations = range(self.donations, size)
+		parents, items = [], []
+		for i in donations:
+			name = f"BENCH-DON-{i:07d}"
+			person = f"BENCH-PER-{i:07d}"
+			org = self.organizations[i % len(self.organizations)]
+			parents.append(self.standard(name, i) + [
+				add_to_date(self.now, days=-(i % 365)), "Person", org, f"Bench Org {i % len(self.organizations)}",
+				person, f"First{i}", f"Last{i}", f"person{i}@bench.test", "EUR", 30
+			])
+			for idx in (1, 2):
+				product = self.products[(i + idx) % len(self.products)]
+				items.append([f"BENCH-ITM-{i:07d}-{idx}", self.now, self.now, self.user, self.user, 0, idx,
+					name, "Donation", "items", product, "Bench product", 1, 15, 15])
+		self.insert("Donation", [
+			"donated_at", "donated_to", "organization", "organization_name", "contact_person",
+			"person_first_name", "person_last_name", "person_email", "currency", "total"
+		], parents)
+		if items:
+			frappe.db.bulk_insert("Donation Item", [
+				"name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+				"parent", "parenttype", "parentfield", "product", "product_name", "quantity", "amount", "total"
+			], items)
+		self.donations = size
+
+		deliveries = range(self.deliveries, size)
+		self.insert("Deleivery Informations", [
+			"deleivery_type", "deleiver_to", "organization_detail", "organization_name",
+			"shleter_details", "shleter_name", "no_of_kilogram", "no_of_pallets", "deleivery_date"
+		], [
+			self.standard(f"BENCH-DEL-{i:07d}", i) + [
+				"Donated From Organization", "Animal Shelter",
+				self.organizations[i % len(self.organizations)], f"Bench Org {i % len(self.organizations)}",
+				self.shelters[i % len(self.shelters)], f"Bench Shelter {i % len(self.shelters)}",
+				25, 1, add_to_date(self.now, days=-(i % 365))
+			]
+			for i in deliveries
+		])
+		self.deliveries = size
+		self.seed_disposable(size)
+
+		# seeded rows bypass doc_events
+		rebuild_kpi_summary()
+		rebuild_person_search_index()
+		rebuild_donation_rollup()
+		reparse_requirement_quantities()
+		rebuild_food_fulfillment_ledger()
+		rebuild_animal_census()
+
+	def seed_disposable(self, size):
+		"""One unreferenced row per deletable doctype for the delete benchmarks of this size"""
+		key = f"{size:07d}"
+		self.insert("Person Details", ["first_name", "last_name", "full_name", "email", "contact_no", "person_city"], [
+			self.standard(f"BENCH-TMP-PER-{key}", 0)
+			+ ["Temp", f"Bench{size}", f"Temp Bench{size}", f"tmp{size}@bench.test", "0300", "Bench City"]
+		])
+		self.insert("Animal Information", [
+			"source", "animal_type", "person_details", "first_name", "last_name", "adult_dogs", "puppies"
+		], [
+			self.standard(f"BENCH-TMP-AND-{key}", 0) + ["Person", "Dog", "BENCH-PER-0000000", "First0", "Last0", 2, 1]
+		])
+		self.insert("Food Demands", [
+			"order_by", "person_details", "first_name", "last_name", "food_requirements_dogs"
+		], [
+			self.standard(f"BENCH-TMP-DEM-{key}", 0) + ["Person", "BENCH-PER-0000000", "First0", "Last0", "10 kg"]
+		])
+		self.insert("Deleivery Informations", [
+			"deleivery_type", "deleiver_to", "organization_detail", "organization_name",
+			"shleter_details", "shleter_name", "no_of_kilogram", "no_of_pallets", "deleivery_date"
+		], [
+			self.standard(f"BENCH-TMP-DEL-{key}", 0) + [
+				"Donated From Organization", "Animal Shelter", self.organizations[0], "Bench Org 0",
+				self.shelters[0], "Bench Shelter 0", 25, 1, self.now
+			]
+		])
+
+	def cleanup(self):
+		"""Remove seeded rows and donations created by the write benchmarks"""
+		frappe.db.rollback()
+		frappe.db.sql("""
+			DELETE item FROM `tabDonation Item` item
+			JOIN `tabDonation` d ON d.name = item.parent
+			WHERE d.contact_person LIKE 'BENCH-%%'
+		""")
+		frappe.db.sql("""DELETE FROM `tabDonation` WHERE contact_person LIKE 'BENCH-%%'""")
+		frappe.db.sql("""DELETE FROM `tabPerson Search Index` WHERE person LIKE 'BENCH-%%'""")
+		frappe.db.sql("""DELETE FROM `tabDonation Payment` WHERE hash LIKE 'BENCH-%%'""")
+		# rows created by the create_* benchmarks carry generated names
+		frappe.db.sql("""DELETE FROM `tabAnimal Information` WHERE person_details LIKE 'BENCH-%%'""")
+		frappe.db.sql("""DELETE FROM `tabPerson Details` WHERE email LIKE '%%@bench.test'""")
+		frappe.db.sql("""DELETE FROM `tabAnimal Census Snapshot` WHERE census LIKE '%%|BENCH-%%'""")
+		for doctype in SEEDED_DOCTYPES:
+			frappe.db.sql(f"""DELETE FROM `tab{doctype}` WHERE name LIKE 'BENCH-%%'""")
+		rebuild_kpi_summary()
+		rebuild_donation_rollup()
+		rebuild_food_fulfillment_ledger()
+		rebuild_animal_census()
+		frappe.db.commit()
+
+
+def donation_payload(dataset, i):
+	return {
+		"donated_to": "Person",
+		"contact_person": f"BENCH-PER-{i:07d}",
+		"organization": dataset.organizations[i % len(dataset.organizations)],
+		"currency": "EUR",
+		"items": [{"product": dataset.products[i % len(dataset.products)], "quantity": 2}],
+	}
+
+
+def payment_payload(i):
+	return {
+		"hash": f"BENCH-PAY-{i:07d}",
+		"type": "deposit",
+		"provider": "stripe",
+		"amount": 10 + i,
+		"number": f"{i}",
+		"payment_at": "2026-01-01T10:00:00+00:00",
+	}
+
+
+def get_endpoints(dataset):
+	"""endpoint name -> zero-argument callable"""
+	org = dataset.organizations[0]
+	key = f"{dataset.persons:07d}"
+
+	def with_request(fn, payload):
+		return lambda: _call_with_request(fn, payload)
+
+	return {
+		"get_all_organizations": api.get_all_organizations,
+		"get_all_animals": api.get_all_animals,
+		"get_all_persons": api.get_all_persons,
+		"get_all_shelters": api.get_all_shelters,
+		"get_all_food_demands": api.get_all_food_demands,
+		"get_all_delivery_info": api.get_all_delivery_info,
+		"get_all_products": api.get_all_products,
+		"list_donations": api.list_donations,
+		"get_organization": lambda: api.get_organization(name=org),
+		"get_person": lambda: api.get_person(email="person1@bench.test"),
+		"search_persons": lambda: api.search_persons(q="first12 las"),
+		"get_shelter": lambda: api.get_shelter(name=dataset.shelters[0]),
+		"get_product": lambda: api.get_product(name=dataset.products[0]),
+		"get_donation": lambda: api.get_donation("BENCH-DON-0000001"),
+		"get_donation_sparse": lambda: api.get_donation("BENCH-DON-0000001", fields=["total", "currency", "donated_at"]),
+		"get_delivery_info": lambda: api.get_delivery_info("BENCH-DEL-0000001"),
+		"get_food_demand": lambda: api.get_food_demand("BENCH-DEM-0000000"),
+		"get_animal": lambda: api.get_animal(name="BENCH-AND-0000000"),
+		"get_admin_kpis": workspace_dashboard.get_admin_kpis,
+		"get_organization_dashboard": lambda: organization_dashboard.get_organization_dashboard(org),
+		"get_donation_timeseries": lambda: api.get_donation_timeseries(org, granularity="week"),
+		"get_food_shortfall": api.get_food_shortfall,
+		"get_animal_census": api.get_animal_census,
+		"get_animal_census_trend": lambda: api.get_animal_census_trend("Person Details", "BENCH-PER-0000000"),
+		"create_donation": with_request(api.create_donation, donation_payload(dataset, 1)),
+		"create_donations_bulk": with_request(
+			api.create_donations_bulk,
+			{"donations": [donation_payload(dataset, i) for i in range(BULK_PAYLOAD_SIZE)]},
+		),
+		"ingest_donation_payments": with_request(
+			api.ingest_donation_payments,
+			{"payments": [payment_payload(i) for i in range(BULK_PAYLOAD_SIZE)]},
+		),
+		"create_person": with_request(api.create_person, {
+			"first_name": "New", "last_name": f"Bench{key}", "email": f"new{key}@bench.test", "contact_no": "0300",
+		}),
+		"create_animal": with_request(api.create_animal, {
+			"source": "Person", "animal_type": "Dog", "person_details": "BENCH-PER-0000000", "adult_dogs": 2,
+		}),
+		"update_person": with_request(api.update_person, {"name": "BENCH-PER-0000001", "person_city": f"City {key}"}),
+		"update_animal": with_request(api.update_animal, {"name": "BENCH-AND-0000000", "adult_dogs": 3}),
+		"update_food_demand": with_request(
+			api.update_food_demand, {"name": "BENCH-DEM-0000000", "food_requirements_dogs": "12 kg"}
+		),
+		"update_delivery_info": with_request(api.update_delivery_info, {"name": "BENCH-DEL-0000001", "no_of_kilogram": 30}),
+		"delete_person": lambda: api.delete_person(name=f"BENCH-TMP-PER-{key}"),
+		"delete_animal": lambda: api.delete_animal(name=f"BENCH-TMP-AND-{key}"),
+		"delete_food_demand": lambda: api.delete_food_demand(name=f"BENCH-TMP-DEM-{key}"),
+		"delete_delivery_info": lambda: api.delete_delivery_info(name=f"BENCH-TMP-DEL-{key}"),
+	}
+
+
+def _call_with_request(fn, payload):
+	with patch.object(api, "_req", return_value=payload):
+		return fn()
+
+
+class TestAPIBenchmarks(FrappeTestCase):
+	def test_endpoint_budgets(self):
+		dataset = BenchmarkDataset()
+		# create_donations_bulk commits, so seeded rows are removed explicitly
+		self.addCleanup(dataset.cleanup)
+		report = []
+
+		for size in get_sizes():
+			dataset.grow_to(size)
+			for endpoint, call in get_endpoints(dataset).items():
+				frappe.local.homie_link_resolver = None
+				_result, stats = measure(call)
+				budget = get_budget(endpoint)
+				report.append({"size": size, "endpoint": endpoint, **stats})
+
+				with self.subTest(size=size, endpoint=endpoint):
+					self.assertLessEqual(stats["queries"], budget["max_queries"], f"{endpoint} query budget")
+					self.assertLessEqual(stats["seconds"], budget["max_seconds"], f"{endpoint} time budget")
+					self.assertLessEqual(stats["memory_mb"], budget["max_memory_mb"], f"{endpoint} memory budget")
+
+		print_report(report)
+
+
+def print_report(report):
+	print(f"\n{'size':>8}  {'endpoint':<28} {'queries':>8} {'ms':>10} {'peak MB':>9}")
+	for row in report:
+		print(
+			f"{row['size']:>8}  {row['endpoint']:<28} {row['queries']:>8} "
+			f"{row['seconds'] * 1000:>10.1f} {row['memory_mb']:>9.2f}"
+		)
+
+	path = os.environ.get("HOMIE_BENCHMARK_REPORT")
+	if path:
+		with open(path, "w") as f:
+			json.dump(report, f, indent=1)
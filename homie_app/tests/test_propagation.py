@@ -0,0 +1,46 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from homie_app.propagation import propagate, resync_all
+
+
+class TestPropagation(FrappeTestCase):
+	def setUp(self):
+		self.person = frappe.get_doc({
+			"doctype": "Person Details",
+			"first_name": "john",
+			"last_name": "smith",
+			"email": f"propagation-{frappe.generate_hash(length=6)}@example.com",
+			"contact_no": "0300 7654321",
+		}).insert(ignore_permissions=True)
+		self.animal = frappe.get_doc({
+			"doctype": "Animal Information",
+			"source": "Person",
+			"animal_type": "Dog",
+			"person_details": self.person.name,
+			"first_name": "john",
+			"last_name": "smith",
+		}).insert(ignore_permissions=True)
+
+	def get_copy(self):
+		return frappe.db.get_value("Animal Information", self.animal.name, ["first_name", "last_name"], as_dict=True)
+
+	def test_case_only_rename_propagates(self):
+		self.person.first_name = "John"
+		self.person.last_name = "Smith "
+		self.person.save(ignore_permissions=True)
+
+		propagate("Person Details", self.person.name, ["first_name", "last_name"])
+		copy = self.get_copy()
+		# compared byte for byte, not through the case-insensitive collation
+		self.assertEqual(copy.first_name.encode(), b"John")
+		self.assertEqual(copy.last_name.encode(), frappe.db.get_value("Person Details", self.person.name, "last_name").encode())
+
+	def test_resync_fixes_case_only_drift(self):
+		frappe.db.set_value("Animal Information", self.animal.name, "first_name", "JOHN", update_modified=False)
+
+		resync_all("Person Details")
+		self.assertEqual(self.get_copy().first_name.encode(), b"john")
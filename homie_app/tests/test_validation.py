@@ -0,0 +1,133 @@
+# Copyright (c) 2026, Anonymous and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from homie_app.api import LinkResolver
+from homie_app.validation import get_validator, to_float, to_int, validate_payload, validate_payloads
+
+
+def payment(**overrides):
+	return {"hash": "VAL-1", "type": "Deposit", "provider": " Stripe ", "amount": "12.5", "number": "1", **overrides}
+
+
+class TestConverters(FrappeTestCase):
+	def test_to_int(self):
+		self.assertEqual(to_int("3"), 3)
+		self.assertEqual(to_int(4.0), 4)
+		for value in ("3.5", "three", None, True, False):
+			with self.subTest(value=value), self.assertRaises(ValueError):
+				to_int(value)
+
+	def test_to_float(self):
+		self.assertEqual(to_float("2.5"), 2.5)
+		for value in ("nan", "inf", "x", None, True, False):
+			with self.subTest(value=value), self.assertRaises(ValueError):
+				to_float(value)
+
+
+class TestValidator(FrappeTestCase):
+	def test_converts_and_normalizes(self):
+		values, errors, refs = get_validator("Donation Payment").check_row(payment())
+		self.assertEqual(errors, {})
+		self.assertEqual(refs, [])
+		self.assertEqual(values["amount"], 12.5)
+		self.assertEqual(values["type"], "deposit")
+		self.assertEqual(values["provider"], "stripe")
+
+	def test_reports_every_error(self):
+		_values, errors, _refs = get_validator("Donation Payment").check_row(
+			payment(hash="", amount=0, provider="barter", number=None)
+		)
+		self.assertEqual(errors["hash"], "hash is required")
+		self.assertEqual(errors["number"], "number is required")
+		self.assertEqual(errors["amount"], "amount must be greater than 0")
+		self.assertIn("provider must be one of", errors["provider"])
+
+	def test_boolean_is_not_a_number(self):
+		_values, errors, _refs = get_validator("Donation Payment").check_row(payment(amount=True))
+		self.assertEqual(errors["amount"], "amount must be a number")
+
+	def test_required_if(self):
+		validator = get_validator("Animal Information")
+		_values, errors, _refs = validator.check_row({"source": "Person", "animal_type": "Dog"})
+		self.assertEqual(errors["person_details"], "person_details is required when source is 'Person'")
+		self.assertNotIn("shelter_detail", errors)
+
+	def test_partial_update_uses_doc(self):
+		validator = get_validator("Animal Information")
+		doc = frappe._dict(source="Person", animal_type="Dog", person_details="PER-00001")
+
+		values, errors, refs = validator.check_row({"adult_dogs": "2"}, doc=doc)
+		self.assertEqual(errors, {})
+		self.assertEqual(values, {"adult_dogs": 2})
+		# only links sent in the payload are checked
+		self.assertEqual(refs, [])
+
+		# a blank value clears the field, so it counts as missing
+		_values, errors, _refs = validator.check_row({"person_details": ""}, doc=doc)
+		self.assertIn("person_details", errors)
+
+		# blank numbers are stored as 0, the column default
+		values, errors, _refs = validator.check_row({"puppies": ""}, doc=doc)
+		self.assertEqual(errors, {})
+		self.assertEqual(values["puppies"], 0)
+
+	def test_child_table_errors_are_prefixed(self):
+		validator = get_validator("Donation")
+		base = {"donated_to": "Person", "contact_person": "PER-00001"}
+
+		_values, errors, refs = validator.check_row({**base, "items": [{"product": "PRO-1", "quantity": 0}, "x"]})
+		self.assertEqual(errors["items[0].quantity"], "items[0].quantity must be greater than 0")
+		self.assertEqual(errors["items[1]"], "items[1] must be an object")
+		self.assertIn(("items[0].product", "Product Details", "PRO-1"), refs)
+
+		_values, errors, _refs = validator.check_row({**base, "items": {"product": "PRO-1"}})
+		self.assertEqual(errors["items"], "items must be a list")
+
+	def test_validate_throws_one_report(self):
+		with self.assertRaises(frappe.ValidationError) as raised:
+			validate_payload("Donation Payment", payment(hash="", amount=-1))
+		self.assertIn("hash is required", str(raised.exception))
+		self.assertIn("amount must be greater than 0", str(raised.exception))
+
+
+class TestValidateMany(FrappeTestCase):
+	def setUp(self):
+		self.person = frappe.get_doc({
+			"doctype": "Person Details",
+			"first_name": "Validation",
+			"last_name": "Test",
+			"email": f"validation-{frappe.generate_hash(length=6)}@example.com",
+			"contact_no": "0300 1234567",
+		}).insert(ignore_permissions=True)
+
+	def test_results_keep_payload_order(self):
+		results = validate_payloads("Donation Payment", [payment(), "not a dict", payment(amount="x")])
+		self.assertEqual([bool(errors) for _values, errors in results], [False, True, True])
+		self.assertIsNone(results[1][0])
+		self.assertEqual(results[1][1], {"payload": "Donation Payment payload must be an object"})
+		self.assertEqual(results[2][1], {"amount": "amount must be a number"})
+
+	def test_links_checked_in_batch(self):
+		results = validate_payloads("Donation Payment", [
+			payment(donation="DON-DOES-NOT-EXIST"),
+			payment(donation=None),
+		])
+		self.assertEqual(results[0][1], {"donation": "Donation 'DON-DOES-NOT-EXIST' does not exist"})
+		self.assertEqual(results[1][1], {})
+
+	def test_links_through_resolver(self):
+		links = LinkResolver()
+		payloads = [
+			{"source": "Person", "animal_type": "Dog", "person_details": self.person.name},
+			{"source": "Person", "animal_type": "Cat", "person_details": "PER-MISSING"},
+		]
+		results = validate_payloads("Animal Information", payloads, links=links)
+
+		self.assertEqual(results[0][1], {})
+		self.assertEqual(results[1][1], {"person_details": "Person Details 'PER-MISSING' does not exist"})
+		# the endpoint reads display fields from the resolver without another query
+		self.assertEqual(links.resolved["Person Details"][self.person.name].first_name, "Validation")
+		self.assertIsNone(links.resolved["Person Details"]["PER-MISSING"])
@@ -0,0 +1,337 @@
+"""
+Payload validation compiled from DocType meta.
+
+A Validator is built once per doctype from its fields (reqd, Select options,
+numeric and Check types, Links, child tables) plus the API_RULES overlay
+below, and checks plain request dicts without building documents. validate()
+throws one report for a single payload; validate_many() returns per-row error
+dicts and checks the Links of the whole batch with one query per doctype.
+"""
+
+import math
+import re
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime
+
+EMAIL_RE = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+INT_TYPES = ("Int",)
+FLOAT_TYPES = ("Float", "Currency", "Percent")
+DATE_TYPES = ("Date", "Datetime")
+LAYOUT_TYPES = ("Section Break", "Column Break", "Tab Break", "HTML", "Button", "Heading")
+
+# rules the API enforces on top of the DocType definition
+#   required     fields a payload must carry
+#   required_if  {field: {value: [fields required when field has that value]}}
+#   options      allowed values for Data fields
+#   lowercase    fields compared and stored in lower case
+#   positive     numbers that must be greater than 0
+#   email        fields holding an email address
+API_RULES = {
+    "Organization Details": {
+        "required": ["organization_name", "organization_email", "organization_contact_no"],
+        "email": ["organization_email"],
+    },
+    "Person Details": {
+        "required": ["first_name", "last_name"],
+        "email": ["email"],
+    },
+    "Animal Information": {
+        "required": ["source"],
+        "required_if": {"source": {"Person": ["person_details"], "Animal Shelter": ["shelter_detail"]}},
+    },
+    "Animal Shelters": {
+        "required": ["shelter_name", "truck_access"],
+    },
+    "Food Demands": {
+        "required": ["order_by"],
+        "required_if": {"order_by": {"Person": ["person_details"], "Animal Shelters": ["contacted_animal_shelter"]}},
+    },
+    "Deleivery Informations": {
+        "required": ["deleivery_type"],
+        "required_if": {
+            "deleivery_type": {"Own Purchase": ["person_details"], "Donated From Organization": ["organization_detail"]},
+            "deleiver_to": {"Person": ["person_details"], "Animal Shelter": ["shleter_details"]},
+        },
+    },
+    "Donation": {
+        "required": ["donated_to", "items"],
+        "required_if": {"donated_to": {"Person": ["contact_person"], "Animal Shelter": ["shelter_details"]}},
+    },
+    "Donation Item": {
+        "required": ["product", "quantity"],
+        "positive": ["quantity"],
+    },
+    "Donation Payment": {
+        "required": ["hash", "type", "amount", "number", "provider"],
+        "options": {
+            "type": ["deposit", "withdraw", "refund"],
+            "provider": ["paypal", "stripe", "bank", "cash"],
+        },
+        "lowercase": ["type", "provider"],
+        "positive": ["amount"],
+    },
+}
+
+_validators = {}
+
+
+def is_blank(value):
+    return value is None or value == "" or value == []
+
+
+def to_int(value):
+    try:
+        # JSON true/false would otherwise pass as 1/0
+        number = None if isinstance(value, bool) else float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is None or not number.is_integer():
+        raise ValueError("must be a whole number")
+    return int(number)
+
+
+def to_float(value):
+    try:
+        number = None if isinstance(value, bool) else float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is None or not math.isfinite(number):
+        raise ValueError("must be a number")
+    return number
+
+
+def to_check(value):
+    if value not in (0, 1, "0", "1"):
+        raise ValueError("must be 0 or 1")
+    return int(value)
+
+
+def to_date(value):
+    try:
+        get_datetime(value)
+    except Exception:
+        raise ValueError("must be an ISO 8601 date or datetime")
+    return value
+
+
+def to_email(value):
+    if not isinstance(value, str) or not EMAIL_RE.match(value):
+        raise ValueError("must be a valid email address")
+    return value
+
+
+def choice_of(options, lowercase=False):
+    def to_choice(value):
+        if lowercase:
+            value = str(value).strip().lower()
+        if value not in options:
+            raise ValueError("must be one of: {0}".format(", ".join(options)))
+        return value
+    return to_choice
+
+
+class Validator:
+    """Checks compiled from one doctype's meta; build through get_validator()"""
+
+    def __init__(self, doctype):
+        meta = frappe.get_meta(doctype)
+        rules = API_RULES.get(doctype, {})
+
+        self.doctype = doctype
+        self.modified = meta.modified
+        self.required = list(dict.fromkeys([df.fieldname for df in meta.fields if df.reqd] + rules.get("required", [])))
+        self.required_if = rules.get("required_if", {})
+        self.positive = rules.get("positive", [])
+        self.converters = {}
+        self.blank_values = {}
+        self.links = {}
+        self.tables = {}
+
+        lowercase = rules.get("lowercase", [])
+        for df in meta.fields:
+            if df.fieldtype in INT_TYPES:
+                self.converters[df.fieldname] = to_int
+                self.blank_values[df.fieldname] = 0
+            elif df.fieldtype in FLOAT_TYPES:
+                self.converters[df.fieldname] = to_float
+                self.blank_values[df.fieldname] = 0.0
+            elif df.fieldtype == "Check":
+                self.converters[df.fieldname] = to_check
+                self.blank_values[df.fieldname] = 0
+            elif df.fieldtype == "Select" and df.options:
+                options = [o for o in df.options.split("\n") if o]
+                self.converters[df.fieldname] = choice_of(options, df.fieldname in lowercase)
+            elif df.fieldtype in DATE_TYPES:
+                self.converters[df.fieldname] = to_date
+            elif df.fieldtype == "Link":
+                self.links[df.fieldname] = df.options
+            elif df.fieldtype == "Table":
+                self.tables[df.fieldname] = df.options
+
+        for fieldname, options in rules.get("options", {}).items():
+            self.converters[fieldname] = choice_of(options, fieldname in lowercase)
+        for fieldname in rules.get("email", []):
+            self.converters[fieldname] = to_email
+
+        # everything else is taken as sent
+        self.plain = [
+            df.fieldname for df in meta.fields
+            if df.fieldtype not in LAYOUT_TYPES
+            and df.fieldname not in self.converters and df.fieldname not in self.links and df.fieldname not in self.tables
+        ]
+
+    def check_row(self, payload, doc=None, prefix=""):
+        """
+        (values, errors, refs) for one payload. Only fields present in the
+        payload are converted into values; requirements are checked against
+        the payload on top of `doc` so updates can send partial payloads.
+        refs are the (error key, doctype, name) Links still to be checked.
+        """
+        values = {}
+        errors = {}
+        refs = []
+
+        for fieldname, convert in self.converters.items():
+            if fieldname not in payload:
+                continue
+            value = payload[fieldname]
+            if is_blank(value):
+                values[fieldname] = self.blank_values.get(fieldname, value)
+                continue
+            try:
+                values[fieldname] = convert(value)
+            except ValueError as e:
+                errors[prefix + fieldname] = f"{prefix + fieldname} {e}"
+
+        for fieldname in self.plain:
+            if fieldname in payload:
+                values[fieldname] = payload[fieldname]
+
+        for fieldname, doctype in self.links.items():
+            if fieldname in payload:
+                values[fieldname] = payload[fieldname] or None
+                if values[fieldname]:
+                    refs.append((prefix + fieldname, doctype, values[fieldname]))
+
+        for fieldname, child_doctype in self.tables.items():
+            if fieldname not in payload or is_blank(payload[fieldname]):
+                continue
+            rows = payload[fieldname]
+            if not isinstance(rows, list):
+                errors[prefix + fieldname] = f"{prefix + fieldname} must be a list"
+                continue
+            child = get_validator(child_doctype)
+            values[fieldname] = []
+            for i, row in enumerate(rows):
+                key = f"{prefix}{fieldname}[{i}]"
+                if not isinstance(row, dict):
+                    errors[key] = f"{key} must be an object"
+                    continue
+                row_values, row_errors, row_refs = child.check_row(row, prefix=f"{key}.")
+                values[fieldname].append(row_values)
+                errors.update(row_errors)
+                refs += row_refs
+
+        def get(fieldname):
+            if fieldname not in payload:
+                return doc.get(fieldname) if doc else None
+            if is_blank(payload[fieldname]):
+                return None
+            return values.get(fieldname, payload[fieldname])
+
+        for fieldname in self.required:
+            if prefix + fieldname not in errors and is_blank(get(fieldname)):
+                errors[prefix + fieldname] = f"{prefix + fieldname} is required"
+
+        for condition, requirements in self.required_if.items():
+            value = get(condition)
+            for fieldname in requirements.get(value, []):
+                if prefix + fieldname not in errors and is_blank(get(fieldname)):
+                    errors[prefix + fieldname] = f"{prefix + fieldname} is required when {condition} is '{value}'"
+
+        for fieldname in self.positive:
+            value = values.get(fieldname)
+            if fieldname in payload and not is_blank(payload[fieldname]) and prefix + fieldname not in errors and value <= 0:
+                errors[prefix + fieldname] = f"{prefix + fieldname} must be greater than 0"
+
+        return values, errors, refs
+
+    def validate(self, payload, doc=None, links=None):
+        """Converted values of one payload; throws every error found at once"""
+        if not isinstance(payload, dict):
+            frappe.throw(_("{0} payload must be an object").format(self.doctype))
+
+        values, errors, refs = self.check_row(payload, doc)
+        check_links([(errors, refs)], links)
+        if errors:
+            frappe.throw(format_errors(errors), title=_("Validation Error"))
+        return values
+
+    def validate_many(self, payloads, links=None):
+        """[(values, errors)] in payload order; values is None for non-object payloads"""
+        results = []
+        pending = []
+        for payload in payloads:
+            if not isinstance(payload, dict):
+                results.append((None, {"payload": f"{self.doctype} payload must be an object"}))
+                continue
+            values, errors, refs = self.check_row(payload)
+            results.append((values, errors))
+            pending.append((errors, refs))
+
+        check_links(pending, links)
+        return results
+
+
+def check_links(pending, links=None):
+    """
+    Add a "does not exist" error for every missing Link in [(errors, refs)].
+    Doctypes the request's LinkResolver knows are loaded through it, so the
+    endpoint can read their display fields afterwards without another query.
+    """
+    wanted = {}
+    for errors, refs in pending:
+        for key, doctype, name in refs:
+            if key not in errors:
+                wanted.setdefault(doctype, set()).add(name)
+
+    existing = {}
+    for doctype, names in wanted.items():
+        if links is not None and doctype in links.resolved:
+            links.add(doctype, *names)
+        else:
+            existing[doctype] = set(frappe.get_all(doctype, filters={"name": ["in", list(names)]}, pluck="name"))
+
+    if links is not None:
+        links.resolve()
+
+    for errors, refs in pending:
+        for key, doctype, name in refs:
+            if key in errors:
+                continue
+            found = name in existing[doctype] if doctype in existing else links.exists(doctype, name)
+            if not found:
+                errors[key] = f"{doctype} '{name}' does not exist"
+
+
+def format_errors(errors):
+    return "Validation Error(s):\n" + "\n".join(errors.values())
+
+
+def get_validator(doctype):
+    """Compiled validator for the doctype, rebuilt when the DocType changes"""
+    key = (frappe.local.site, doctype)
+    validator = _validators.get(key)
+    if validator is None or validator.modified != frappe.get_meta(doctype).modified:
+        validator = _validators[key] = Validator(doctype)
+    return validator
+
+
+def validate_payload(doctype, payload, doc=None, links=None):
+    return get_validator(doctype).validate(payload, doc, links)
+
+
+def validate_payloads(doctype, payloads, links=None):
+    return get_validator(doctype).validate_many(payloads, links)